@@ -0,0 +1,10 @@
+import os
+
+from async_mode import AsyncSite
+from factory import create_app
+from models import db
+
+# ASGI 진입점: uvicorn asgi:application --workers 4 --port 3001 (requirements-async.txt)
+# app.py 와 같은 앱을 감싸며, DB 스키마 준비는 마찬가지로 `flask --app app init-db` 로 한 번 실행
+app = create_app(instance_path=os.getenv('INSTANCE_PATH'))
+application = AsyncSite(app, db)
@@ -0,0 +1,180 @@
+"""정적 파일 지문(fingerprint) URL 및 서빙
+
+시작 시 static/ 아래 파일의 내용 해시로 manifest 를 만들고,
+url_for('static', filename='css/style.css') 가 `css/style.<hash>.css` 를
+생성하도록 한다. 지문이 붙은 URL 은 1년 immutable 로 캐시되며,
+클라이언트가 지원하면 미리 압축해 둔 .br / .gz 파일을 보낸다.
+파일 본문은 send_file 의 wsgi.file_wrapper 를 통해 전송되므로
+gunicorn 에서는 sendfile(2) 로 복사 없이 전달된다.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import request, send_from_directory, abort
+
+FINGERPRINT_RE = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{10})(?P<ext>\.[A-Za-z0-9]+)$')
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.xml', '.txt', '.json', '.html', '.map'}
+ONE_YEAR = 365 * 24 * 3600
+
+
+class AssetManifest:
+    """정적 파일 해시 manifest + static 엔드포인트"""
+
+    def __init__(self):
+        self.static_folder = None
+        self.manifest = {}
+        # 파생본과 내용 주소 업로드(upload_storage)는 경로 자체가 내용 해시
+        self.immutable_prefixes = ('derived/', 'uploads/blobs/')
+        self.skip_prefixes = ('derived/', 'uploads/')
+        self.debug = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app, precompress=False):
+        """precompress=True 이면 시작 시 .gz/.br 생성 (보통은 `flask init-db` 에서 한 번)"""
+        self.static_folder = app.static_folder
+        self.debug = app.debug
+        self.build()
+        if precompress:
+            self.precompress()
+
+        # url_for('static', ...) 에 지문 적용
+        app.url_defaults(self._fingerprint_url)
+        # 기본 static 엔드포인트를 교체
+        app.view_functions['static'] = self.serve
+
+    def build(self):
+        """static/ 전체 파일 해시 계산 (파생본/업로드는 요청 시 지연 계산)"""
+        manifest = {}
+        for root, _, files in os.walk(self.static_folder):
+            for name in files:
+                rel = os.path.relpath(os.path.join(root, name), self.static_folder).replace(os.sep, '/')
+                if rel.startswith(self.skip_prefixes) or name.endswith(('.gz', '.br')):
+                    continue
+                manifest[rel] = self._hash_file(rel)
+        with self._lock:
+            self.manifest = manifest
+        return manifest
+
+    def version(self):
+        """manifest 전체 해시 (자산이 바뀌면 HTML 검증자도 바뀌도록)"""
+        with self._lock:
+            items = sorted(self.manifest.items())
+        return hashlib.sha1(repr(items).encode('utf-8')).hexdigest()[:16]
+
+    def precompress(self):
+        """텍스트 자산의 .gz / .br 파일 생성 (원본보다 오래된 경우만), 생성 수 반환"""
+        targets = [('.gz', lambda d: gzip.compress(d, 9, mtime=0))]
+        try:
+            import brotli
+            targets.append(('.br', lambda d: brotli.compress(d, quality=11)))
+        except ImportError:  # Brotli 미설치 시 .gz 만 생성
+            pass
+
+        written = 0
+        for rel in list(self.manifest):
+            if os.path.splitext(rel)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            source = os.path.join(self.static_folder, rel)
+            data = None
+            for suffix, compress in targets:
+                target = source + suffix
+                try:
+                    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+                        continue
+                    if data is None:
+                        with open(source, 'rb') as f:
+                            data = f.read()
+                    with open(target + '.tmp', 'wb') as f:
+                        f.write(compress(data))
+                    os.replace(target + '.tmp', target)
+                    written += 1
+                except OSError:
+                    # 읽기 전용 파일시스템 등에서는 압축 없이 서빙
+                    pass
+        return written
+
+    def digest(self, rel):
+        digest = self.manifest.get(rel)
+        if digest is None or self.debug:
+            path = os.path.join(self.static_folder, rel)
+            if not os.path.isfile(path):
+                return None
+            digest = self._hash_file(rel)
+            with self._lock:
+                self.manifest[rel] = digest
+        return digest
+
+    def fingerprinted(self, rel):
+        """css/style.css -> css/style.<hash>.css"""
+        if rel.startswith(self.immutable_prefixes):
+            return rel
+        stem, ext = os.path.splitext(rel)
+        if not ext:
+            return rel
+        digest = self.digest(rel)
+        if digest is None:
+            return rel
+        return f'{stem}.{digest}{ext}'
+
+    def resolve(self, filename):
+        """요청 경로 -> (실제 파일 경로, immutable 여부)"""
+        if filename.startswith(self.immutable_prefixes):
+            return filename, True
+        if os.path.isfile(os.path.join(self.static_folder, filename)):
+            return filename, False
+        match = FINGERPRINT_RE.match(filename)
+        if match is None:
+            return filename, False
+        original = match.group('stem') + match.group('ext')
+        # 이전 배포의 해시로 요청되면 현재 파일을 주되 장기 캐시는 하지 않는다
+        return original, self.digest(original) == match.group('hash')
+
+    def serve(self, filename):
+        """정적 파일 서빙"""
+        path, immutable = self.resolve(filename)
+        if not os.path.isfile(os.path.join(self.static_folder, path)):
+            abort(404)
+
+        encoding, suffix = self._negotiate(path)
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        response = send_from_directory(
+            self.static_folder, path + suffix,
+            mimetype=mimetype,
+            download_name=os.path.basename(path),
+            max_age=ONE_YEAR if immutable else None,
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            response.vary.add('Accept-Encoding')
+        if immutable:
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+        return response
+
+    def _negotiate(self, path):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return None, ''
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(os.path.join(self.static_folder, path + suffix)):
+                return encoding, suffix
+        return None, ''
+
+    def _fingerprint_url(self, endpoint, values):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = self.fingerprinted(values['filename'])
+
+    def _hash_file(self, rel):
+        digest = hashlib.sha1()
+        with open(os.path.join(self.static_folder, rel), 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:10]
+
+
+assets = AssetManifest()
@@ -0,0 +1,193 @@
+"""ASGI 서빙 모드 (uvicorn 워커 + aiosqlite)
+
+gunicorn 동기 워커는 느린 클라이언트나 SQLite 대기 동안 워커 하나를 통째로 잡는다.
+ASGI 모드에서는 한 워커 프로세스의 이벤트 루프가 많은 연결을 동시에 처리한다.
+
+- ASYNC_ENDPOINTS(문의 게시판, 공지 목록/상세, 관리자 목록)는 기존 Flask
+  뷰를 그대로 SQLAlchemy greenlet 안에서 실행하고, 그 요청의 db.session 을
+  `sqlite+aiosqlite` 엔진에 묶는다. 쿼리(지연 로딩 포함)마다 await 로 이벤트 루프에
+  양보하므로 DB 대기 중에도 다른 요청을 처리하며, 페이지 캐시/조건부 GET/조회수 등
+  뷰의 동작은 WSGI 와 같다.
+- 그 밖의 라우트(정적 파일, 스트리밍 내보내기, 관리자 쓰기 등)는 asgiref 의
+  WsgiToAsgi 로 스레드 풀에서 실행한다. 문의 접수(api_inquiry)는 큐 파일에 동기
+  sqlite3 로 쓰고 잠금 재시도에 time.sleep 을 쓰므로 이벤트 루프를 막지 않도록 여기에 둔다.
+
+DB 가 메모리(빈 읽기 전용 배포)이면 async 엔진을 만들지 않고 모든 라우트를 스레드
+풀로 처리한다. 실행: `uvicorn asgi:application --workers 4 --port 3001`
+(requirements-async.txt). 이벤트 루프 하나를 여러 요청이 나눠 쓰므로 템플릿
+렌더링 같은 CPU 작업은 동기 워커와 마찬가지로 워커 수로 확장한다.
+"""
+import io
+import logging
+import sys
+
+from flask import request
+from sqlalchemy.orm import Session
+from sqlalchemy.util import greenlet_spawn
+
+import db_profile
+from metrics import metrics
+from query_profiler import query_profiler
+from search import search_index
+
+logger = logging.getLogger(__name__)
+
+ASYNC_ENVIRON = 'blh.async'
+DEFAULT_ASYNC_ENDPOINTS = ('contact', 'notices', 'notice_detail', 'admin_notices', 'admin_inquiries')
+
+
+def build_environ(scope, body):
+    """ASGI http scope + 요청 본문(파일 객체) -> WSGI environ"""
+    script_name = scope.get('root_path', '').encode('utf-8').decode('latin-1')
+    path_info = scope['path'].encode('utf-8').decode('latin-1')
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class AsyncSite:
+    """Flask 앱을 감싼 ASGI 애플리케이션"""
+
+    def __init__(self, app, db):
+        from asgiref.wsgi import WsgiToAsgi
+
+        app.config.setdefault('ASYNC_ENDPOINTS', DEFAULT_ASYNC_ENDPOINTS)
+        self.app = app
+        self.db = db
+        self.endpoints = frozenset(app.config['ASYNC_ENDPOINTS'])
+        self.engine = None
+        self.fallback = WsgiToAsgi(app)
+        # 비동기 라우트의 세션 교체는 다른 before_request 훅보다 먼저
+        app.before_request_funcs.setdefault(None, []).insert(0, self._bind_session)
+
+        with app.app_context():
+            url = db.engine.url
+        if url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:'):
+            self.engine = self._create_engine(url)
+        else:
+            logger.warning('async mode: in-memory database, serving every route from the thread pool')
+
+    def _create_engine(self, url):
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        profile = self.app.config.get('SQLITE_PROFILE')
+        # aiosqlite 의 기본값(NullPool)은 요청마다 연결과 PRAGMA 를 새로 하므로 풀 사용
+        options = dict(db_profile.engine_options(profile), poolclass=AsyncAdaptedQueuePool)
+        engine = create_async_engine(url.set(drivername='sqlite+aiosqlite'), **options)
+        # 동기 엔진과 같은 PRAGMA, 검색 트리거 함수, 요청 계측, 쿼리 프로파일러
+        db_profile.install(engine.sync_engine, profile)
+        search_index.watch_engine(engine.sync_engine)
+        metrics.watch_engine(engine.sync_engine)
+        query_profiler.watch_engine(engine.sync_engine)
+        return engine
+
+    def _bind_session(self):
+        if request.environ.get(ASYNC_ENVIRON):
+            # 이 앱 컨텍스트의 db.session / Model.query 가 aiosqlite 엔진을 쓰도록
+            self.db.session.registry.set(Session(bind=self.engine.sync_engine))
+
+    def is_async(self, scope):
+        """요청이 비동기 엔드포인트로 매칭되는지"""
+        if self.engine is None:
+            return False
+        adapter = self.app.url_map.bind('localhost', path_info=scope['path'])
+        try:
+            endpoint, _ = adapter.match(method=scope['method'])
+        except Exception:  # NotFound, MethodNotAllowed, RequestRedirect
+            return False
+        return endpoint in self.endpoints
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http' and self.is_async(scope):
+            await self._handle(scope, receive, send)
+        else:
+            await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.engine is not None:
+                    await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _handle(self, scope, receive, send):
+        limit = self.app.config.get('MAX_CONTENT_LENGTH')
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if limit and size > limit:
+                await self._send(send, 413, [(b'content-type', b'text/plain')], b'Request Entity Too Large')
+                return
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+
+        body = b''.join(chunks)
+        environ = build_environ(scope, io.BytesIO(body))
+        # chunked 요청도 본문을 모두 읽었으므로 길이를 알려 준다
+        environ['CONTENT_LENGTH'] = str(len(body))
+        environ[ASYNC_ENVIRON] = True
+        status, headers, body = await greenlet_spawn(self._call_wsgi, environ)
+        await self._send(send, status, headers, body)
+
+    def _call_wsgi(self, environ):
+        """greenlet 안에서 WSGI 앱 실행 (DB 호출은 이벤트 루프로 양보), 응답 본문 수집"""
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+            return lambda data: None
+
+        result = self.app(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return started['status'], started['headers'], body
+
+    @staticmethod
+    async def _send(send, status, headers, body):
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
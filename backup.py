@@ -0,0 +1,640 @@
+"""온라인 SQLite 백업 (기본 스냅샷 + WAL 전송, 시점 복구)
+
+BACKUP_DIR 아래에 '세대(generation)' 단위로 백업한다. 세대는 기본 스냅샷(base.db)과
+그 뒤에 쌓인 WAL 프레임 사본(wal-<에포크>)으로 이루어지며, 세대 안의 어느 전송 시점으로든
+복구할 수 있다 (전송 간격 BACKUP_WAL_INTERVAL 단위의 시점 복구).
+
+- 기본 스냅샷: 읽기 트랜잭션을 연 연결에서 SQLite 온라인 백업 API 로 BACKUP_STEP_PAGES
+  페이지씩 복사하고 단계 사이에 BACKUP_STEP_SLEEP 만큼 쉰다. WAL 모드의 읽기 트랜잭션은
+  쓰기를 막지 않고 스냅샷이 고정되므로 복사 도중 쓰기가 있어도 처음부터 다시 하지 않는다.
+  만든 파일은 PRAGMA integrity_check 를 통과해야 세대로 공개된다.
+- WAL 전송: 짧은 쓰기 락(BEGIN IMMEDIATE) 안에서 WAL 파일의 지난 위치 이후 프레임을
+  읽어 솔트와 체크섬 사슬을 확인하고, 마지막 커밋 프레임까지 세대의 wal 파일에 덧붙인다.
+  복사 중에는 쓰기가 없으므로 락 시간은 새 프레임 양에 비례한다 (보통 수 ms).
+- WAL 재시작: 전송한 프로세스는 읽기 트랜잭션을 계속 열어 두어(pin) WAL 이 모르는 사이
+  처음부터 다시 쓰이지 않게 한다. WAL 이 BACKUP_WAL_CHECKPOINT_BYTES 를 넘으면 전송 직후
+  쓰기 락 안에서 체크포인트하고 pin 을 풀어 다음 쓰기가 WAL 을 재시작하게 하며, 이
+  재시작(체크포인트 번호 +1)은 다음 에포크로 이어 받는다. 증명할 수 없는 재시작(프로세스
+  재시작 중 등)은 전송 공백이 있을 수 있으므로 새 세대를 시작한다.
+- 복구: base.db 를 복사하고 에포크마다 전송한 WAL 앞부분을 `<db>-wal` 로 두고 열어
+  SQLite 가 WAL 복구로 반영하게 한 뒤 체크포인트한다. 결과도 integrity_check 한다.
+
+BACKUP_INTERVAL 마다, 또는 세대의 WAL 사본이 BACKUP_GENERATION_MAX_BYTES 를 넘으면 새
+세대를 시작하고, BACKUP_RETENTION_DAYS 가 지난 세대는 최근 BACKUP_KEEP 개를 빼고
+지운다. BACKUP_ENABLED 이면 워커 하나(파일 락으로 선출)의 백그라운드 스레드가 이 일을
+하며, `flask backup-run` 으로 별도 프로세스에서 돌릴 수도 있다.
+"""
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from images import _FileLock
+
+logger = logging.getLogger(__name__)
+
+WAL_MAGIC = (0x377f0682, 0x377f0683)
+WAL_HEADER = struct.Struct('>8I')
+FRAME_HEADER = struct.Struct('>6I')
+BASE_FILE = 'base.db'
+INDEX_FILE = 'index.jsonl'
+STATE_FILE = 'state.json'
+GENERATION_FORMAT = '%Y%m%dT%H%M%SZ'
+
+
+class BackupError(Exception):
+    pass
+
+
+class WalGap(BackupError):
+    """마지막 전송 이후 WAL 을 이어 받을 수 없음 (새 세대 필요)"""
+
+
+# WAL 형식 ------------------------------------------------------------------
+
+_word_structs = {}
+
+
+def wal_checksum(data, s0, s1, big_endian):
+    """SQLite WAL 체크섬 (32비트 워드 쌍 누적)"""
+    count = len(data) // 4
+    key = (count, big_endian)
+    words = _word_structs.get(key)
+    if words is None:
+        words = _word_structs[key] = struct.Struct(('>' if big_endian else '<') + f'{count}I')
+    values = words.unpack(data)
+    for i in range(0, count, 2):
+        s0 = (s0 + values[i] + s1) & 0xFFFFFFFF
+        s1 = (s1 + values[i + 1] + s0) & 0xFFFFFFFF
+    return s0, s1
+
+
+def read_wal_header(path):
+    """WAL 헤더 (dict, 원본 32바이트), 없거나 유효하지 않으면 (None, None)"""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(WAL_HEADER.size)
+    except FileNotFoundError:
+        return None, None
+    if len(raw) < WAL_HEADER.size:
+        return None, None
+    magic, _, page_size, ckpt, salt1, salt2, c1, c2 = WAL_HEADER.unpack(raw)
+    big_endian = bool(magic & 1)
+    if magic not in WAL_MAGIC or wal_checksum(raw[:24], 0, 0, big_endian) != (c1, c2):
+        return None, None
+    return {'page_size': page_size, 'ckpt': ckpt, 'salt': [salt1, salt2], 'cksum': [c1, c2],
+            'big_endian': big_endian}, raw
+
+
+def scan_frames(data, header, cksum):
+    """프레임 바이트에서 마지막 커밋까지의 (길이, 그 시점 체크섬, 커밋 수)"""
+    size = FRAME_HEADER.size + header['page_size']
+    big_endian = header['big_endian']
+    salt1, salt2 = header['salt']
+    s0, s1 = cksum
+    end, end_cksum, commits = 0, (s0, s1), 0
+    view = memoryview(data)
+    for pos in range(0, len(data) - size + 1, size):
+        _, commit, frame_salt1, frame_salt2, c1, c2 = FRAME_HEADER.unpack_from(data, pos)
+        if (frame_salt1, frame_salt2) != (salt1, salt2):
+            break
+        s0, s1 = wal_checksum(view[pos:pos + 8], s0, s1, big_endian)
+        s0, s1 = wal_checksum(view[pos + FRAME_HEADER.size:pos + size], s0, s1, big_endian)
+        if (s0, s1) != (c1, c2):
+            break
+        if commit:
+            end, end_cksum, commits = pos + size, (s0, s1), commits + 1
+    return end, list(end_cksum), commits
+
+
+def integrity_check(path, pragma='integrity_check'):
+    """PRAGMA integrity_check 결과가 ok 가 아니면 BackupError"""
+    conn = sqlite3.connect(path)
+    try:
+        rows = [row[0] for row in conn.execute(f'PRAGMA {pragma}')]
+    finally:
+        conn.close()
+    if rows != ['ok']:
+        raise BackupError(f'{pragma} failed for {path}: {"; ".join(rows[:5])}')
+
+
+# 백업 관리 -----------------------------------------------------------------
+
+class DatabaseBackup:
+    """세대 생성 / WAL 전송 / 보존 정리 / 복구"""
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.directory = None
+        self.db_path = None
+        self.interval = 86400.0
+        self.wal_interval = 10.0
+        self.step_pages = 256
+        self.step_sleep = 0.005
+        self.wal_checkpoint_bytes = 4 * 1024 * 1024
+        self.generation_max_bytes = 256 * 1024 * 1024
+        self.retention_days = 7
+        self.keep = 3
+        self.check = 'integrity_check'
+        self._reader = None
+        self._writer = None
+        self._conn_pid = None
+        self._wal = False
+        self._pinned_since = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        app.config.setdefault('BACKUP_ENABLED', os.getenv('BACKUP_ENABLED', '0') == '1')
+        app.config.setdefault('BACKUP_DIR', os.getenv('BACKUP_DIR', os.path.join(app.instance_path, 'backups')))
+        app.config.setdefault('BACKUP_INTERVAL', 86400.0)
+        app.config.setdefault('BACKUP_WAL_INTERVAL', 10.0)
+        app.config.setdefault('BACKUP_STEP_PAGES', 256)
+        app.config.setdefault('BACKUP_STEP_SLEEP', 0.005)
+        app.config.setdefault('BACKUP_WAL_CHECKPOINT_BYTES', 4 * 1024 * 1024)
+        app.config.setdefault('BACKUP_GENERATION_MAX_BYTES', 256 * 1024 * 1024)
+        app.config.setdefault('BACKUP_RETENTION_DAYS', 7)
+        app.config.setdefault('BACKUP_KEEP', 3)
+        # 큰 DB 에서 시간이 걸리면 quick_check
+        app.config.setdefault('BACKUP_CHECK', 'integrity_check')
+        self.app = app
+        self.directory = app.config['BACKUP_DIR']
+        self.interval = float(app.config['BACKUP_INTERVAL'])
+        self.wal_interval = float(app.config['BACKUP_WAL_INTERVAL'])
+        self.step_pages = int(app.config['BACKUP_STEP_PAGES'])
+        self.step_sleep = float(app.config['BACKUP_STEP_SLEEP'])
+        self.wal_checkpoint_bytes = int(app.config['BACKUP_WAL_CHECKPOINT_BYTES'])
+        self.generation_max_bytes = int(app.config['BACKUP_GENERATION_MAX_BYTES'])
+        self.retention_days = float(app.config['BACKUP_RETENTION_DAYS'])
+        self.keep = int(app.config['BACKUP_KEEP'])
+        self.check = app.config['BACKUP_CHECK']
+
+        # 읽기 전용 스냅샷/메모리 DB 는 백업 대상이 아님
+        self.db_path = None
+        if not app.config.get('DATABASE_READ_ONLY', False):
+            with app.app_context():
+                url = db.engine.url
+            if url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:'):
+                self.db_path = os.path.abspath(url.database)
+        self.enabled = app.config['BACKUP_ENABLED'] and self.db_path is not None
+        if self.enabled:
+            # 워커마다 첫 요청 때 스케줄러 스레드 시작 (실제 백업은 리더 하나만)
+            app.before_request(self._ensure_thread)
+
+    @property
+    def wal_path(self):
+        return self.db_path + '-wal'
+
+    def _require_db(self):
+        if self.db_path is None:
+            raise BackupError('backups need a writable SQLite database file')
+
+    # 연결 -----------------------------------------------------------------
+
+    def _connections(self):
+        """(pin 용 읽기 연결, 쓰기 락 연결) - fork 이후에는 새로 연다"""
+        pid = os.getpid()
+        if self._conn_pid != pid:
+            self._reader = self._connect(timeout=1.0)
+            self._writer = self._connect(timeout=30.0)
+            self._wal = self._reader.execute('PRAGMA journal_mode').fetchone()[0].lower() == 'wal'
+            self._conn_pid = pid
+            self._pinned_since = None
+        return self._reader, self._writer
+
+    def _connect(self, timeout):
+        # 저널 모드는 바꾸지 않는다. WAL 이 아닌 DB 는 읽기 트랜잭션이 쓰기를 막으므로 pin 없이
+        # 기본 스냅샷만 만든다 (단계 사이에 쓰기가 있으면 SQLite 가 복사를 처음부터 다시 한다)
+        return sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+
+    def _pin(self, reader):
+        """읽기 트랜잭션을 새로 열어 현재 WAL 끝까지 고정"""
+        self._unpin(reader, keep_since=True)
+        if not self._wal:
+            return
+        reader.execute('BEGIN')
+        reader.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        if self._pinned_since is None:
+            self._pinned_since = time.time()
+
+    def _unpin(self, reader, keep_since=False):
+        if reader.in_transaction:
+            reader.execute('ROLLBACK')
+        if not keep_since:
+            self._pinned_since = None
+
+    def close(self):
+        if self._conn_pid == os.getpid():
+            for conn in (self._reader, self._writer):
+                conn.close()
+        self._reader = self._writer = self._conn_pid = self._pinned_since = None
+        self._wal = False
+
+    # 세대 -----------------------------------------------------------------
+
+    def generations(self):
+        """공개된 세대 id 목록 (오래된 것부터)"""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if not name.startswith('.') and not name.endswith('.tmp')
+                      and os.path.isfile(os.path.join(self.directory, name, STATE_FILE)))
+
+    def _gen_path(self, generation, *parts):
+        return os.path.join(self.directory, generation, *parts)
+
+    def _load_state(self, path):
+        with open(os.path.join(path, STATE_FILE), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, path, state):
+        tmp = os.path.join(path, STATE_FILE + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(path, STATE_FILE))
+
+    def points(self, generation):
+        """세대의 복구 시점 목록 [{'t', 'epoch', 'offset'}]"""
+        with open(self._gen_path(generation, INDEX_FILE), encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def create(self):
+        """새 세대 시작 (기본 스냅샷 + 현재 WAL 전송), 세대 id 반환"""
+        self._require_db()
+        os.makedirs(self.directory, exist_ok=True)
+        with self._cycle_lock():
+            return self._create_locked()
+
+    def _create_locked(self):
+        reader, writer = self._connections()
+        # 이전 pin 과 이어지지 않으므로 연속 시점도 여기서 새로
+        self._unpin(reader)
+        self._pin(reader)
+        before, _ = read_wal_header(self.wal_path)
+        started = time.time()
+        generation = datetime.fromtimestamp(started, timezone.utc).strftime(GENERATION_FORMAT)
+        while os.path.exists(self._gen_path(generation)):
+            generation += '-1'
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix=generation + '.', suffix='.tmp')
+        try:
+            base = os.path.join(tmp, BASE_FILE)
+            target = sqlite3.connect(base)
+            try:
+                reader.backup(target, pages=self.step_pages, sleep=self.step_sleep)
+            finally:
+                target.close()
+            integrity_check(base, self.check)
+
+            state = {'epoch': 1}
+            self._start_epoch(state, before)
+            if self._wal:
+                scanned = self._prescan(state)
+                writer.execute('BEGIN IMMEDIATE')
+                try:
+                    header, _ = read_wal_header(self.wal_path)
+                    if before is not None and header is not None and header['salt'] != before['salt']:
+                        # pin 당시 WAL 이 모두 체크포인트되어 있었고 그 뒤 한 번 재시작: 이전 WAL 은 base 에 포함
+                        if header['ckpt'] != before['ckpt'] + 1:
+                            raise BackupError('WAL restarted more than once during base backup')
+                        self._start_epoch(state, header)
+                    self._ship_locked(tmp, state, reader, started, scanned, first=True)
+                finally:
+                    writer.execute('ROLLBACK')
+            else:
+                # 전송할 WAL 이 없으므로 기본 스냅샷 시점만 기록
+                self._ship_locked(tmp, state, reader, started, first=True)
+            os.rename(tmp, self._gen_path(generation))
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        logger.info('backup generation %s created (%.1fs)', generation, time.time() - started)
+        return generation
+
+    @staticmethod
+    def _start_epoch(state, header):
+        """state 를 WAL 헤더의 새 에포크 시작으로 (WAL 이 없으면 첫 헤더를 기다림)"""
+        state['offset'] = 0
+        if header is None:
+            state.update(salt=None, ckpt=None, cksum=None)
+        else:
+            state.update(salt=header['salt'], ckpt=header['ckpt'], cksum=header['cksum'],
+                         page_size=header['page_size'], big_endian=header['big_endian'])
+
+    # WAL 전송 ---------------------------------------------------------------
+
+    def ship(self):
+        """현재 세대에 새 WAL 프레임 전송, 전송한 커밋 수 (이어 받을 수 없으면 WalGap)"""
+        self._require_db()
+        with self._cycle_lock():
+            generations = self.generations()
+            if not generations:
+                raise WalGap('no backup generation yet')
+            return self._ship_generation(generations[-1])
+
+    def _ship_generation(self, generation):
+        reader, writer = self._connections()
+        if not self._wal:
+            return 0
+        path = self._gen_path(generation)
+        state = self._load_state(path)
+        scanned = self._prescan(state)
+        if state['offset'] >= self.wal_checkpoint_bytes:
+            # 락 밖에서 pin 위치까지 먼저 옮겨 두면 락 안의 체크포인트는 마지막 몇 프레임만 복사
+            writer.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+        writer.execute('BEGIN IMMEDIATE')
+        try:
+            return self._ship_locked(path, state, reader, state.get('shipped_at'), scanned)
+        finally:
+            writer.execute('ROLLBACK')
+
+    def _read_frames(self, header, start, cksum):
+        """WAL 의 start 바이트부터 마지막 커밋까지 (바이트, 체크섬, 커밋 수)"""
+        with open(self.wal_path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+        end, cksum, commits = scan_frames(data, header, cksum)
+        return data[:end], cksum, commits
+
+    def _prescan(self, state):
+        """쓰기 락 없이 이미 커밋된 프레임을 읽고 체크섬 확인 (락 안에서는 그 뒤만 읽는다)
+
+        pin 때문에 지금 에포크의 WAL 은 재시작되지 않으므로 여기서 확인한 커밋 프레임은
+        락을 잡은 뒤에도 그대로다. WAL 이 이미 재시작되었으면 새 에포크를 처음부터 읽어
+        두고, 락 안에서 그 재시작을 이어 받을 수 있을 때만 쓴다."""
+        header, _ = read_wal_header(self.wal_path)
+        if header is None:
+            return None
+        if header['salt'] == state['salt']:
+            start, cksum = max(state['offset'], WAL_HEADER.size), state['cksum']
+        else:
+            start, cksum = WAL_HEADER.size, header['cksum']
+        data, cksum, commits = self._read_frames(header, start, cksum)
+        return {'salt': header['salt'], 'start': start, 'data': data, 'cksum': cksum, 'commits': commits}
+
+    def _continuous_since(self, shipped_at):
+        """이 프로세스의 pin 이 마지막 전송 전부터 계속 유지되었는지"""
+        return (self._pinned_since is not None and shipped_at is not None
+                and self._pinned_since <= shipped_at)
+
+    def _ship_locked(self, path, state, reader, shipped_at, scanned=None, first=False):
+        """쓰기 락 안에서 호출: WAL 을 이어 받아 전송하고 pin 을 다시 잡는다"""
+        header, raw = read_wal_header(self.wal_path)
+        if header is not None and header['salt'] != state['salt']:
+            expected = state['ckpt'] is None or header['ckpt'] == state['ckpt'] + 1
+            # pin 이 이어졌다면 재시작은 이전 에포크에 새 프레임이 쌓이기 전에만 일어날 수 있다
+            stale = scanned is not None and scanned['salt'] == state['salt'] and scanned['commits']
+            if not (expected and self._continuous_since(shipped_at)) or stale:
+                raise WalGap(f'WAL restarted since last shipment (checkpoint {state["ckpt"]} -> {header["ckpt"]})')
+            if state['salt'] is not None:
+                state['epoch'] += 1
+            self._start_epoch(state, header)
+        elif header is None and state['salt'] is not None:
+            raise WalGap('WAL file missing or truncated since last shipment')
+
+        commits = 0
+        now = time.time()
+        if header is not None:
+            start = max(state['offset'], WAL_HEADER.size)
+            data, cksum, commits = b'', state['cksum'], 0
+            if scanned is not None and scanned['salt'] == state['salt'] and scanned['start'] == start:
+                data, cksum, commits = scanned['data'], scanned['cksum'], scanned['commits']
+            tail, cksum, tail_commits = self._read_frames(header, start + len(data), cksum)
+            data += tail
+            commits += tail_commits
+            if state['offset'] == 0 or data:
+                with open(os.path.join(path, f'wal-{state["epoch"]:06d}'), 'ab') as f:
+                    if state['offset'] == 0:
+                        f.write(raw)
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                state['offset'] = start + len(data)
+                state['cksum'] = cksum
+            if state['offset'] >= self.wal_checkpoint_bytes:
+                # 쓰기 락 안이라 새 프레임이 없다: 전부 옮겨지면 다음 쓰기가 WAL 을 재시작
+                self._unpin(reader, keep_since=True)
+                reader.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+
+        self._pin(reader)
+        state['shipped_at'] = now
+        if commits or first:
+            point = {'t': now, 'epoch': state['epoch'], 'offset': state['offset']}
+            with open(os.path.join(path, INDEX_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(point) + '\n')
+        self._save_state(path, state)
+        return commits
+
+    # 스케줄 ---------------------------------------------------------------
+
+    def run_once(self):
+        """전송 한 번 (필요하면 새 세대) + 보존 정리"""
+        self._require_db()
+        os.makedirs(self.directory, exist_ok=True)
+        with self._cycle_lock():
+            generations = self.generations()
+            if not generations or self._due(generations[-1]):
+                self._create_locked()
+            else:
+                try:
+                    self._ship_generation(generations[-1])
+                except WalGap as e:
+                    logger.warning('backup: %s, starting new generation', e)
+                    self._create_locked()
+            self._prune_locked()
+
+    def _due(self, generation):
+        """새 세대를 만들 때인지 (BACKUP_INTERVAL 경과 또는 WAL 사본 크기 초과)"""
+        first = self.points(generation)
+        if not first or time.time() - first[0]['t'] >= self.interval:
+            return True
+        path = self._gen_path(generation)
+        wal_bytes = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+                        if name.startswith('wal-'))
+        return wal_bytes >= self.generation_max_bytes
+
+    def run(self, stop=None):
+        """스케줄러 루프: 리더 락을 얻은 프로세스 하나만 백업한다"""
+        self._require_db()
+        stop = stop or threading.Event()
+        os.makedirs(self.directory, exist_ok=True)
+        leader = open(os.path.join(self.directory, '.leader'), 'a+b')
+        try:
+            while not stop.is_set():
+                if fcntl is None:
+                    break
+                try:
+                    fcntl.flock(leader.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    stop.wait(self.wal_interval * 6)
+            while not stop.is_set():
+                try:
+                    self.run_once()
+                except Exception:
+                    logger.exception('backup failed')
+                    self._reset_connections()
+                stop.wait(self.wal_interval)
+        finally:
+            leader.close()
+            self._reset_connections()
+
+    def _reset_connections(self):
+        try:
+            self.close()
+        except sqlite3.Error:
+            self._reader = self._writer = self._conn_pid = self._pinned_since = None
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self.run, name='db-backup', daemon=True)
+            self._thread.start()
+
+    def _cycle_lock(self):
+        return _BackupLock(os.path.join(self.directory, '.lock'))
+
+    # 보존 / 검증 / 복구 -----------------------------------------------------
+
+    def prune(self):
+        """보존 기간이 지난 세대 삭제 (최근 BACKUP_KEEP 개는 유지), 삭제한 세대 목록"""
+        with self._cycle_lock():
+            return self._prune_locked()
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.retention_days * 86400
+        generations = self.generations()
+        removed = []
+        for generation in generations[:max(0, len(generations) - self.keep)]:
+            points = self.points(generation)
+            # 이 세대의 마지막 시점이 보존 기간 안이면 아직 필요
+            if points and points[-1]['t'] >= cutoff:
+                continue
+            shutil.rmtree(self._gen_path(generation), ignore_errors=True)
+            removed.append(generation)
+        for name in os.listdir(self.directory):
+            # 중단된 세대 생성의 잔여물
+            path = os.path.join(self.directory, name)
+            if name.endswith('.tmp') and os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        if removed:
+            logger.info('backup: pruned generations %s', ', '.join(removed))
+        return removed
+
+    def describe(self):
+        """세대별 요약 (목록 출력용)"""
+        result = []
+        for generation in self.generations():
+            path = self._gen_path(generation)
+            points = self.points(generation)
+            result.append({
+                'generation': generation,
+                'base_bytes': os.path.getsize(os.path.join(path, BASE_FILE)),
+                'wal_bytes': sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+                                 if name.startswith('wal-')),
+                'epochs': points[-1]['epoch'] if points else 0,
+                'first': points[0]['t'] if points else None,
+                'last': points[-1]['t'] if points else None,
+                'points': len(points),
+            })
+        return result
+
+    def find_point(self, at=None):
+        """시각 at(epoch 초, None 은 최신) 이전의 마지막 복구 시점 (세대, 시점)"""
+        for generation in reversed(self.generations()):
+            candidates = [p for p in self.points(generation) if at is None or p['t'] <= at]
+            if candidates:
+                return generation, candidates[-1]
+        raise BackupError('no backup point at or before the requested time')
+
+    def restore(self, output, at=None, generation=None, point=None):
+        """복구 시점의 DB 를 output 에 만든다 (integrity_check 포함), 사용한 (세대, 시점)"""
+        if generation is None:
+            generation, point = self.find_point(at)
+        path = self._gen_path(generation)
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=directory, suffix='.restore.tmp')
+        try:
+            target = os.path.join(tmp, 'restore.db')
+            shutil.copyfile(os.path.join(path, BASE_FILE), target)
+            for epoch in range(1, point['epoch'] + 1):
+                epoch_file = os.path.join(path, f'wal-{epoch:06d}')
+                if not os.path.exists(epoch_file):
+                    # WAL 이 아직 없던 세대 (기본 스냅샷만)
+                    continue
+                with open(epoch_file, 'rb') as f:
+                    data = f.read(point['offset'] if epoch == point['epoch'] else -1)
+                if len(data) <= WAL_HEADER.size:
+                    continue
+                # 다음 열기에서 SQLite 가 WAL 을 복구하고, 체크포인트로 DB 파일에 반영
+                with open(target + '-wal', 'wb') as f:
+                    f.write(data)
+                conn = sqlite3.connect(target, isolation_level=None)
+                try:
+                    busy, _, _ = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+                finally:
+                    conn.close()
+                if busy:
+                    raise BackupError(f'could not apply WAL epoch {epoch} of {generation}')
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(target + suffix):
+                    os.remove(target + suffix)
+            integrity_check(target, self.check)
+            os.replace(target, output)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return generation, point
+
+    def verify(self):
+        """세대마다 최신 시점을 임시 파일로 복구해 검사, [(세대, 오류 또는 None)]"""
+        results = []
+        with tempfile.TemporaryDirectory(dir=self.directory) as tmp:
+            for generation in self.generations():
+                points = self.points(generation)
+                try:
+                    if not points:
+                        raise BackupError('no restore points')
+                    self.restore(os.path.join(tmp, f'{generation}.db'), generation=generation, point=points[-1])
+                    error = None
+                except (BackupError, OSError, sqlite3.Error) as e:
+                    error = str(e)
+                finally:
+                    _unlink(os.path.join(tmp, f'{generation}.db'))
+                results.append((generation, error))
+        return results
+
+
+class _BackupLock(_FileLock):
+    """백업 작업 직렬화 - 긴 기본 스냅샷이 이미지/내보내기 락을 잡고 있지 않도록 스레드 락은 따로"""
+
+    _thread_lock = threading.Lock()
+
+
+def _unlink(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+backup_manager = DatabaseBackup()
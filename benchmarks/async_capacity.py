@@ -0,0 +1,220 @@
+"""동시 연결 용량 비교 (gunicorn 동기 워커 vs uvicorn ASGI 모드)
+
+routes.py 와 같은 채운 DB 복사본으로 두 서버를 차례로 띄우고, asyncio HTTP 클라이언트로
+동시 연결 수를 늘려 가며 (--levels) 같은 라우트 묶음을 호출한다. 단계마다 p50/p95/p99
+지연, 처리량, 오류(5xx/타임아웃/연결 실패) 수를 보고한다. --slow-clients 를 주면 요청
+헤더를 1초에 한 바이트씩 보내는 느린 연결을 함께 열어 둔다 (동기 워커는 이 연결이
+워커를 하나씩 잡고, ASGI 워커는 이벤트 루프에서 기다린다).
+
+    python benchmarks/async_capacity.py                          # 4 워커, 1/8/32/128 연결
+    python benchmarks/async_capacity.py --levels 16 64 256 --slow-clients 8
+    python benchmarks/async_capacity.py --servers uvicorn --routes notices contact
+
+uvicorn 모드는 requirements-async.txt 가 필요하다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from routes import ROOT, ROUTES, build_request, free_port, git_commit, prepare, summarize  # noqa: E402
+
+CONFIG_ENV = 'BLH_BENCH_CONFIG'
+DEFAULT_ROUTES = ('notices', 'notice_detail', 'contact')
+
+
+def asgi_app():
+    """uvicorn --factory 진입점 (설정은 환경 변수의 JSON)"""
+    from async_mode import AsyncSite
+    from factory import create_app
+    from models import db
+
+    options = json.loads(os.environ[CONFIG_ENV])
+    app = create_app(options['config'], instance_path=options['instance'])
+    return AsyncSite(app, db)
+
+
+def start_server(kind, args, config, tmp):
+    port = free_port()
+    instance = os.path.join(tmp, f'instance-{kind}')
+    env = dict(os.environ)
+    if kind == 'gunicorn':
+        spec = f'factory:create_app({config!r}, instance_path={instance!r})'
+        command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(args.workers),
+                   '--timeout', str(int(args.timeout)), '--log-level', 'warning', spec]
+    else:
+        env[CONFIG_ENV] = json.dumps({'config': config, 'instance': instance})
+        command = [sys.executable, '-m', 'uvicorn', '--factory', 'async_capacity:asgi_app',
+                   '--app-dir', os.path.join(ROOT, 'benchmarks'), '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(args.workers), '--log-level', 'warning', '--no-access-log',
+                   '--timeout-graceful-shutdown', '10']
+    # 느린 연결 경고 등으로 파이프가 차서 서버가 멈추지 않도록 로그는 파일로
+    log = open(os.path.join(tmp, f'{kind}.log'), 'w+b')
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=log)
+    server.log = log
+    return server, port
+
+
+async def http_request(port, method, path, kind, body, timeout):
+    """Connection: close 요청 하나, 상태 코드 반환 (실패는 599)"""
+    data = b''
+    headers = [f'{method} {path} HTTP/1.1', f'Host: 127.0.0.1:{port}', 'Connection: close']
+    if kind == 'json':
+        data = json.dumps(body).encode()
+        headers.append('Content-Type: application/json')
+    elif kind == 'form':
+        data = urlencode(body).encode()
+        headers.append('Content-Type: application/x-www-form-urlencoded')
+    if data or method == 'POST':
+        headers.append(f'Content-Length: {len(data)}')
+    writer = None
+    try:
+        async with asyncio.timeout(timeout):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + data)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+        return int(status_line.split()[1])
+    except (OSError, TimeoutError, IndexError, ValueError):
+        return 599
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def wait_ready(server, port, kind):
+    deadline = time.time() + 60
+    while await http_request(port, 'GET', '/health', None, None, 5) != 200:
+        if server.poll() is not None or time.time() > deadline:
+            server.log.seek(0)
+            raise RuntimeError(f'{kind} did not start: ' + server.log.read().decode(errors='replace'))
+        await asyncio.sleep(0.2)
+
+
+async def slow_client(port, stop):
+    """요청 헤더를 1초에 한 바이트씩 보내며 연결을 붙잡고 있는 클라이언트"""
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        return
+    try:
+        writer.write(b'GET /notices HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+        while not stop.is_set():
+            writer.write(b'X')
+            await writer.drain()
+            try:
+                await asyncio.wait_for(stop.wait(), 1)
+            except TimeoutError:
+                pass
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_level(args, port, routes, ids, concurrency):
+    """concurrency 개 연결로 --seconds 동안 라우트를 돌아가며 호출"""
+    latencies, errors = [], [0]
+    stop = asyncio.Event()
+    slow = [asyncio.create_task(slow_client(port, stop)) for _ in range(args.slow_clients)]
+    await asyncio.sleep(0.5 if slow else 0)
+    start = time.perf_counter()
+
+    async def load(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() - start < args.seconds:
+            request = build_request(rng.choice(routes), rng, ids)
+            t = time.perf_counter()
+            status = await http_request(port, *request, args.timeout)
+            latencies.append(time.perf_counter() - t)
+            errors[0] += status >= 500
+
+    await asyncio.gather(*(load(args.seed + i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*slow)
+    return summarize(latencies, errors[0], elapsed)
+
+
+async def run_server(kind, args, routes, config, ids, tmp):
+    server, port = start_server(kind, args, config, tmp)
+    try:
+        await wait_ready(server, port, kind)
+        rng = random.Random(args.seed)
+        for _ in range(args.warmup):
+            await http_request(port, *build_request(rng.choice(routes), rng, ids), args.timeout)
+        results = {}
+        for concurrency in args.levels:
+            result = await run_level(args, port, routes, ids, concurrency)
+            results[str(concurrency)] = result
+            report_progress(kind, concurrency, result)
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        server.log.close()
+
+
+def report_progress(kind, concurrency, result):
+    if not result['requests']:
+        print(f'  {kind:<9} c={concurrency:<5} no requests (errors={result["errors"]})', flush=True)
+        return
+    print(f'  {kind:<9} c={concurrency:<5} n={result["requests"]:>6}  p50={result["p50"]:8.2f}ms  '
+          f'p95={result["p95"]:8.2f}ms  p99={result["p99"]:8.2f}ms  rps={result["rps"]:8.1f}  '
+          f'errors={result["errors"]}', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--servers', nargs='+', choices=('gunicorn', 'uvicorn'), default=['gunicorn', 'uvicorn'])
+    parser.add_argument('--levels', nargs='+', type=int, default=[1, 8, 32, 128], help='동시 연결 수 단계')
+    parser.add_argument('--slow-clients', type=int, default=0, help='함께 열어 둘 느린 연결 수')
+    parser.add_argument('--routes', nargs='+', metavar='NAME', default=list(DEFAULT_ROUTES),
+                        help='호출할 라우트 이름 (routes.py 의 ROUTES, admin 제외)')
+    parser.add_argument('--workers', type=int, default=4, help='서버별 워커 프로세스 수')
+    parser.add_argument('--seconds', type=float, default=10.0, help='단계별 측정 시간')
+    parser.add_argument('--timeout', type=float, default=30.0, help='요청 타임아웃 (초과 시 오류)')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--notices', type=int, default=10000)
+    parser.add_argument('--inquiries', type=int, default=50000)
+    parser.add_argument('--answers', type=int, default=100000)
+    parser.add_argument('--no-page-cache', action='store_true')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--data-dir', default=os.path.join(ROOT, 'benchmarks', '.data'))
+    parser.add_argument('--save', metavar='FILE', help='결과를 JSON 으로 저장')
+    args = parser.parse_args()
+    args.target = 'app'
+
+    routes = [r for r in ROUTES if r[0] in args.routes and r[3] != 'admin']
+    if not routes:
+        parser.error('no matching routes')
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, ids = prepare(args, tmp)
+        config = {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}', 'PAGE_CACHE_ENABLED': not args.no_page_cache,
+                  'RATE_LIMIT_ENABLED': False}
+        print(f'workers={args.workers} routes={",".join(r[0] for r in routes)} slow_clients={args.slow_clients} '
+              f'page_cache={"off" if args.no_page_cache else "on"}', flush=True)
+        for kind in args.servers:
+            results[kind] = asyncio.run(run_server(kind, args, routes, config, ids, tmp))
+
+    if args.save:
+        meta = {'commit': git_commit(), 'workers': args.workers, 'routes': [r[0] for r in routes],
+                'slow_clients': args.slow_clients, 'page_cache': not args.no_page_cache}
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'servers': results}, f, ensure_ascii=False, indent=1)
+        print(f'saved {args.save}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""콜드 스타트 측정 (app.py / api/index.py)
+
+gunicorn 워커나 Vercel 인스턴스가 새로 뜰 때처럼 매번 새 파이썬 프로세스에서
+진입점을 import 하고 첫 요청들을 처리하기까지의 시간을 잰다. 임시 DB 에
+공지/문의를 채우고(init-db) 서버리스용 스냅샷과 템플릿 바이트코드 캐시를 만든다.
+
+    python benchmarks/cold_start.py --runs 10 --notices 500
+    python benchmarks/cold_start.py --targets api --no-template-cache
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ('/notices', '/contact', '/api/notices', '/notices/1')
+TARGETS = {
+    'app': 'app',      # gunicorn app:app
+    'api': 'index',    # Vercel api/index.py
+}
+
+
+def seed(tmp, notices, inquiries):
+    """임시 원본 DB 를 채우고 스냅샷/템플릿 캐시 생성 (별도 프로세스에서 실행)"""
+    sys.path.insert(0, ROOT)
+    from factory import create_app, init_db
+    from models import db, Notice, Inquiry
+    import jinja_cache
+    import snapshot
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp}/source.db',
+                      'INQUIRY_QUEUE_ENABLED': False}, instance_path=os.path.join(tmp, 'seed'))
+    with app.app_context():
+        init_db(app, seed=False)
+        db.session.add_all(Notice(title=f'공지사항 {i}', content='내용 ' * 200, priority=int(i % 5 == 0))
+                           for i in range(notices))
+        db.session.add_all(Inquiry(name=f'문의자 {i}', email='a@example.com', message='문의 내용 ' * 50,
+                                   is_public=i % 3 != 0)
+                           for i in range(inquiries))
+        db.session.commit()
+        snapshot.build(db.engine.url.database, os.path.join(tmp, 'snapshot.db'))
+    jinja_cache.precompile(app, os.path.join(tmp, 'jinja_cache'))
+
+
+def child(target):
+    """콜드 스타트 1회: import 시간과 경로별 첫 요청 시간(ms)을 JSON 으로 출력"""
+    start = time.perf_counter()
+    sys.path.insert(0, os.path.join(ROOT, 'api') if target == 'api' else ROOT)
+    module = __import__(TARGETS[target])
+    timings = {'import': (time.perf_counter() - start) * 1000}
+    client = module.app.test_client()
+    for path in PATHS:
+        start = time.perf_counter()
+        response = client.get(path)
+        timings[path] = (time.perf_counter() - start) * 1000
+        assert response.status_code == 200, (path, response.status_code)
+    print(json.dumps(timings))
+
+
+def target_env(target, tmp, template_cache):
+    """진입점별 환경 변수 (app 은 원본 DB, api 는 스냅샷)"""
+    run_dir = tempfile.mkdtemp(dir=tmp)
+    env = dict(os.environ, INSTANCE_PATH=run_dir)
+    if target == 'app':
+        env['DATABASE_URL'] = f'sqlite:///{tmp}/source.db'
+    else:
+        env['DATABASE_SNAPSHOT'] = os.path.join(tmp, 'snapshot.db')
+    env['JINJA_CACHE_DIR'] = os.path.join(tmp, 'jinja_cache') if template_cache else ''
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--notices', type=int, default=500)
+    parser.add_argument('--inquiries', type=int, default=500)
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument('--no-template-cache', action='store_true',
+                        help='미리 컴파일한 템플릿 바이트코드 없이 측정')
+    parser.add_argument('--seed', metavar='DIR', help=argparse.SUPPRESS)
+    parser.add_argument('--child', choices=list(TARGETS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        return seed(args.seed, args.notices, args.inquiries)
+    if args.child:
+        return child(args.child)
+
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as tmp:
+        subprocess.run([sys.executable, script, '--seed', tmp, '--notices', str(args.notices),
+                        '--inquiries', str(args.inquiries)], check=True, capture_output=True)
+        print(f'notices={args.notices} inquiries={args.inquiries} runs={args.runs} '
+              f'snapshot={os.path.getsize(os.path.join(tmp, "snapshot.db")) / 1024:.0f}KiB '
+              f'template_cache={"off" if args.no_template_cache else "on"}')
+
+        for target in args.targets:
+            runs = []
+            for _ in range(args.runs):
+                # 매 회 새 프로세스와 새 instance 디렉터리 (.pyc 는 유지되는 웜 디스크 콜드 스타트)
+                env = target_env(target, tmp, not args.no_template_cache)
+                wall = time.perf_counter()
+                out = subprocess.run([sys.executable, script, '--child', target], env=env, check=True,
+                                     capture_output=True, text=True).stdout
+                timings = json.loads(out.strip().splitlines()[-1])
+                timings['process'] = (time.perf_counter() - wall) * 1000
+                runs.append(timings)
+
+            print(f'[{target}]')
+            for key in ('process', 'import') + PATHS:
+                values = sorted(r[key] for r in runs)
+                print(f'  {key:<12} median={statistics.median(values):8.1f}ms  '
+                      f'min={values[0]:8.1f}ms  max={values[-1]:8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,525 @@
+"""전체 라우트 부하 테스트 (in-process WSGI / 로컬 gunicorn)
+
+공지/문의/답변을 지정한 양만큼 채운 SQLite DB 에서 공개·관리자·API 라우트를
+모두 호출해 라우트별 p50/p95/p99 지연, 처리량, 오류 수와 최대 RSS 를 보고한다.
+채운 DB 는 --data-dir 에 양별로 보관해 다음 실행에서 재사용하고, 실행마다
+복사본을 써서 쓰기 라우트가 원본을 바꾸지 않게 한다.
+
+    python benchmarks/routes.py                                  # in-process, app.py 설정
+    python benchmarks/routes.py --target api                     # api/index.py (읽기 전용 스냅샷)
+    python benchmarks/routes.py --mode gunicorn --workers 4 --concurrency 8
+    python benchmarks/routes.py --notices 100000 --inquiries 500000 --answers 1000000
+
+결과를 저장해 두고 커밋마다 비교한다 (p95 또는 처리량이 --threshold 이상 나빠진
+라우트가 있으면 종료 코드 1):
+
+    python benchmarks/routes.py --save benchmarks/baselines/main.json
+    python benchmarks/routes.py --compare benchmarks/baselines/main.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORDS = ('전기차', '배터리', '진단', '경매', '플랫폼', '중고차', '서비스', '출시', '안내', '점검',
+         '상담', '견적', '보증', '충전', '성능', '리포트', '가격', '매입', '일정', '문의')
+
+# (이름, 메서드, 경로, 종류, 본문) - 경로의 {notice}/{inquiry}/{word} 는 요청마다 무작위 값
+ROUTES = [
+    ('landing', 'GET', '/', 'public', None),
+    ('home', 'GET', '/home', 'public', None),
+    ('landing_alias', 'GET', '/landing', 'public', None),
+    ('services', 'GET', '/services', 'public', None),
+    ('about', 'GET', '/about', 'public', None),
+    ('contact', 'GET', '/contact', 'public', None),
+    ('notices', 'GET', '/notices', 'public', None),
+    ('notice_detail', 'GET', '/notices/{notice}', 'public', None),
+    ('contact_inquiry', 'GET', '/contact/inquiries/{inquiry}', 'public', None),
+    ('search', 'GET', '/search?q={word}', 'public', None),
+    ('static_css', 'GET', '/static/css/style.css', 'public', None),
+    ('sitemap', 'GET', '/sitemap.xml', 'public', None),
+    ('robots', 'GET', '/robots.txt', 'public', None),
+    ('health', 'GET', '/health', 'public', None),
+    ('test', 'GET', '/test', 'public', None),
+    ('api_notices', 'GET', '/api/notices', 'api', None),
+    ('api_notices_100', 'GET', '/api/notices?limit=100', 'api', None),
+    ('api_search', 'GET', '/api/search?q={word}', 'api', None),
+    ('api_company_info', 'GET', '/api/company-info', 'api', None),
+    ('api_cache_stats', 'GET', '/api/cache-stats', 'api', None),
+    ('api_test', 'GET', '/api/test', 'api', None),
+    ('metrics', 'GET', '/metrics', 'api', None),
+    ('api_inquiry', 'POST', '/api/inquiry', 'api', 'inquiry'),
+    # 없는 접수 번호 (큐 조회 비용은 같음)
+    ('api_inquiry_status', 'GET', '/api/inquiry/bench-missing', 'api', None),
+    ('api_notice_view', 'POST', '/api/notices/{notice}/view', 'api', None),
+    ('admin_login_form', 'GET', '/admin/login', 'admin', None),
+    ('admin_login', 'POST', '/admin/login', 'admin', 'login'),
+    # 관리자 세션으로 부르면 이후 관리자 라우트가 모두 로그인으로 리다이렉트되므로 세션 없이
+    ('admin_logout', 'GET', '/admin/logout', 'public', None),
+    ('admin_logout_post', 'POST', '/admin/logout', 'public', None),
+    ('admin_root', 'GET', '/admin', 'admin', None),
+    ('admin_dashboard', 'GET', '/admin/dashboard', 'admin', None),
+    ('admin_notices', 'GET', '/admin/notices', 'admin', None),
+    ('admin_notice_new_form', 'GET', '/admin/notices/new', 'admin', None),
+    ('admin_notice_edit_form', 'GET', '/admin/notices/{notice}/edit', 'admin', None),
+    ('admin_inquiries', 'GET', '/admin/inquiries', 'admin', None),
+    ('admin_inquiry_detail', 'GET', '/admin/inquiries/{inquiry}', 'admin', None),
+    ('admin_inquiries_export', 'GET', '/admin/inquiries/export?format=csv&status=processed', 'admin', None),
+    ('admin_inquiry_toggle', 'POST', '/admin/inquiries/{inquiry}', 'admin', 'toggle'),
+    ('admin_notice_create', 'POST', '/admin/notices/new', 'admin', 'notice'),
+    ('admin_notice_edit', 'POST', '/admin/notices/{notice}/edit', 'admin', 'notice'),
+    ('api_admin_bulk', 'POST', '/api/admin/inquiries/bulk', 'admin', 'bulk'),
+    ('admin_inquiries_bulk', 'POST', '/admin/inquiries/bulk', 'admin', 'bulk_form'),
+    ('admin_notices_bulk', 'POST', '/admin/notices/bulk', 'admin', 'notice_bulk_form'),
+    # 공지를 지우므로 마지막에 (지운 공지를 부르는 요청은 404)
+    ('admin_notice_delete', 'POST', '/admin/notices/{notice}/delete', 'admin', None),
+]
+
+# 스냅샷 배포에서 쓰기가 막혀 리다이렉트만 하거나 전달 주소가 없어 503 인 라우트는 제외
+READ_ONLY_SKIP = {'admin_inquiry_toggle', 'admin_notice_create', 'admin_notice_edit', 'admin_notice_delete',
+                  'api_admin_bulk', 'admin_inquiries_bulk', 'admin_notices_bulk', 'api_inquiry'}
+
+
+# 데이터 준비 -----------------------------------------------------------------
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def stamp(value):
+    """SQLAlchemy 가 SQLite 에 저장하는 DATETIME 문자열 형식"""
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def seed(path, notices, inquiries, answers):
+    """마이그레이션 후 대량 삽입, 검색 색인/집계는 마지막에 한 번에 생성"""
+    from factory import create_app
+    from dashboard_stats import dashboard_stats
+    from models import db
+    from search import search_index
+    import migrations
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'INQUIRY_QUEUE_ENABLED': False,
+                      'METRICS_ENABLED': False, 'QUERY_PROFILER_ENABLED': False},
+                     instance_path=os.path.join(os.path.dirname(path), 'seed-instance'))
+    with app.app_context():
+        migrations.migrate(db.engine)
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.executemany(
+                'INSERT INTO notice (title, content, author, created_at, updated_at, priority, '
+                'is_published, view_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                ((text(rng, 4), text(rng, 60), '관리자', stamp(now - timedelta(minutes=i * 7)),
+                  stamp(now - timedelta(minutes=i * 7)), int(rng.random() < 0.05), rng.random() < 0.95,
+                  rng.randrange(1000))
+                 for i in range(notices)))
+            conn.executemany(
+                'INSERT INTO inquiry (name, email, phone, company, service_interest, message, created_at, '
+                'is_processed, is_public) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((f'문의자{i}', f'user{i}@example.com', '010-0000-0000', '', rng.choice(WORDS),
+                  text(rng, 30), stamp(now - timedelta(minutes=i)), rng.random() < 0.6, rng.random() < 0.7)
+                 for i in range(inquiries)))
+            if inquiries:
+                conn.executemany(
+                    'INSERT INTO inquiry_answer (inquiry_id, admin_name, content, created_at) VALUES (?, ?, ?, ?)',
+                    ((rng.randrange(1, inquiries + 1), '관리자', text(rng, 20), stamp(now - timedelta(seconds=i)))
+                     for i in range(answers)))
+        conn.close()
+        search_index.ensure_schema()
+        dashboard_stats.ensure_schema()
+        db.engine.dispose()
+    # 복사해 쓸 수 있게 WAL 을 정리한 단일 파일로
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('ANALYZE')
+    conn.execute('PRAGMA journal_mode=DELETE')
+    conn.close()
+
+
+def prepare(args, tmp):
+    """채운 DB(캐시) 복사본 경로와 요청에 쓸 id 목록"""
+    import migrations
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    cached = os.path.join(args.data_dir,
+                          f'seed-{args.notices}-{args.inquiries}-{args.answers}-v{migrations.LATEST}.db')
+    if not os.path.exists(cached):
+        print(f'seeding {cached} ...', flush=True)
+        start = time.perf_counter()
+        seed(cached + '.tmp', args.notices, args.inquiries, args.answers)
+        os.replace(cached + '.tmp', cached)
+        print(f'seeded in {time.perf_counter() - start:.1f}s', flush=True)
+
+    path = os.path.join(tmp, 'bench.db')
+    shutil.copyfile(cached, path)
+    if args.target == 'api':
+        import snapshot
+        snapshot.build(path, os.path.join(tmp, 'snapshot.db'))
+
+    with sqlite3.connect(path) as conn:
+        ids = {
+            'notice': [r[0] for r in conn.execute('SELECT id FROM notice WHERE is_published = 1')],
+            'inquiry': [r[0] for r in conn.execute('SELECT id FROM inquiry WHERE is_public = 1')],
+        }
+    return path, ids
+
+
+def app_config(args, tmp, db_path):
+    config = {
+        'QUERY_LOG_PATH': os.path.join(tmp, 'queries.jsonl'),
+        'PAGE_CACHE_ENABLED': not args.no_page_cache,
+        # 한 IP 에서 쓰기 라우트를 반복 호출하므로 빈도 제한 없이 측정
+        'RATE_LIMIT_ENABLED': False,
+        'METRICS_ENDPOINT_ENABLED': True,
+        'METRICS_TOKEN': None,
+    }
+    if args.target == 'api':
+        config.update(DATABASE_SNAPSHOT=os.path.join(tmp, 'snapshot.db'), DATABASE_READ_ONLY=True)
+    else:
+        config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    return config
+
+
+def uncovered_routes(config, tmp):
+    """앱의 URL 규칙(엔드포인트, 메서드) 중 ROUTES 에 항목이 없는 것"""
+    from factory import create_app
+
+    app = create_app(dict(config, METRICS_DIR=''), instance_path=os.path.join(tmp, 'instance'))
+    adapter = app.url_map.bind('localhost')
+    covered = set()
+    for name, method, path, kind, body in ROUTES:
+        url = path.format(notice=1, inquiry=1, word='x').split('?', 1)[0]
+        endpoint, _ = adapter.match(url, method=method)
+        covered.add((endpoint, method))
+    return sorted(f'{method} {rule.rule} ({rule.endpoint})' for rule in app.url_map.iter_rules()
+                  for method in rule.methods - {'HEAD', 'OPTIONS'} if (rule.endpoint, method) not in covered)
+
+
+def build_request(route, rng, ids):
+    name, method, path, kind, body = route
+    path = path.format(notice=rng.choice(ids['notice'] or [1]), inquiry=rng.choice(ids['inquiry'] or [1]),
+                       word=quote(rng.choice(WORDS)))
+    if body == 'inquiry':
+        return method, path, 'json', {'name': '부하테스트', 'email': 'bench@example.com',
+                                      'message': text(rng, 20), 'is_public': True}
+    if body == 'login':
+        return method, path, 'json', {'username': 'bhl', 'password': 'bhl1004'}
+    if body == 'toggle':
+        return method, path, 'form', {'action': 'toggle_processed'}
+    if body == 'bulk':
+        return method, path, 'json', {'action': rng.choice(('mark_processed', 'mark_unprocessed')),
+                                      'ids': rng.sample(ids['inquiry'], min(500, len(ids['inquiry'])))}
+    if body == 'bulk_form':
+        return method, path, 'form', {'action': rng.choice(('mark_processed', 'mark_unprocessed')),
+                                      'ids': rng.sample(ids['inquiry'], min(500, len(ids['inquiry'])))}
+    if body == 'notice_bulk_form':
+        return method, path, 'form', {'action': 'set_priority', 'priority': rng.choice(('0', '1')),
+                                      'ids': rng.sample(ids['notice'], min(500, len(ids['notice'])))}
+    if body == 'notice':
+        return method, path, 'form', {'title': text(rng, 4), 'content': text(rng, 60), 'priority': '0',
+                                      'is_published': 'on'}
+    return method, path, None, None
+
+
+# 실행 -------------------------------------------------------------------
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    if not values:
+        return {'requests': 0, 'errors': errors}
+
+    def pct(p):
+        return values[min(len(values) - 1, int(round(p / 100 * len(values) + 0.5)) - 1)] * 1000
+
+    return {'requests': len(values), 'errors': errors, 'rps': len(values) / elapsed,
+            'mean': statistics.fmean(values) * 1000, 'p50': pct(50), 'p95': pct(95), 'p99': pct(99)}
+
+
+def run_inprocess(args, routes, config, ids, tmp):
+    """test_client 로 WSGI 앱을 직접 호출 (단일 스레드)"""
+    from factory import create_app
+
+    # 한 프로세스뿐이므로 계측은 워커 파일 없이 메모리에만
+    app = create_app(dict(config, METRICS_DIR=''), instance_path=os.path.join(tmp, 'instance'))
+    client = app.test_client()
+    admin = app.test_client()
+    admin.post('/admin/login', json={'username': 'bhl', 'password': 'bhl1004'})
+    rng = random.Random(args.seed)
+    results = {}
+    for route in routes:
+        session = admin if route[3] == 'admin' else client
+        for _ in range(args.warmup):
+            call(session, *build_request(route, rng, ids))
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        while len(latencies) < args.requests and (not latencies or time.perf_counter() - start < args.seconds):
+            request = build_request(route, rng, ids)
+            t = time.perf_counter()
+            status = call(session, *request)
+            latencies.append(time.perf_counter() - t)
+            errors += status >= 500
+        results[route[0]] = summarize(latencies, errors, time.perf_counter() - start)
+        report_progress(route[0], results[route[0]])
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results, {'peak_rss_kib': peak}
+
+
+def call(client, method, path, kind, body):
+    if kind == 'json':
+        return client.open(path, method=method, json=body).status_code
+    if kind == 'form':
+        return client.open(path, method=method, data=body).status_code
+    return client.open(path, method=method).status_code
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def http_call(port, method, path, kind, body, cookie=None):
+    headers = {'Connection': 'close'}
+    data = None
+    if cookie:
+        headers['Cookie'] = cookie
+    if kind == 'json':
+        data = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    elif kind == 'form':
+        from urllib.parse import urlencode
+        data = urlencode(body, doseq=True).encode()
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request(method, path, body=data, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status, response.getheader('Set-Cookie')
+    finally:
+        conn.close()
+
+
+def worker_rss(pid):
+    """gunicorn 마스터의 워커별 최대 RSS(KiB) (Linux /proc)"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+    peaks = []
+    for child in children:
+        try:
+            with open(f'/proc/{child}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        peaks.append(int(line.split()[1]))
+        except OSError:
+            pass
+    return peaks
+
+
+def run_gunicorn(args, routes, config, ids, tmp):
+    """로컬 gunicorn 에 --concurrency 개 스레드로 HTTP 요청"""
+    port = free_port()
+    instance = os.path.join(tmp, 'instance')
+    spec = f'factory:create_app({config!r}, instance_path={instance!r})'
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+                               '--workers', str(args.workers), '--log-level', 'warning', spec],
+                              cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        deadline = time.time() + 60
+        while True:
+            try:
+                if http_call(port, 'GET', '/health', None, None)[0] == 200:
+                    break
+            except OSError:
+                pass
+            if server.poll() is not None or time.time() > deadline:
+                raise RuntimeError('gunicorn did not start: ' + server.stderr.read().decode(errors='replace'))
+            time.sleep(0.2)
+
+        _, set_cookie = http_call(port, 'POST', '/admin/login', 'json', {'username': 'bhl', 'password': 'bhl1004'})
+        cookie = set_cookie.split(';', 1)[0] if set_cookie else None
+        results = {}
+        for route in routes:
+            rng = random.Random(args.seed)
+            for _ in range(args.warmup):
+                http_call(port, *build_request(route, rng, ids), cookie=cookie if route[3] == 'admin' else None)
+            latencies, errors = [], [0]
+            lock = threading.Lock()
+            start = time.perf_counter()
+
+            def load(seed):
+                local_rng = random.Random(seed)
+                while True:
+                    with lock:
+                        done = len(latencies) >= args.requests or (
+                            latencies and time.perf_counter() - start >= args.seconds)
+                    if done:
+                        return
+                    request = build_request(route, local_rng, ids)
+                    t = time.perf_counter()
+                    try:
+                        status, _ = http_call(port, *request, cookie=cookie if route[3] == 'admin' else None)
+                    except OSError:
+                        status = 599
+                    elapsed = time.perf_counter() - t
+                    with lock:
+                        latencies.append(elapsed)
+                        errors[0] += status >= 500
+
+            threads = [threading.Thread(target=load, args=(args.seed + i,)) for i in range(args.concurrency)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            results[route[0]] = summarize(latencies, errors[0], time.perf_counter() - start)
+            report_progress(route[0], results[route[0]])
+        peaks = worker_rss(server.pid)
+        return results, {'peak_rss_kib': max(peaks, default=0), 'total_rss_kib': sum(peaks)}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+# 보고/비교 ----------------------------------------------------------------
+
+def report_progress(name, result):
+    if not result['requests']:
+        print(f'  {name:<24} no requests')
+        return
+    print(f'  {name:<24} n={result["requests"]:>5}  p50={result["p50"]:8.2f}ms  p95={result["p95"]:8.2f}ms  '
+          f'p99={result["p99"]:8.2f}ms  rps={result["rps"]:8.1f}  errors={result["errors"]}', flush=True)
+
+
+def query_events(tmp):
+    counts = {}
+    try:
+        with open(os.path.join(tmp, 'queries.jsonl'), encoding='utf-8') as f:
+            for line in f:
+                event = json.loads(line).get('event')
+                counts[event] = counts.get(event, 0) + 1
+    except OSError:
+        pass
+    return counts
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """라우트별 p50/p95/p99/처리량 변화율, 나빠진 라우트 이름 목록 반환"""
+    regressions = []
+    print(f'\ncompared with {baseline["meta"].get("commit")} ({baseline["meta"].get("date")})')
+    different = [key for key in ('target', 'mode', 'notices', 'inquiries', 'answers', 'workers', 'concurrency',
+                                 'page_cache') if baseline['meta'].get(key) != current['meta'].get(key)]
+    if different:
+        print(f'  warning: baseline was run with different settings: {", ".join(different)}')
+    print(f'  {"route":<24} {"p50":>8} {"p95":>8} {"p99":>8} {"rps":>8}')
+    for name, result in current['routes'].items():
+        before = baseline['routes'].get(name)
+        if not before or not before.get('requests') or not result.get('requests'):
+            print(f'  {name:<24} (no baseline)')
+            continue
+        changes = {key: (result[key] - before[key]) / before[key] if before[key] else 0.0
+                   for key in ('p50', 'p95', 'p99', 'rps')}
+        regressed = changes['p95'] > threshold or changes['rps'] < -threshold
+        if regressed:
+            regressions.append(name)
+        print(f'  {name:<24} ' + ' '.join(f'{changes[k]:+8.1%}' for k in ('p50', 'p95', 'p99', 'rps'))
+              + ('  REGRESSION' if regressed else ''))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', choices=('app', 'api'), default='app')
+    parser.add_argument('--mode', choices=('inprocess', 'gunicorn'), default='inprocess')
+    parser.add_argument('--notices', type=int, default=10000)
+    parser.add_argument('--inquiries', type=int, default=50000)
+    parser.add_argument('--answers', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200, help='라우트별 최대 요청 수')
+    parser.add_argument('--seconds', type=float, default=5.0, help='라우트별 최대 측정 시간')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn 워커 수')
+    parser.add_argument('--concurrency', type=int, default=8, help='gunicorn 모드 동시 요청 수')
+    parser.add_argument('--routes', nargs='+', metavar='NAME', help='일부 라우트만 (이름 또는 public/api/admin)')
+    parser.add_argument('--no-page-cache', action='store_true')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--data-dir', default=os.path.join(ROOT, 'benchmarks', '.data'))
+    parser.add_argument('--save', metavar='FILE', help='결과를 JSON 으로 저장')
+    parser.add_argument('--compare', metavar='FILE', help='저장한 기준 결과와 비교')
+    parser.add_argument('--threshold', type=float, default=0.10, help='회귀로 볼 p95/처리량 변화율')
+    args = parser.parse_args()
+
+    routes = [r for r in ROUTES if not args.routes or r[0] in args.routes or r[3] in args.routes]
+    if args.target == 'api':
+        routes = [r for r in routes if r[0] not in READ_ONLY_SKIP]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, ids = prepare(args, tmp)
+        config = app_config(args, tmp, db_path)
+        # 새 라우트를 추가하면 여기에도 항목을 넣어야 측정에서 빠지지 않는다
+        missing = uncovered_routes(config, tmp)
+        if missing:
+            raise SystemExit('benchmarks/routes.py ROUTES has no entry for:\n  ' + '\n  '.join(missing))
+        print(f'target={args.target} mode={args.mode} notices={args.notices} inquiries={args.inquiries} '
+              f'answers={args.answers} page_cache={"off" if args.no_page_cache else "on"}', flush=True)
+        wall = time.perf_counter()
+        runner = run_gunicorn if args.mode == 'gunicorn' else run_inprocess
+        results, memory = runner(args, routes, config, ids, tmp)
+        wall = time.perf_counter() - wall
+        events = query_events(tmp)
+
+    total = sum(r['requests'] for r in results.values())
+    print(f'\ntotal requests={total} wall={wall:.1f}s throughput={total / wall:.1f}/s '
+          f'peak_rss={memory["peak_rss_kib"] / 1024:.1f}MiB query_events={events}')
+
+    current = {
+        'meta': {'commit': git_commit(), 'date': datetime.utcnow().isoformat(timespec='seconds'),
+                 'target': args.target, 'mode': args.mode, 'notices': args.notices,
+                 'inquiries': args.inquiries, 'answers': args.answers, 'workers': args.workers,
+                 'concurrency': args.concurrency, 'page_cache': not args.no_page_cache,
+                 'python': platform.python_version(), 'machine': platform.machine()},
+        'routes': results,
+        'memory': memory,
+        'query_events': events,
+    }
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=1)
+        print(f'saved {args.save}')
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
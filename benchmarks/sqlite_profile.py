@@ -0,0 +1,114 @@
+"""SQLite 엔진 프로필 동시 읽기/쓰기 벤치마크
+
+gunicorn 워커처럼 여러 프로세스가 같은 DB 파일에 동시에 읽기(공지 목록 조회)와
+쓰기(문의 저장)를 수행할 때의 처리량과 잠금 오류 수를 프로필별로 비교한다.
+
+    python benchmarks/sqlite_profile.py --workers 4 --seconds 5 --write-ratio 0.2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+import db_profile  # noqa: E402
+
+SCHEMA = [
+    'CREATE TABLE notice (id INTEGER PRIMARY KEY, title TEXT, content TEXT, priority INTEGER, '
+    'created_at TEXT, is_published BOOLEAN, view_count INTEGER DEFAULT 0)',
+    'CREATE INDEX ix_notice_feed ON notice (priority, created_at, id)',
+    'CREATE TABLE inquiry (id INTEGER PRIMARY KEY, name TEXT, email TEXT, message TEXT, created_at TEXT)',
+]
+
+
+def make_engine(path, profile):
+    options = db_profile.engine_options(profile)
+    engine = create_engine(f'sqlite:///{path}', **options)
+    db_profile.install(engine, profile)
+    return engine
+
+
+def seed(path, rows):
+    engine = make_engine(path, 'default')
+    with engine.begin() as conn:
+        for stmt in SCHEMA:
+            conn.exec_driver_sql(stmt)
+        conn.execute(
+            text("INSERT INTO notice (title, content, priority, created_at, is_published) "
+                 "VALUES (:t, :c, :p, datetime('now', :d), 1)"),
+            [{'t': f'notice {i}', 'c': 'x' * 500, 'p': i % 2, 'd': f'-{i} minutes'} for i in range(rows)]
+        )
+    engine.dispose()
+
+
+def worker(path, profile, seconds, write_ratio, results):
+    engine = make_engine(path, profile)
+    reads = writes = errors = 0
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if random.random() < write_ratio:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO inquiry (name, email, message, created_at) "
+                                      "VALUES ('n', 'e', 'm', datetime('now'))"))
+                writes += 1
+            else:
+                with engine.connect() as conn:
+                    conn.execute(text('SELECT id, title FROM notice WHERE is_published = 1 '
+                                      'ORDER BY priority DESC, created_at DESC, id DESC LIMIT 12')).fetchall()
+                reads += 1
+        except Exception as e:
+            if not db_profile.is_locked_error(e):
+                raise
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    engine.dispose()
+    results.put((reads, writes, errors, latencies))
+
+
+def run(profile, workers, seconds, write_ratio, rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, rows)
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=worker, args=(path, profile, seconds, write_ratio, results))
+                 for _ in range(workers)]
+        for p in procs:
+            p.start()
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    reads = sum(r[0] for r in collected)
+    writes = sum(r[1] for r in collected)
+    errors = sum(r[2] for r in collected)
+    latencies = sorted(l for r in collected for l in r[3])
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+    print(f'{profile:<11} reads/s={reads / seconds:>9.0f}  writes/s={writes / seconds:>8.0f}  '
+          f'locked={errors:>4}  p99={p99:7.2f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--profiles', nargs='+', default=[p for p in db_profile.PROFILES if p != 'snapshot'])
+    args = parser.parse_args()
+
+    print(f'workers={args.workers} seconds={args.seconds} write_ratio={args.write_ratio} rows={args.rows}')
+    for profile in args.profiles:
+        run(profile, args.workers, args.seconds, args.write_ratio, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""관리자 일괄 작업 (문의 처리/공개, 공지 게시/중요도/삭제)
+
+선택한 id 들을 집합 단위 UPDATE / DELETE 문으로 한 트랜잭션에서 처리한다.
+id 목록은 JSON 배열 파라미터 하나로 넘겨 `id IN (SELECT value FROM json_each(?))`
+로 비교하므로 id 수와 관계없이 작업당 문장 하나이며 SQLite 바인드 변수 한도에도
+걸리지 않는다. 검색 색인과 대시보드 집계는 기존 행 단위 트리거가 그대로 갱신한다.
+"""
+import json
+
+from sqlalchemy import delete, func, select, update
+
+from db_profile import commit_with_retry
+from models import Inquiry, InquiryAnswer, Notice
+
+# 한 요청에서 처리할 수 있는 최대 id 수
+MAX_IDS = 10000
+# Notice.priority 값 (0: 일반, 1: 중요)
+PRIORITIES = (0, 1)
+
+
+class BulkActionError(ValueError):
+    """알 수 없는 작업/대상 또는 잘못된 id 목록"""
+
+
+def id_set(ids):
+    """ids JSON 배열 -> SELECT value FROM json_each(:ids)"""
+    values = func.json_each(json.dumps(ids)).table_valued('value')
+    return select(values.c.value)
+
+
+def _update(model, **values):
+    def statements(ids):
+        return [update(model).where(model.id.in_(id_set(ids))).values(**values)]
+    return statements
+
+
+def _delete_inquiries(ids):
+    return [delete(InquiryAnswer).where(InquiryAnswer.inquiry_id.in_(id_set(ids))),
+            delete(Inquiry).where(Inquiry.id.in_(id_set(ids)))]
+
+
+def _delete_notices(ids):
+    return [delete(Notice).where(Notice.id.in_(id_set(ids)))]
+
+
+def _set_priority(priority):
+    return _update(Notice, priority=priority)
+
+
+# 대상 -> 작업 -> ids 묶음을 받아 실행할 문장 목록을 만드는 함수
+# (마지막 문장의 rowcount 를 영향받은 행 수로 셈)
+ACTIONS = {
+    'inquiry': {
+        'mark_processed': _update(Inquiry, is_processed=True),
+        'mark_unprocessed': _update(Inquiry, is_processed=False),
+        'publish': _update(Inquiry, is_public=True),
+        'unpublish': _update(Inquiry, is_public=False),
+        'delete': _delete_inquiries,
+    },
+    'notice': {
+        'publish': _update(Notice, is_published=True),
+        'unpublish': _update(Notice, is_published=False),
+        'set_priority': None,  # priority 인자 필요
+        'delete': _delete_notices,
+    },
+}
+
+
+def parse_ids(values):
+    """JSON 의 id 목록 -> 중복 없는 정수 목록
+
+    정수 배열만 받는다 (문자열/객체를 순회해 글자나 키를 id 로 읽지 않도록,
+    bool/실수도 거절).
+    """
+    if not isinstance(values, list) or not all(type(v) is int for v in values):
+        raise BulkActionError('ids 는 정수 목록이어야 합니다.')
+    ids = sorted(set(values))
+    if not ids:
+        raise BulkActionError('선택한 항목이 없습니다.')
+    if len(ids) > MAX_IDS:
+        raise BulkActionError(f'한 번에 최대 {MAX_IDS}개까지 처리할 수 있습니다.')
+    return ids
+
+
+def parse_form_ids(values):
+    """폼의 ids 값 목록(숫자 문자열) -> parse_ids"""
+    if not all(isinstance(v, str) and v.isascii() and v.isdigit() for v in values):
+        raise BulkActionError('ids 는 정수 목록이어야 합니다.')
+    return parse_ids([int(v) for v in values])
+
+
+def parse_priority(value):
+    """중요도 (Notice.priority: 0 일반, 1 중요), 폼 값은 '0'/'1'"""
+    if type(value) is str and value in ('0', '1'):
+        return int(value)
+    if type(value) is int and value in PRIORITIES:
+        return value
+    raise BulkActionError('priority 는 0(일반) 또는 1(중요)이어야 합니다.')
+
+
+def run(session, target, action, ids, priority=None):
+    """일괄 작업 실행 후 영향받은 행 수 반환"""
+    actions = ACTIONS.get(target)
+    if actions is None or action not in actions:
+        raise BulkActionError(f'알 수 없는 작업입니다: {action}')
+    if action == 'set_priority':
+        build = _set_priority(parse_priority(priority))
+    else:
+        build = actions[action]
+
+    affected = [0]
+
+    def apply():
+        for stmt in build(ids):
+            result = session.execute(stmt.execution_options(synchronize_session=False))
+        affected[0] = result.rowcount
+    commit_with_retry(session, apply)
+    return affected[0]
@@ -0,0 +1,188 @@
+"""응답 압축 (brotli / gzip)
+
+after_request 에서 Accept-Encoding 협상으로 br(Brotli 설치 시) 또는 gzip 을 골라
+텍스트 응답(COMPRESSIBLE_MIMETYPES)을 압축한다. 이미 인코딩된 응답(사전 압축 정적
+자산), 파일 응답(direct_passthrough, sendfile 경로), 200 이 아닌 응답과
+COMPRESS_MIN_SIZE 보다 작은 본문은 그대로 보낸다.
+
+- 스트리밍 응답(문의 내보내기 등 제너레이터)은 청크마다 압축기에 넣어 흘려보내며
+  본문 전체를 메모리에 모으지 않는다.
+- ETag 가 있는 응답(conditional 데코레이터를 쓰는 /contact, /notices 등)은
+  (ETag, 인코딩) 을 키로 압축 결과를 워커별 LRU(page_cache.MemoryBackend)에 보관해
+  같은 표현을 다시 압축하지 않는다. 캐시 항목은 원본 본문의 해시와 함께 저장해
+  같은 ETag 로 다른 본문이 나가더라도 예전 압축 결과를 쓰지 않는다.
+
+압축한 응답의 ETag 에는 인코딩 접미사를 붙이고(`"<etag>-br"`) Vary: Accept-Encoding 을
+붙인다. conditional 은 이 요청에 협상될 인코딩(negotiate)의 ETag 만 If-None-Match 와 맞춰 본다.
+nginx 는 이미 Content-Encoding 이 있는 프록시 응답을 다시 압축하지 않는다.
+"""
+import gzip
+import hashlib
+import threading
+import zlib
+
+from flask import request
+
+from conditional import encoded_etag
+from page_cache import MemoryBackend
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/xml', 'text/javascript',
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'image/svg+xml',
+}
+
+
+def _import_brotli():
+    try:
+        import brotli
+    except ImportError:  # Brotli 미설치 시 gzip 만 사용
+        return None
+    return brotli
+
+
+class ResponseCompressor:
+    """after_request 압축 + ETag 응답의 압축 본문 캐시"""
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        self.cache_timeout = 3600
+        self.brotli = None
+        self.cache = None
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.streamed = 0
+        self.cache_hits = 0
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+        app.config.setdefault('COMPRESS_CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('COMPRESS_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+        app.config.setdefault('COMPRESS_CACHE_TIMEOUT', 3600)
+
+        self.enabled = app.config['COMPRESS_ENABLED']
+        if not self.enabled:
+            return
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        self.gzip_level = app.config['COMPRESS_GZIP_LEVEL']
+        self.brotli_quality = app.config['COMPRESS_BROTLI_QUALITY']
+        self.cache_timeout = app.config['COMPRESS_CACHE_TIMEOUT']
+        self.brotli = _import_brotli()
+        self.cache = MemoryBackend(max_entries=app.config['COMPRESS_CACHE_MAX_ENTRIES'],
+                                   max_bytes=app.config['COMPRESS_CACHE_MAX_BYTES'])
+        app.after_request(self.compress_response)
+
+    # 협상 ---------------------------------------------------------------
+
+    def negotiate(self):
+        """클라이언트가 받는 인코딩 중 품질값이 높은 것 (같으면 br 우선), 없으면 None"""
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for encoding in (('br', 'gzip') if self.brotli is not None else ('gzip',)):
+            quality = accepted[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _compressible(self, response):
+        return (response.status_code == 200
+                and not response.direct_passthrough
+                and 'Content-Encoding' not in response.headers
+                and response.mimetype in COMPRESSIBLE_MIMETYPES)
+
+    def compress_response(self, response):
+        if not self._compressible(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            self._stream(response, encoding)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._compress_cached(response, data, encoding))
+            response.headers['Content-Encoding'] = encoding
+        # 인코딩마다 다른 바이트이므로 원본과 다른 ETag (강한 검증자 충돌 방지)
+        etag, weak = response.get_etag()
+        if etag is not None:
+            response.set_etag(encoded_etag(etag, encoding), weak=weak)
+        return response
+
+    # 압축 ---------------------------------------------------------------
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return self.brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, self.gzip_level, mtime=0)
+
+    def _compress_cached(self, response, data, encoding):
+        etag, weak = response.get_etag()
+        if etag is None or weak:
+            with self._lock:
+                self.compressed += 1
+            return self.compress(data, encoding)
+        key = (etag, encoding)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] == digest:
+            with self._lock:
+                self.cache_hits += 1
+            return entry[1]
+        body = self.compress(data, encoding)
+        self.cache.set(key, (digest, body), len(body), self.cache_timeout)
+        with self._lock:
+            self.compressed += 1
+        return body
+
+    def _compressor(self, encoding):
+        """(청크 압축, 마무리) 함수 쌍"""
+        if encoding == 'br':
+            compressor = self.brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.finish
+        # wbits 31 = gzip 헤더/트레일러
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+
+    def _stream(self, response, encoding):
+        source = response.response
+        chunks = response.iter_encoded()
+        process, finish = self._compressor(encoding)
+
+        def generate():
+            try:
+                for chunk in chunks:
+                    data = process(chunk)
+                    if data:
+                        yield data
+                yield finish()
+            finally:
+                # stream_with_context 등 원래 이터러블의 정리 동작 유지
+                close = getattr(source, 'close', None)
+                if close is not None:
+                    close()
+
+        response.response = generate()
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        with self._lock:
+            self.streamed += 1
+
+    def stats(self):
+        data = {'enabled': self.enabled, 'brotli': self.brotli is not None, 'compressed': self.compressed,
+                'streamed': self.streamed, 'cache_hits': self.cache_hits}
+        if self.cache is not None:
+            data.update({f'cache_{k}': v for k, v in self.cache.stats().items()})
+        return data
+
+
+compressor = ResponseCompressor()
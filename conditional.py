@@ -0,0 +1,116 @@
+"""조건부 GET (ETag / Last-Modified / 304)
+
+뷰를 렌더링하기 전에 페이지가 의존하는 데이터로 검증자(validator)를
+가볍게 계산하고, 클라이언트의 If-None-Match / If-Modified-Since 와
+일치하면 렌더링 없이 304를 반환한다.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import request, session, make_response
+
+
+def template_version(template_folder):
+    """템플릿 디렉터리 전체 내용의 해시와 최종 수정 시각"""
+    digest = hashlib.sha1()
+    latest = 0.0
+    for root, dirs, files in os.walk(template_folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, template_folder).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+            latest = max(latest, os.path.getmtime(path))
+    return digest.hexdigest()[:16], datetime.utcfromtimestamp(int(latest))
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:20]
+
+
+# 압축 응답은 인코딩별로 다른 표현이므로 ETag 에 인코딩 접미사를 붙인다 (compression.py)
+def encoded_etag(etag, encoding):
+    return f'{etag}-{encoding}'
+
+
+def response_encoding():
+    """이 요청이 받을 압축 인코딩 (압축을 끄거나 협상되지 않으면 None)"""
+    from compression import compressor
+    return compressor.negotiate() if compressor.enabled else None
+
+
+def matching_etag(if_none_match, etag, encoding=None):
+    """이 요청이 받을 표현(encoding 압축본, None 이면 원본)의 ETag 가 If-None-Match 에 있으면 그 값
+
+    다른 인코딩의 ETag 는 이 요청에 보낼 본문과 다른 바이트이므로 일치로 보지 않는다.
+    COMPRESS_MIN_SIZE 보다 작아 압축하지 않고 보낸 본문은 원본 ETag 로 나가므로
+    이 경우에는 304 대신 다시 렌더링한다.
+    """
+    candidate = etag if encoding is None else encoded_etag(etag, encoding)
+    return candidate if if_none_match.contains(candidate) else None
+
+
+def _as_utc(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def conditional(validator, on_not_modified=None):
+    """검증자 기반 조건부 응답 데코레이터
+
+    validator(*args, **kwargs)는 (etag, last_modified) 또는 None(검증 생략)을
+    반환한다. on_not_modified는 304 응답 시에도 필요한 부수효과를 위해
+    뷰 인자와 함께 호출된다.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            # 표시할 flash 메시지가 있으면 항상 새로 렌더링
+            if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return view_func(*args, **kwargs)
+
+            result = validator(*args, **kwargs)
+            if result is None:
+                return view_func(*args, **kwargs)
+            etag, last_modified = result
+            # 같은 데이터라도 URL(쿼리 포함)마다 표현이 다르므로 ETag에 반영
+            etag = make_etag(request.full_path, etag)
+            last_modified = _as_utc(last_modified)
+
+            encoding = response_encoding()
+            if request.if_none_match:
+                matched = matching_etag(request.if_none_match, etag, encoding)
+                not_modified = matched is not None
+            else:
+                matched = etag if encoding is None else encoded_etag(etag, encoding)
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since)
+
+            if not_modified:
+                if on_not_modified is not None:
+                    on_not_modified(*args, **kwargs)
+                response = make_response('', 304)
+                # 이 요청이 받을 표현(압축 인코딩)의 ETag 를 돌려줌
+                response.vary.add('Accept-Encoding')
+                etag = matched
+            else:
+                response = make_response(view_func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # 초 단위 Last-Modified 는 같은 초 안의 다음 변경을 구분하지 못하므로
+            # 현재 초에 바뀐 데이터는 ETag 로만 검증하게 한다
+            if last_modified is not None and last_modified < _as_utc(datetime.now(timezone.utc)):
+                response.last_modified = last_modified
+            # 브라우저가 매번 재검증하도록 (본문은 304로 생략됨)
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
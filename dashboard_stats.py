@@ -0,0 +1,171 @@
+"""관리자 대시보드 집계
+
+COUNT(*) 전체 스캔 대신 트리거로 유지되는 집계 테이블을 읽는다.
+
+- stats_counter: 공지사항/문의 전체·게시·미처리 건수
+- inquiry_daily: 일별 접수 문의 수 (주별 통계는 이 표에서 합산)
+- notice_view_daily: 공지사항별 일별 조회수
+
+notice / inquiry 의 INSERT·DELETE·UPDATE 트리거가 같은 트랜잭션 안에서
+집계를 갱신하므로 쓰기 경로는 바꿀 필요가 없다. 조회수는 view_counter 의
+일괄 UPDATE 가 view_count 를 늘릴 때 트리거가 그날의 버킷에 더한다.
+트리거 밖에서 데이터가 바뀌면 `flask stats-rebuild` 로 다시 계산한다.
+날짜 버킷은 created_at 과 같은 UTC 기준이다.
+"""
+from datetime import datetime, timedelta
+
+from db_profile import run_exclusive
+
+COUNTERS = ('notices_total', 'notices_published', 'inquiries_total', 'inquiries_unprocessed')
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS stats_counter (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS inquiry_daily (
+        day TEXT PRIMARY KEY,
+        count INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS notice_view_daily (
+        day TEXT NOT NULL,
+        notice_id INTEGER NOT NULL,
+        views INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, notice_id)
+    )""",
+]
+
+BUMP = "UPDATE stats_counter SET value = value + ({delta}) WHERE name = '{name}';"
+BUMP_DAY = """INSERT INTO inquiry_daily (day, count) VALUES (date({src}.created_at), {delta})
+        ON CONFLICT (day) DO UPDATE SET count = count + excluded.count;"""
+
+TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS stats_notice_ai AFTER INSERT ON notice BEGIN
+        {BUMP.format(name='notices_total', delta='1')}
+        {BUMP.format(name='notices_published', delta='new.is_published IS 1')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_notice_ad AFTER DELETE ON notice BEGIN
+        {BUMP.format(name='notices_total', delta='-1')}
+        {BUMP.format(name='notices_published', delta='-(old.is_published IS 1)')}
+        DELETE FROM notice_view_daily WHERE notice_id = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_notice_au AFTER UPDATE OF is_published ON notice BEGIN
+        {BUMP.format(name='notices_published', delta='(new.is_published IS 1) - (old.is_published IS 1)')}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stats_notice_views AFTER UPDATE OF view_count ON notice
+        WHEN coalesce(new.view_count, 0) > coalesce(old.view_count, 0) BEGIN
+        INSERT INTO notice_view_daily (day, notice_id, views)
+            VALUES (date('now'), new.id, coalesce(new.view_count, 0) - coalesce(old.view_count, 0))
+            ON CONFLICT (day, notice_id) DO UPDATE SET views = views + excluded.views;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_inquiry_ai AFTER INSERT ON inquiry BEGIN
+        {BUMP.format(name='inquiries_total', delta='1')}
+        {BUMP.format(name='inquiries_unprocessed', delta='new.is_processed IS 0')}
+        {BUMP_DAY.format(src='new', delta='1')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_inquiry_ad AFTER DELETE ON inquiry BEGIN
+        {BUMP.format(name='inquiries_total', delta='-1')}
+        {BUMP.format(name='inquiries_unprocessed', delta='-(old.is_processed IS 0)')}
+        {BUMP_DAY.format(src='old', delta='-1')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_inquiry_au AFTER UPDATE OF is_processed ON inquiry BEGIN
+        {BUMP.format(name='inquiries_unprocessed', delta='(new.is_processed IS 0) - (old.is_processed IS 0)')}
+    END""",
+]
+
+# 조회수 일별 기록은 원본에 이력이 없으므로 재계산하지 않는다
+REBUILD = [
+    'DELETE FROM stats_counter',
+    """INSERT INTO stats_counter (name, value)
+        SELECT 'notices_total', COUNT(*) FROM notice
+        UNION ALL SELECT 'notices_published', COUNT(*) FROM notice WHERE is_published IS 1
+        UNION ALL SELECT 'inquiries_total', COUNT(*) FROM inquiry
+        UNION ALL SELECT 'inquiries_unprocessed', COUNT(*) FROM inquiry WHERE is_processed IS 0""",
+    'DELETE FROM inquiry_daily',
+    """INSERT INTO inquiry_daily (day, count)
+        SELECT date(created_at), COUNT(*) FROM inquiry
+        WHERE created_at IS NOT NULL GROUP BY date(created_at)""",
+    'DELETE FROM notice_view_daily WHERE notice_id NOT IN (SELECT id FROM notice)',
+]
+
+
+class DashboardStats:
+    """집계 테이블 스키마 관리 + 대시보드 조회"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+
+    def init_app(self, app, db):
+        # 스키마/트리거 생성은 `flask init-db` 에서
+        self.app = app
+        self.db = db
+
+    def ensure_schema(self):
+        """집계 테이블/트리거 생성 (처음 만들 때는 원본에서 계산)"""
+        def create(conn):
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats_counter'").fetchone()
+            for stmt in SCHEMA + TRIGGERS:
+                conn.execute(stmt)
+            if not exists:
+                for stmt in REBUILD:
+                    conn.execute(stmt)
+        run_exclusive(self.db.engine, create)
+
+    def rebuild(self):
+        """건수/일별 문의 집계 재계산 (트리거 밖에서 데이터가 바뀐 경우)"""
+        def recount(conn):
+            for stmt in REBUILD:
+                conn.execute(stmt)
+        self.ensure_schema()
+        run_exclusive(self.db.engine, recount)
+
+    def counters(self):
+        """stats_counter 한 번 조회 -> {이름: 값}"""
+        rows = self.db.session.execute(self.db.text('SELECT name, value FROM stats_counter')).fetchall()
+        values = dict.fromkeys(COUNTERS, 0)
+        values.update({row.name: row.value for row in rows})
+        return values
+
+    def inquiries_per_day(self, days=14, today=None):
+        """최근 days 일의 [(날짜, 건수)] (문의가 없는 날은 0)"""
+        today = today or datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        rows = self.db.session.execute(
+            self.db.text('SELECT day, count FROM inquiry_daily WHERE day >= :since'),
+            {'since': since.isoformat()}
+        ).fetchall()
+        counts = {row.day: row.count for row in rows}
+        return [(day, counts.get(day.isoformat(), 0))
+                for day in (since + timedelta(days=i) for i in range(days))]
+
+    def inquiries_per_week(self, weeks=8, today=None):
+        """최근 weeks 주(월요일 시작)의 [(주 시작일, 건수)]"""
+        today = today or datetime.utcnow().date()
+        this_week = today - timedelta(days=today.weekday())
+        since = this_week - timedelta(weeks=weeks - 1)
+        rows = self.db.session.execute(
+            self.db.text('SELECT day, count FROM inquiry_daily WHERE day >= :since'),
+            {'since': since.isoformat()}
+        ).fetchall()
+        counts = {}
+        for row in rows:
+            day = datetime.strptime(row.day, '%Y-%m-%d').date()
+            week = day - timedelta(days=day.weekday())
+            counts[week] = counts.get(week, 0) + row.count
+        return [(week, counts.get(week, 0))
+                for week in (since + timedelta(weeks=i) for i in range(weeks))]
+
+    def top_notice_views(self, days=7, limit=10, today=None):
+        """최근 days 일 조회수 상위 공지사항 [{id, title, views}]"""
+        today = today or datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+        rows = self.db.session.execute(self.db.text(
+            'SELECT v.notice_id AS id, n.title AS title, SUM(v.views) AS views '
+            'FROM notice_view_daily v JOIN notice n ON n.id = v.notice_id '
+            'WHERE v.day >= :since GROUP BY v.notice_id ORDER BY views DESC LIMIT :limit'
+        ), {'since': since.isoformat(), 'limit': limit}).fetchall()
+        return [{'id': row.id, 'title': row.title, 'views': row.views} for row in rows]
+
+
+dashboard_stats = DashboardStats()
@@ -0,0 +1,137 @@
+"""SQLite 엔진 프로필
+
+연결 시 PRAGMA(WAL, synchronous, busy_timeout, mmap, cache, temp_store)를
+적용하고, 풀 설정을 제공한다. 프로필은 SQLITE_PROFILE 환경변수로 선택한다.
+
+- production: WAL + 동시 읽기/쓰기에 맞춘 설정 (기본값)
+- default: SQLite 기본값 (rollback journal, 비교용)
+- snapshot: 읽기 전용 스냅샷 (query_only, 서버리스 배포용)
+
+busy_timeout 을 넘겨도 잠금이 풀리지 않는 경우(WAL 에서 읽기 트랜잭션이
+쓰기로 승격할 때 등)를 위해 commit_with_retry() 로 백오프 재시도한다.
+"""
+import os
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+PROFILES = {
+    'default': {
+        'pragmas': {},
+        'pool_size': 5,
+        'max_overflow': 10,
+    },
+    'production': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64000,  # KiB 단위 (약 64MB)
+            'temp_store': 'MEMORY',
+        },
+        'pool_size': 8,
+        'max_overflow': 16,
+    },
+    # 읽기 전용 스냅샷 (서버리스 배포)
+    'snapshot': {
+        'pragmas': {
+            'query_only': 1,
+            'mmap_size': 64 * 1024 * 1024,
+            'cache_size': -16000,
+            'temp_store': 'MEMORY',
+        },
+        'pool_size': 2,
+        'max_overflow': 4,
+    },
+}
+
+
+def get_profile(name=None):
+    name = name or os.getenv('SQLITE_PROFILE', 'production')
+    if name not in PROFILES:
+        raise ValueError(f'unknown SQLITE_PROFILE: {name} (choose from {", ".join(PROFILES)})')
+    return name, PROFILES[name]
+
+
+def engine_options(name=None):
+    """SQLALCHEMY_ENGINE_OPTIONS 용 풀/연결 설정"""
+    _, profile = get_profile(name)
+    busy_ms = profile['pragmas'].get('busy_timeout', 5000)
+    return {
+        'pool_size': int(os.getenv('SQLITE_POOL_SIZE', profile['pool_size'])),
+        'max_overflow': int(os.getenv('SQLITE_MAX_OVERFLOW', profile['max_overflow'])),
+        'pool_timeout': 30,
+        'connect_args': {'timeout': busy_ms / 1000, 'check_same_thread': False},
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for key, value in pragmas.items():
+            cursor.execute(f'PRAGMA {key}={value}')
+    finally:
+        cursor.close()
+
+
+def install(engine, name=None):
+    """엔진의 모든 새 연결에 프로필 PRAGMA 적용"""
+    _, profile = get_profile(name)
+    pragmas = profile['pragmas']
+    if pragmas and engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', lambda conn, _: apply_pragmas(conn, pragmas))
+
+
+def init_app(app, db):
+    with app.app_context():
+        install(db.engine, app.config.get('SQLITE_PROFILE'))
+
+
+def is_locked_error(exc):
+    message = str(getattr(exc, 'orig', exc)).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def commit_with_retry(session, apply=None, attempts=5, base_delay=0.05):
+    """'database is locked' 시 롤백 후 지수 백오프로 재시도
+
+    롤백하면 세션의 변경분이 사라지므로, 변경은 apply() 안에서 수행해
+    재시도마다 다시 적용되도록 한다.
+    """
+    for attempt in range(attempts):
+        if apply is not None:
+            apply()
+        try:
+            session.commit()
+            return
+        except OperationalError as e:
+            session.rollback()
+            if not is_locked_error(e) or attempt == attempts - 1:
+                raise
+            time.sleep(base_delay * (2 ** attempt) * (1 + random.random()))
+
+
+def run_exclusive(engine, callback):
+    """쓰기 잠금(BEGIN IMMEDIATE) 트랜잭션에서 callback(sqlite3 연결) 실행
+
+    여러 워커가 동시에 시작하며 스키마를 만들 때 한 워커만 생성/초기화하도록 한다.
+    """
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        previous, conn.isolation_level = conn.isolation_level, None
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            result = callback(conn)
+            conn.execute('COMMIT')
+            return result
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.isolation_level = previous
+    finally:
+        raw.close()
@@ -0,0 +1,326 @@
+"""앱 팩토리
+
+app.py(gunicorn / 개발 서버)와 api/index.py(Vercel 서버리스)가 같은
+create_app() 으로 앱을 만든다. 서버리스 배포는 DATABASE_SNAPSHOT 으로
+읽기 전용 스냅샷을 지정하며, 이때 DB 쓰기가 필요한 기능(조회수 기록,
+문의 큐, 관리자 수정, 이미지 변환, 자산 사전 압축)은 끄고 문의 접수는
+INQUIRY_FORWARD_URL 로 전달한다.
+"""
+import logging
+import os
+from datetime import datetime, timezone
+
+import click
+from flask import Flask
+from sqlalchemy.pool import StaticPool
+
+import db_profile
+import jinja_cache
+import migrations
+import views
+from assets import assets
+from backup import BackupError, backup_manager
+from compression import compressor
+from dashboard_stats import dashboard_stats
+from images import image_pipeline
+from inquiry_queue import inquiry_queue
+from metrics import metrics
+from models import db, Notice, build_inquiry
+from page_cache import page_cache
+from query_profiler import query_profiler
+from rate_limit import rate_limiter
+from search import search_index
+from static_export import static_export
+from upload_storage import upload_storage
+from view_counter import view_counter
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(config=None, instance_path=None):
+    """config 로 기본 설정을 덮어쓴 앱 생성"""
+    app = Flask(__name__, instance_path=instance_path)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'blh-company-secret-key-2025')
+    app.config['ADMIN_USERNAME'] = os.getenv('ADMIN_USERNAME', 'bhl')
+    app.config['ADMIN_PASSWORD'] = os.getenv('ADMIN_PASSWORD', 'bhl1004')
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///blh_company.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # SQLite 엔진 프로필 (SQLITE_PROFILE=production|default)
+    app.config['SQLITE_PROFILE'] = os.getenv('SQLITE_PROFILE', 'production')
+    # 읽기 전용 스냅샷 경로 (서버리스 배포)
+    app.config['DATABASE_SNAPSHOT'] = os.getenv('DATABASE_SNAPSHOT')
+    app.config['INQUIRY_FORWARD_URL'] = os.getenv('INQUIRY_FORWARD_URL')
+
+    # 이미지 업로드 설정
+    app.config['UPLOAD_FOLDER'] = 'static/uploads'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB 제한
+
+    # 페이지네이션 설정
+    app.config['NOTICES_PER_PAGE'] = 12
+    app.config['ADMIN_NOTICES_PER_PAGE'] = 50
+    app.config['ADMIN_INQUIRIES_PER_PAGE'] = 50
+    app.config['INQUIRIES_PER_PAGE'] = 10
+    app.config['SEARCH_PER_PAGE'] = 10
+
+    app.config.update(config or {})
+    read_only = configure_database(app)
+
+    db.init_app(app)
+    db_profile.init_app(app, db)
+    # 검색 색인 트리거가 쓰는 SQL 함수를 첫 연결 전에 등록
+    search_index.init_app(app, db)
+    dashboard_stats.init_app(app, db)
+    view_counter.init_app(app, db)
+    page_cache.init_app(app)
+    # GC 가 지운 업로드의 파생본, 옮긴 기존 업로드의 파생본/캐시/사전 렌더링 갱신
+    upload_storage.init_app(app, db, on_delete=image_pipeline.discard, on_change=uploads_changed)
+    static_export.init_app(app, db)
+    backup_manager.init_app(app, db)
+    # S3 백엔드의 업로드는 파생본 없이 저장소 URL 로 출력
+    image_pipeline.init_app(app, process=not read_only and upload_storage.local, source_url=upload_storage.url)
+    assets.init_app(app)
+    jinja_cache.init_app(app)
+    inquiry_queue.init_app(app, db, build=build_inquiry, on_commit=page_cache.invalidate)
+    # after_request 훅은 등록 역순으로 실행되므로 압축을 먼저 등록해 마지막에 실행
+    compressor.init_app(app)
+    # 요청 계측은 다른 before_request 훅보다 먼저 등록
+    metrics.init_app(app, db)
+    query_profiler.init_app(app, db)
+    rate_limiter.init_app(app)
+    views.init_app(app)
+    register_commands(app)
+
+    if read_only and not app.config['DATABASE_SNAPSHOT']:
+        # 스냅샷이 없으면 빈 메모리 DB 로 페이지만 렌더링
+        with app.app_context():
+            db.create_all()
+            search_index.ensure_schema()
+            dashboard_stats.ensure_schema()
+    return app
+
+
+def configure_database(app):
+    """스냅샷 지정 시 읽기 전용 엔진 설정, 읽기 전용 여부 반환"""
+    app.config.setdefault('DATABASE_READ_ONLY', bool(app.config['DATABASE_SNAPSHOT']))
+    read_only = app.config['DATABASE_READ_ONLY']
+    path = app.config['DATABASE_SNAPSHOT']
+
+    if path and not os.path.exists(path):
+        logger.warning('database snapshot %s not found, serving empty in-memory database', path)
+        app.config['DATABASE_SNAPSHOT'] = path = None
+
+    if path:
+        import snapshot
+        app.config['SQLITE_PROFILE'] = 'snapshot'
+        app.config['SQLALCHEMY_DATABASE_URI'] = snapshot.uri(path)
+    elif read_only:
+        app.config['SQLITE_PROFILE'] = 'default'
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': StaticPool,
+            'connect_args': {'check_same_thread': False},
+        }
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', db_profile.engine_options(app.config['SQLITE_PROFILE']))
+
+    if read_only:
+        app.config['VIEW_COUNT_ENABLED'] = False
+        app.config['INQUIRY_QUEUE_ENABLED'] = False
+    return read_only
+
+
+def init_db(app, seed=True):
+    """스키마 마이그레이션, 검색 색인·집계 트리거, 샘플 데이터 (앱 컨텍스트 안에서)"""
+    # 버전 관리 마이그레이션 (테이블, 컬럼 추가, 인덱스, 업로드 참조 트리거)
+    migrations.migrate(db.engine, log=logger.info)
+    search_index.ensure_schema()
+    dashboard_stats.ensure_schema()
+
+    # 샘플 공지사항 생성
+    if seed and Notice.query.count() == 0:
+        sample_notices = [
+            Notice(
+                title="BLH COMPANY 홈페이지 오픈",
+                content="BLH COMPANY 공식 홈페이지가 오픈되었습니다. 다양한 서비스와 정보를 확인해보세요.",
+                priority=1,
+                is_published=True
+            ),
+            Notice(
+                title="EV 진단 솔루션 출시 예정",
+                content="전기차 배터리 상태를 실시간으로 측정하는 EV 진단 솔루션이 곧 출시됩니다.",
+                priority=0,
+                is_published=True
+            ),
+            Notice(
+                title="온라인 경매 플랫폼 베타 테스트",
+                content="C2B 온라인 중고차 경매 플랫폼의 베타 테스트를 진행합니다.",
+                priority=0,
+                is_published=True
+            )
+        ]
+    
+        for notice in sample_notices:
+            db.session.add(notice)
+    
+        db.session.commit()
+
+
+def uploads_changed(keys, notice_ids):
+    """기존 업로드를 옮긴 뒤: 파생본 생성, 페이지 캐시 무효화, 사전 렌더링 재생성
+
+    CLI(uploads-import)에서 호출되므로 파생본과 재생성이 끝날 때까지 기다린다.
+    """
+    if upload_storage.local:
+        for future in [image_pipeline.submit(key) for key in keys]:
+            if future is not None:
+                future.result()
+    page_cache.invalidate()
+    if static_export.active:
+        static_export.regenerate(sorted(set(notice_ids)))
+
+
+def prepare_static(app):
+    """업로드 폴더, 이미지 파생본, 사전 압축 자산, 템플릿 바이트코드 캐시 준비"""
+    os.makedirs(os.path.join(app.root_path, app.config['UPLOAD_FOLDER']), exist_ok=True)
+    futures = image_pipeline.process_directory('images')
+    for future in futures:
+        future.result()
+    compressed = assets.precompress()
+    templates = jinja_cache.precompile(app)
+    return {'images': len(futures), 'compressed': compressed, 'templates': templates}
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    @click.option('--no-seed', is_flag=True, help='샘플 공지사항을 만들지 않음')
+    def init_db_command(no_seed):
+        """DB 스키마/마이그레이션 및 정적 자산 준비 (배포 시 한 번 실행)"""
+        init_db(app, seed=not no_seed)
+        prepared = prepare_static(app)
+        # 이전 배포 워커들의 계측 파일 정리
+        metrics.reset()
+        print('database initialized; images={images} compressed={compressed} templates={templates}'.format(**prepared))
+
+    @app.cli.command('db-migrate')
+    @click.option('--dry-run', is_flag=True, help='적용할 마이그레이션과 SQL 만 출력')
+    def db_migrate_command(dry_run):
+        """대기 중인 스키마 마이그레이션 적용"""
+        if dry_run:
+            for version, name, statements, _ in migrations.migrate(db.engine, dry_run=True):
+                print(f'-- {version:04d} {name}')
+                for stmt in statements:
+                    print(f'{stmt};')
+            return
+        applied = migrations.migrate(db.engine, log=print)
+        print(f'schema at version {migrations.LATEST} ({len(applied)} migrations applied)')
+
+    @app.cli.command('precompile-templates')
+    @click.option('--output', default=None, help='캐시 디렉터리 (기본: JINJA_CACHE_DIR)')
+    def precompile_templates_command(output):
+        """템플릿 바이트코드 캐시 생성"""
+        count = jinja_cache.precompile(app, output)
+        print(f'{count} templates compiled to {output or app.config["JINJA_CACHE_DIR"]}')
+
+    @app.cli.command('search-rebuild')
+    def search_rebuild_command():
+        """검색 색인 전체 재생성"""
+        search_index.rebuild()
+        print('search index rebuilt')
+
+    @app.cli.command('stats-rebuild')
+    def stats_rebuild_command():
+        """대시보드 집계 재계산"""
+        dashboard_stats.rebuild()
+        print('dashboard stats rebuilt')
+
+    @app.cli.command('static-export')
+    def static_export_command():
+        """공개 페이지를 정적 HTML 로 내보내기 (nginx try_files 용, 배포 시 init-db 다음)"""
+        count = static_export.build()
+        print(f'{count} pages exported to {static_export.directory}')
+
+    @app.cli.command('uploads-gc')
+    @click.option('--grace', type=int, default=None, help='참조가 끊긴 뒤 보존할 초 (기본: UPLOAD_GC_GRACE)')
+    def uploads_gc_command(grace):
+        """참조가 없는 업로드 파일 삭제"""
+        deleted = upload_storage.collect_garbage(grace)
+        print(f'{deleted} unreferenced uploads removed')
+
+    @app.cli.command('uploads-import')
+    @click.option('--delete-originals', is_flag=True, help='옮긴 뒤 기존 파일 삭제')
+    def uploads_import_command(delete_originals):
+        """기존 업로드(uploads/<시각>_<이름>)를 내용 주소 저장소로 옮김"""
+        keys, missing = upload_storage.import_legacy(delete_originals=delete_originals)
+        for path in missing:
+            print(f'missing: {path}')
+        print(f'{len(keys)} uploads imported')
+
+    @app.cli.command('backup-create')
+    def backup_create_command():
+        """새 백업 세대 시작 (온라인 기본 스냅샷 + integrity_check)"""
+        generation = backup_manager.create()
+        print(f'backup generation {generation} created in {backup_manager.directory}')
+
+    @app.cli.command('backup-run')
+    def backup_run_command():
+        """백업 스케줄러를 이 프로세스에서 실행 (WAL 전송, 세대 교체, 보존 정리)"""
+        print(f'backing up {backup_manager.db_path} to {backup_manager.directory} '
+              f'(WAL every {backup_manager.wal_interval:g}s)')
+        backup_manager.run()
+
+    @app.cli.command('backup-list')
+    def backup_list_command():
+        """백업 세대와 복구 가능 시간 범위"""
+        for info in backup_manager.describe():
+            span = ' ~ '.join(_format_time(info[k]) for k in ('first', 'last'))
+            print(f'{info["generation"]}  base {info["base_bytes"] / 1024:.1f} KiB  '
+                  f'wal {info["wal_bytes"] / 1024:.1f} KiB ({info["epochs"]} epochs)  '
+                  f'{info["points"]} points  {span}')
+
+    @app.cli.command('backup-verify')
+    def backup_verify_command():
+        """세대마다 최신 시점을 복구해 integrity_check"""
+        failed = 0
+        for generation, error in backup_manager.verify():
+            print(f'{generation}  {error or "ok"}')
+            failed += error is not None
+        if failed:
+            raise click.ClickException(f'{failed} generation(s) failed verification')
+
+    @app.cli.command('backup-restore')
+    @click.argument('output')
+    @click.option('--at', 'at', default=None,
+                  help='복구할 시각 (ISO 8601, 시간대 없으면 UTC, 기본: 최신 시점)')
+    def backup_restore_command(output, at):
+        """백업에서 DB 복구 (운영 DB 를 바꾸지 않고 OUTPUT 파일로 만든다)"""
+        if os.path.exists(output):
+            raise click.ClickException(f'{output} already exists')
+        timestamp = None
+        if at:
+            moment = datetime.fromisoformat(at)
+            timestamp = (moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)).timestamp()
+        try:
+            generation, point = backup_manager.restore(output, at=timestamp)
+        except BackupError as e:
+            raise click.ClickException(str(e))
+        print(f'restored {output} from {generation} as of {_format_time(point["t"])}')
+
+    @app.cli.command('backup-prune')
+    def backup_prune_command():
+        """보존 기간(BACKUP_RETENTION_DAYS)이 지난 백업 세대 삭제"""
+        removed = backup_manager.prune()
+        print(f'{len(removed)} backup generation(s) removed')
+
+    @app.cli.command('snapshot-build')
+    @click.option('--output', default=os.path.join('api', 'snapshot.db'), show_default=True,
+                  help='스냅샷 파일 경로')
+    def snapshot_build_command(output):
+        """서버리스 배포용 읽기 전용 스냅샷 생성"""
+        import snapshot
+        size = snapshot.build(db.engine.url.database, output)
+        print(f'snapshot written to {output} ({size / 1024:.1f} KiB)')
+
+
+def _format_time(timestamp):
+    if timestamp is None:
+        return '-'
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
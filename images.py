@@ -0,0 +1,299 @@
+"""이미지 파생본(derivative) 생성 파이프라인
+
+업로드 이미지와 static/images 의 원본으로부터 여러 너비의 AVIF/WebP 및
+JPEG(투명 이미지는 PNG) 파생본을 만들어 static/derived 에 콘텐츠 해시
+파일명으로 저장하고, 메타데이터는 static/derived/manifest.json 에 기록한다.
+변환은 요청 스레드가 아닌 스레드 풀에서 실행된다.
+
+템플릿에서는 responsive_image() / image_variant_url() 헬퍼로
+srcset 을 출력한다. Pillow 가 없으면 원본 이미지를 그대로 사용한다.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import url_for
+from markupsafe import Markup, escape
+
+# Pillow 는 변환을 켤 때만 import (서버리스/템플릿 헬퍼만 쓰는 경우 시작 시간 단축)
+Image = ImageOps = features = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _import_pillow():
+    """Pillow 지연 import (미설치 시 파생본 없이 원본 사용)"""
+    global Image, ImageOps, features
+    if Image is None:
+        try:
+            from PIL import Image, ImageOps, features
+        except ImportError:
+            return False
+    return True
+
+SOURCE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+SAVE_OPTIONS = {
+    'avif': {'quality': 60},
+    'webp': {'quality': 80, 'method': 4},
+    'jpeg': {'quality': 82, 'optimize': True, 'progressive': True},
+    'png': {'optimize': True},
+}
+
+
+class ImagePipeline:
+    """파생본 생성 및 manifest 조회"""
+
+    def __init__(self):
+        self.static_folder = None
+        self.output_dir = None
+        self.manifest_path = None
+        self.widths = (320, 640, 1024, 1600)
+        self.modern_formats = ()
+        self.process_enabled = False
+        self.workers = 2
+        self._executor = None
+        self._lock = threading.Lock()
+        self._manifest = {}
+        self._manifest_mtime = None
+        self._source_url = None
+
+    @property
+    def enabled(self):
+        """변환 가능 여부 (처음 확인할 때 Pillow import 및 스레드 풀 생성)"""
+        if self._executor is None and self.process_enabled:
+            with self._lock:
+                if self._executor is None and self.process_enabled:
+                    if not _import_pillow():
+                        self.process_enabled = False
+                        return False
+                    os.makedirs(self.output_dir, exist_ok=True)
+                    self.modern_formats = tuple(f for f in ('avif', 'webp') if features.check(f))
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='image-pipeline')
+        return self._executor is not None
+
+    def init_app(self, app, process=True, source_url=None):
+        """process=False 이면 변환 없이 manifest 조회(템플릿 헬퍼)만 제공
+
+        static/images 원본 변환은 시작 시 하지 않고 `flask init-db` 에서 한다.
+        source_url 은 원본 이미지 URL 함수 (업로드가 static 밖에 있는 경우, 기본 static).
+        """
+        app.config.setdefault('IMAGE_DERIVED_DIR', 'derived')
+        app.config.setdefault('IMAGE_WIDTHS', (320, 640, 1024, 1600))
+        app.config.setdefault('IMAGE_WORKERS', 2)
+
+        self.static_folder = app.static_folder
+        self.output_dir = os.path.join(app.static_folder, app.config['IMAGE_DERIVED_DIR'])
+        self.manifest_path = os.path.join(self.output_dir, 'manifest.json')
+        self.widths = tuple(sorted(app.config['IMAGE_WIDTHS']))
+        self._source_url = source_url
+
+        app.jinja_env.globals['responsive_image'] = self.responsive_image
+        app.jinja_env.globals['image_variant_url'] = self.variant_url
+
+        # Pillow 와 스레드 풀은 첫 변환 요청 때 준비
+        self.process_enabled = process
+        self.workers = app.config['IMAGE_WORKERS']
+
+    # 변환 작업 -----------------------------------------------------------
+
+    def submit(self, rel_path):
+        """static 기준 상대 경로의 이미지를 백그라운드에서 변환"""
+        if not self.enabled:
+            return None
+        return self._executor.submit(self._process_safely, rel_path)
+
+    def process_directory(self, rel_dir):
+        """디렉터리의 원본 이미지를 모두 변환 요청하고 Future 목록을 반환"""
+        root = os.path.join(self.static_folder, rel_dir)
+        if not self.enabled or not os.path.isdir(root):
+            return []
+        return [self.submit(f'{rel_dir}/{name}') for name in sorted(os.listdir(root))
+                if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS]
+
+    def _process_safely(self, rel_path):
+        try:
+            return self.process(rel_path)
+        except Exception:
+            logger.exception('image derivative generation failed: %s', rel_path)
+            return None
+
+    def process(self, rel_path):
+        source = os.path.join(self.static_folder, rel_path)
+        with open(source, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+
+        # 여러 gunicorn 워커가 동시에 같은 이미지를 변환하지 않도록 파일 락
+        with self._file_lock():
+            entry = self._load_manifest().get(rel_path)
+            if entry and entry['hash'] == digest and self._variants_exist(entry):
+                return entry
+            entry = self._render(rel_path, source, digest)
+            self._update_manifest(rel_path, entry)
+        return entry
+
+    def _render(self, rel_path, source, digest):
+        stem = os.path.splitext(os.path.basename(rel_path))[0]
+        with Image.open(source) as im:
+            im = ImageOps.exif_transpose(im)
+            has_alpha = im.mode in ('RGBA', 'LA') or (im.mode == 'P' and 'transparency' in im.info)
+            im = im.convert('RGBA' if has_alpha else 'RGB')
+            fallback = 'png' if has_alpha else 'jpeg'
+            width, height = im.size
+
+            variants = []
+            for w in sorted({min(w, width) for w in self.widths}):
+                resized = im if w == width else im.resize((w, max(1, round(height * w / width))), Image.LANCZOS)
+                for fmt in self.modern_formats + (fallback,):
+                    name = f'{stem}-{digest}-{w}.{EXTENSIONS[fmt]}'
+                    path = os.path.join(self.output_dir, name)
+                    if not os.path.exists(path):
+                        tmp = path + '.tmp'
+                        resized.save(tmp, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+                        os.replace(tmp, path)
+                    variants.append({'width': w, 'format': fmt, 'file': name,
+                                     'bytes': os.path.getsize(path)})
+
+        return {'hash': digest, 'width': width, 'height': height,
+                'fallback': fallback, 'variants': variants}
+
+    def discard(self, rel_paths):
+        """삭제된 원본들의 파생본 파일과 manifest 항목 제거, 제거한 항목 수 반환"""
+        if not os.path.exists(self.manifest_path):
+            return 0
+        with self._file_lock():
+            manifest = dict(self._load_manifest())
+            removed = [manifest.pop(rel_path) for rel_path in set(rel_paths) if rel_path in manifest]
+            if not removed:
+                return 0
+            # 같은 파일을 가리키는 다른 항목이 있으면 남김
+            in_use = {v['file'] for entry in manifest.values() for v in entry['variants']}
+            for entry in removed:
+                for v in entry['variants']:
+                    if v['file'] not in in_use:
+                        try:
+                            os.remove(os.path.join(self.output_dir, v['file']))
+                        except FileNotFoundError:
+                            pass
+            self._write_manifest(manifest)
+        return len(removed)
+
+    def _variants_exist(self, entry):
+        return all(os.path.exists(os.path.join(self.output_dir, v['file'])) for v in entry['variants'])
+
+    # manifest -----------------------------------------------------------
+
+    def _file_lock(self):
+        return _FileLock(os.path.join(self.output_dir, '.lock'))
+
+    def _load_manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except (OSError, TypeError):
+            return {}
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                try:
+                    with open(self.manifest_path, encoding='utf-8') as f:
+                        self._manifest = json.load(f)
+                except (OSError, ValueError):
+                    self._manifest = {}
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def _update_manifest(self, rel_path, entry):
+        manifest = dict(self._load_manifest())
+        manifest[rel_path] = entry
+        self._write_manifest(manifest)
+
+    def _write_manifest(self, manifest):
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    def entry(self, rel_path):
+        if not rel_path:
+            return None
+        return self._load_manifest().get(rel_path)
+
+    # 템플릿 헬퍼 ---------------------------------------------------------
+
+    def srcset(self, entry, fmt):
+        derived = os.path.basename(self.output_dir)
+        return ', '.join(
+            f"{url_for('static', filename=derived + '/' + v['file'])} {v['width']}w"
+            for v in entry['variants'] if v['format'] == fmt
+        )
+
+    def source_url(self, rel_path):
+        if self._source_url is not None:
+            return self._source_url(rel_path)
+        return url_for('static', filename=rel_path)
+
+    def variant_url(self, rel_path, width=1024):
+        """지정 너비 이상의 가장 작은 fallback 파생본 URL (없으면 원본)"""
+        entry = self.entry(rel_path)
+        if entry is None:
+            return self.source_url(rel_path)
+        candidates = [v for v in entry['variants'] if v['format'] == entry['fallback']]
+        chosen = next((v for v in candidates if v['width'] >= width), candidates[-1])
+        derived = os.path.basename(self.output_dir)
+        return url_for('static', filename=derived + '/' + chosen['file'])
+
+    def responsive_image(self, rel_path, alt='', sizes='100vw', class_='', **attrs):
+        """<picture> 태그 (AVIF/WebP source + fallback srcset)"""
+        extra = ''.join(f' {k.replace("_", "-")}="{escape(v)}"' for k, v in attrs.items())
+        src = self.source_url(rel_path)
+        entry = self.entry(rel_path)
+        if entry is None:
+            return Markup(f'<img src="{escape(src)}" alt="{escape(alt)}" class="{escape(class_)}"{extra}>')
+
+        sources = ''.join(
+            f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(self.srcset(entry, fmt))}" sizes="{escape(sizes)}">'
+            for fmt in ('avif', 'webp') if any(v['format'] == fmt for v in entry['variants'])
+        )
+        return Markup(
+            f'<picture style="display:contents">{sources}'
+            f'<img src="{escape(src)}" srcset="{escape(self.srcset(entry, entry["fallback"]))}" '
+            f'sizes="{escape(sizes)}" width="{entry["width"]}" height="{entry["height"]}" '
+            f'alt="{escape(alt)}" class="{escape(class_)}" loading="lazy" decoding="async"{extra}>'
+            f'</picture>'
+        )
+
+
+class _FileLock:
+    """프로세스 간 배타 락 (fcntl 미지원 환경에서는 프로세스 내 락만)"""
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            self._fd = open(self.path, 'a')
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._fd.close()
+            self._fd = None
+        self._thread_lock.release()
+
+
+image_pipeline = ImagePipeline()
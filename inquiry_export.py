@@ -0,0 +1,146 @@
+"""문의/답변 내보내기 (CSV / JSON Lines 스트리밍)
+
+문의를 yield_per 로 배치 단위로 읽고(서버 측 커서), 배치마다 답변을 IN 쿼리 한 번으로
+붙여 레코드를 만든다. 응답은 일정 크기씩 잘라 생성기로 내보내므로 전체 결과를
+메모리에 올리지 않으며 행 수와 관계없이 메모리 사용량이 일정하다.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from models import Inquiry, InquiryAnswer
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+COLUMNS = ['id', 'created_at', 'name', 'email', 'phone', 'company', 'service_interest', 'message',
+           'is_public', 'is_processed', 'answer_count', 'answers']
+
+STATUS_FILTERS = {
+    'processed': Inquiry.is_processed == True,
+    'unprocessed': Inquiry.is_processed != True,
+}
+VISIBILITY_FILTERS = {
+    'public': Inquiry.is_public == True,
+    'private': Inquiry.is_public != True,
+}
+
+# 응답 조각 크기 (작게 자르면 yield 횟수가 늘고, 크게 자르면 첫 바이트가 늦어짐)
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_filters(args):
+    """쿼리 문자열 -> 필터 dict (잘못된 값은 ValueError)"""
+    filters = {}
+    for key in ('from', 'to'):
+        value = args.get(key)
+        if value:
+            try:
+                filters[key] = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f'{key} 는 YYYY-MM-DD 형식이어야 합니다.')
+    status = args.get('status')
+    if status:
+        if status not in STATUS_FILTERS:
+            raise ValueError('status 는 processed 또는 unprocessed 입니다.')
+        filters['status'] = status
+    visibility = args.get('visibility')
+    if visibility:
+        if visibility not in VISIBILITY_FILTERS:
+            raise ValueError('visibility 는 public 또는 private 입니다.')
+        filters['visibility'] = visibility
+    return filters
+
+
+def build_query(filters):
+    """작성 시각 순 문의 조회 (created_at 범위는 ix_inquiry_created 사용)"""
+    query = select(Inquiry.id, Inquiry.created_at, Inquiry.name, Inquiry.email, Inquiry.phone,
+                   Inquiry.company, Inquiry.service_interest, Inquiry.message, Inquiry.is_public,
+                   Inquiry.is_processed)
+    if 'from' in filters:
+        query = query.where(Inquiry.created_at >= filters['from'])
+    if 'to' in filters:
+        # 종료일 포함
+        query = query.where(Inquiry.created_at < filters['to'] + timedelta(days=1))
+    if 'status' in filters:
+        query = query.where(STATUS_FILTERS[filters['status']])
+    if 'visibility' in filters:
+        query = query.where(VISIBILITY_FILTERS[filters['visibility']])
+    return query.order_by(Inquiry.created_at, Inquiry.id)
+
+
+def iter_records(session, filters, batch_size=1000):
+    """문의 레코드(dict, 답변 목록 포함)를 배치 단위로 생성"""
+    result = session.execute(build_query(filters).execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        answers = defaultdict(list)
+        answer_rows = session.execute(
+            select(InquiryAnswer.inquiry_id, InquiryAnswer.admin_name, InquiryAnswer.content,
+                   InquiryAnswer.created_at)
+            .where(InquiryAnswer.inquiry_id.in_([row.id for row in rows]))
+            .order_by(InquiryAnswer.inquiry_id, InquiryAnswer.created_at)
+        )
+        for answer in answer_rows:
+            answers[answer.inquiry_id].append({
+                'admin_name': answer.admin_name,
+                'content': answer.content,
+                'created_at': answer.created_at.isoformat() if answer.created_at else None,
+            })
+        for row in rows:
+            record = row._asdict()
+            record['created_at'] = row.created_at.isoformat() if row.created_at else None
+            record['is_public'] = bool(row.is_public)
+            record['is_processed'] = bool(row.is_processed)
+            record['answers'] = answers.get(row.id, [])
+            yield record
+
+
+def _cell(value):
+    """스프레드시트 수식으로 해석되지 않도록 (CSV injection)"""
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+
+def csv_chunks(records):
+    """CSV 조각 (엑셀에서 한글이 깨지지 않도록 BOM 으로 시작)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(COLUMNS)
+    for record in records:
+        answers = record['answers']
+        writer.writerow([_cell(record[c]) for c in COLUMNS[:-2]] + [
+            len(answers),
+            _cell('\n'.join(f"[{a['created_at']}] {a['admin_name']}: {a['content']}" for a in answers)),
+        ])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_chunks(records):
+    """JSON Lines 조각 (한 줄에 문의 하나, answers 는 배열)"""
+    lines = []
+    size = 0
+    for record in records:
+        record['answer_count'] = len(record['answers'])
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(lines)
+            lines, size = [], 0
+    yield ''.join(lines)
+
+
+def chunks(fmt, records):
+    return csv_chunks(records) if fmt == 'csv' else jsonl_chunks(records)
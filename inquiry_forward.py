@@ -0,0 +1,44 @@
+"""문의 쓰기 전달 (읽기 전용 배포용)
+
+스냅샷으로 동작하는 서버리스 배포는 DB에 쓸 수 없으므로 POST /api/inquiry 를
+INQUIRY_FORWARD_URL 로 그대로 전달한다. 전달 대상은 같은 계약
+(JSON 본문, 202/201/4xx 응답)을 따르는 엔드포인트면 무엇이든 된다
+(원본 서버의 /api/inquiry, 웹훅 수신기 등).
+"""
+import json
+import urllib.error
+import urllib.request
+from urllib.parse import urljoin
+
+
+class ForwardError(Exception):
+    """전달 대상에 연결하지 못함"""
+
+
+def forward(url, payload, timeout=5.0, headers=None):
+    """payload 를 url 로 POST 하고 (상태 코드, 응답 JSON, Retry-After) 반환"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+        headers=dict({'Content-Type': 'application/json', 'Accept': 'application/json'}, **(headers or {})),
+        method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, body = response.status, response.read()
+            retry_after = response.headers.get('Retry-After')
+    except urllib.error.HTTPError as e:
+        # 4xx/5xx 도 원본의 응답을 그대로 돌려준다
+        status, body = e.code, e.read()
+        retry_after = e.headers.get('Retry-After')
+    except (urllib.error.URLError, OSError) as e:
+        raise ForwardError(str(e)) from e
+
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        data = {'error': 'invalid response from inquiry store'}
+    # 상태 조회 URL 은 원본 서버 기준으로 바꾼다
+    if isinstance(data, dict) and data.get('status_url'):
+        data['status_url'] = urljoin(url, data['status_url'])
+    return status, data, retry_after
@@ -0,0 +1,261 @@
+"""문의 접수 큐
+
+POST /api/inquiry 는 검증 후 별도 SQLite(WAL) 큐 파일에 추가하고
+즉시 202 와 임시 id(queue_id)를 반환한다. 워커마다 실행되는 백그라운드
+소비자가 큐에서 여러 건을 선점(claim)하여 한 트랜잭션으로 inquiry 테이블에
+일괄 저장한다. 큐가 너무 깊으면 QueueFull 을 발생시켜 429 로 응답한다.
+
+소비자 스레드는 첫 요청이나 enqueue 에서 시작한다 (CLI 명령, 백업 컨테이너처럼
+요청을 받지 않는 프로세스는 큐를 소비하지 않음). 큐 파일과 앱 DB 는 트랜잭션을
+함께 쓸 수 없으므로 저장한 행에 큐 토큰(queue_token, 고유 인덱스)을 남기고,
+완료 표시 전에 워커가 죽어 다시 선점된 항목은 이미 저장된 행을 찾아 완료 처리한다.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queued_inquiry (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    token TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    inquiry_id INTEGER,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    claimed_at REAL,
+    processed_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_queued_inquiry_status ON queued_inquiry (status, id);
+"""
+
+
+class QueueFull(Exception):
+    """큐 깊이가 한도를 넘음 (back-pressure)"""
+
+
+class InquiryQueue:
+    """SQLite 기반 내구성 큐 + 일괄 저장 소비자"""
+
+    def __init__(self):
+        self.path = None
+        self.app = None
+        self.db = None
+        self.build = None
+        self.on_commit = None
+        self.enabled = True
+        self.max_depth = 1000
+        self.batch_size = 100
+        self.poll_interval = 1.0
+        self.claim_timeout = 60.0
+        self.max_attempts = 5
+        self.retention = 7 * 24 * 3600
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db, build, on_commit=None):
+        """build(payload) -> 모델 인스턴스 (queue_token 컬럼 필요), on_commit() 은 일괄 저장 후 호출"""
+        app.config.setdefault('INQUIRY_QUEUE_ENABLED', True)
+        app.config.setdefault('INQUIRY_QUEUE_PATH', os.path.join(app.instance_path, 'inquiry_queue.db'))
+        app.config.setdefault('INQUIRY_QUEUE_MAX_DEPTH', 1000)
+        app.config.setdefault('INQUIRY_QUEUE_BATCH_SIZE', 100)
+        app.config.setdefault('INQUIRY_QUEUE_POLL_INTERVAL', 1.0)
+
+        self.app = app
+        self.db = db
+        self.build = build
+        self.on_commit = on_commit
+        self.enabled = app.config['INQUIRY_QUEUE_ENABLED']
+        self.path = app.config['INQUIRY_QUEUE_PATH']
+        self.max_depth = app.config['INQUIRY_QUEUE_MAX_DEPTH']
+        self.batch_size = app.config['INQUIRY_QUEUE_BATCH_SIZE']
+        self.poll_interval = app.config['INQUIRY_QUEUE_POLL_INTERVAL']
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+            # 다른 워커가 남긴 항목도 처리하도록 요청을 받기 시작하면 소비자 실행
+            app.before_request(self._ensure_consumer)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.row_factory = sqlite3.Row
+        return _Closing(conn)
+
+    # 생산자 --------------------------------------------------------------
+
+    def enqueue(self, payload):
+        """큐에 추가하고 임시 id(token)를 반환"""
+        token = uuid.uuid4().hex
+        payload = dict(payload, created_at=time.time())
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            depth = conn.execute(
+                "SELECT COUNT(*) FROM queued_inquiry WHERE status IN ('queued', 'processing')"
+            ).fetchone()[0]
+            if depth >= self.max_depth:
+                conn.execute('ROLLBACK')
+                raise QueueFull(depth)
+            conn.execute(
+                'INSERT INTO queued_inquiry (token, payload, created_at) VALUES (?, ?, ?)',
+                (token, json.dumps(payload, ensure_ascii=False), payload['created_at'])
+            )
+            conn.execute('COMMIT')
+        self._ensure_consumer()
+        self._wakeup.set()
+        return token
+
+    def status(self, token):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT status, inquiry_id, created_at, processed_at FROM queued_inquiry WHERE token = ?',
+                (token,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'queue_id': token,
+            'status': row['status'],
+            'inquiry_id': row['inquiry_id'],
+            'queued_at': row['created_at'],
+            'processed_at': row['processed_at'],
+        }
+
+    # 소비자 --------------------------------------------------------------
+
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        # 처리 완료 후 보존 기간이 지난 항목 정리
+        conn.execute(
+            "DELETE FROM queued_inquiry WHERE status = 'done' AND processed_at < ?",
+            (now - self.retention,)
+        )
+        # 처리 중 워커가 죽어 남은 항목은 일정 시간 뒤 다시 큐로
+        conn.execute(
+            "UPDATE queued_inquiry SET status = 'queued' WHERE status = 'processing' AND claimed_at < ?",
+            (now - self.claim_timeout,)
+        )
+        rows = conn.execute(
+            "SELECT id, token, payload FROM queued_inquiry WHERE status = 'queued' ORDER BY id LIMIT ?",
+            (self.batch_size,)
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE queued_inquiry SET status = 'processing', claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now, r['id']) for r in rows]
+            )
+        conn.execute('COMMIT')
+        return rows
+
+    def drain_once(self):
+        """큐에서 한 배치를 꺼내 저장하고 저장 건수를 반환"""
+        with self._connect() as conn:
+            rows = self._claim(conn)
+            if not rows:
+                return 0
+            with self.app.app_context():
+                done, failed = None, []
+                try:
+                    done = self._insert(rows)
+                except Exception:
+                    logger.exception('inquiry batch insert failed (%d rows), retrying one by one', len(rows))
+                    self.db.session.rollback()
+                try:
+                    if done is None:
+                        # 한 건이 배치 전체를 실패시키지 않도록 한 건씩 다시 저장
+                        done, failed = self._insert_each(rows)
+                finally:
+                    self.db.session.remove()
+            if failed:
+                conn.executemany(
+                    "UPDATE queued_inquiry SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                    "error = ? WHERE id = ?",
+                    [(self.max_attempts, error, r['id']) for r, error in failed]
+                )
+            now = time.time()
+            conn.executemany(
+                "UPDATE queued_inquiry SET status = 'done', inquiry_id = ?, processed_at = ? WHERE id = ?",
+                [(inquiry_id, now, r['id']) for r, inquiry_id in done]
+            )
+        if done and self.on_commit is not None:
+            self.on_commit()
+        return len(done)
+
+    def _insert(self, rows):
+        """rows 를 한 트랜잭션으로 저장, [(행, inquiry id)]
+
+        이미 저장된 토큰(완료 표시 전에 중단된 항목)은 다시 저장하지 않고 기존 id 를 쓴다.
+        """
+        objects = []
+        for r in rows:
+            obj = self.build(json.loads(r['payload']))
+            obj.queue_token = r['token']
+            objects.append(obj)
+        model = type(objects[0])
+        saved = dict(self.db.session.query(model.queue_token, model.id)
+                     .filter(model.queue_token.in_([r['token'] for r in rows])))
+        self.db.session.add_all([obj for obj in objects if obj.queue_token not in saved])
+        self.db.session.commit()
+        return [(r, saved.get(r['token'], obj.id)) for r, obj in zip(rows, objects)]
+
+    def _insert_each(self, rows):
+        """한 건씩 저장, ([(행, inquiry id)], [(실패한 행, 오류)])"""
+        done, failed = [], []
+        for row in rows:
+            try:
+                done += self._insert([row])
+            except Exception as e:
+                logger.exception('inquiry queue item %s failed', row['id'])
+                self.db.session.rollback()
+                failed.append((row, str(e)))
+        return done, failed
+
+    def _ensure_consumer(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='inquiry-queue', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                while self.drain_once() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception('inquiry queue consumer error')
+
+
+class _Closing:
+    """with 블록 종료 시 sqlite3 연결을 닫는다"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+
+inquiry_queue = InquiryQueue()
@@ -0,0 +1,54 @@
+"""Jinja 템플릿 바이트코드 캐시
+
+템플릿을 처음 렌더링할 때의 파싱/컴파일 비용을 줄이기 위해 컴파일 결과를
+JINJA_CACHE_DIR 에 저장한다. `flask precompile-templates` (또는 init-db)로
+미리 채워 두면 새 워커나 서버리스 인스턴스의 첫 요청도 컴파일 없이 처리된다.
+
+캐시 키는 템플릿 이름만 사용하므로 빌드한 경로와 배포 경로가 달라도 재사용되며,
+원본이 바뀐 경우는 Jinja 가 소스 체크섬을 비교해 다시 컴파일한다.
+"""
+import hashlib
+import os
+
+from jinja2 import FileSystemBytecodeCache
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    def get_cache_key(self, name, filename=None):
+        return hashlib.sha1(name.encode('utf-8')).hexdigest()
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            # 읽기 전용 배포에서는 미리 만든 캐시만 사용
+            pass
+
+
+def init_app(app):
+    # 빈 문자열이면 캐시 사용 안 함
+    app.config.setdefault('JINJA_CACHE_DIR', os.getenv('JINJA_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache')))
+    directory = app.config['JINJA_CACHE_DIR']
+    if not directory:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        pass
+    app.jinja_env.bytecode_cache = TemplateBytecodeCache(directory)
+
+
+def precompile(app, directory=None):
+    """모든 템플릿을 컴파일해 캐시를 채우고 템플릿 수를 반환"""
+    bytecode_cache = app.jinja_env.bytecode_cache
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        bytecode_cache = TemplateBytecodeCache(directory)
+    if bytecode_cache is None:
+        return 0
+    # 이미 메모리에 로드된 템플릿도 다시 읽어 캐시에 기록되도록 캐시 없는 환경 사용
+    env = app.jinja_env.overlay(bytecode_cache=bytecode_cache, cache_size=0)
+    names = [name for name in env.list_templates() if name.endswith(('.html', '.xml', '.txt'))]
+    for name in names:
+        env.get_template(name)
+    return len(names)
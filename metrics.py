@@ -0,0 +1,300 @@
+"""요청 계측 (Prometheus /metrics + Server-Timing)
+
+요청마다 엔드포인트별 응답 시간, SQL 쿼리 수/시간(SQLAlchemy 엔진 이벤트),
+템플릿 렌더링 시간(template_rendered 시그널), 응답 크기를 히스토그램으로 모은다.
+다른 모듈이 inc() 로 올리는 카운터(COUNTERS, 예: 요청 빈도 제한 판정)도 함께 모은다.
+값은 워커 메모리에 쌓고 METRICS_FLUSH_INTERVAL 마다(요청 처리 후, 별도 스레드 없음)
+METRICS_DIR 의 워커별 파일(metrics-<pid>.json)로 내보낸다. /metrics 는 디렉터리의
+모든 워커 파일을 합산해 Prometheus 텍스트 형식으로 응답하므로 어느 gunicorn
+워커가 받아도 같은 값을 돌려준다 (다른 워커 값은 최대 flush 간격만큼 늦음).
+종료된 워커의 파일도 합산에 남겨 카운터가 줄어들지 않게 하며, 디렉터리는 배포 시
+`flask init-db` 가 비운다.
+
+/metrics 는 METRICS_ENDPOINT_ENABLED(기본 꺼짐)일 때만 등록한다. 앱 포트가 nginx 를
+거치지 않고 노출될 수 있으므로, METRICS_TOKEN 을 주면 `Authorization: Bearer <토큰>`
+헤더가 있는 요청만 응답한다 (Prometheus 의 bearer_token 설정).
+
+응답에는 Server-Timing 헤더(app / db / tpl)를 붙여 브라우저 개발자 도구에서
+요청별 내역을 볼 수 있다.
+"""
+import atexit
+import bisect
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Response, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+from werkzeug.local import Local
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# 이름 -> (설명, 버킷, 레이블 이름)
+HISTOGRAMS = {
+    'blh_http_request_duration_seconds': ('요청 처리 시간', LATENCY_BUCKETS, ('endpoint', 'method', 'status')),
+    'blh_http_request_sql_queries': ('요청당 SQL 쿼리 수', QUERY_COUNT_BUCKETS, ('endpoint',)),
+    'blh_http_request_sql_seconds': ('요청당 SQL 실행 시간 합계', LATENCY_BUCKETS, ('endpoint',)),
+    'blh_template_render_seconds': ('템플릿 렌더링 시간', LATENCY_BUCKETS, ('template',)),
+    'blh_http_response_size_bytes': ('응답 본문 크기', SIZE_BUCKETS, ('endpoint',)),
+}
+# 이름 -> (설명, 레이블 이름)
+COUNTERS = {
+    'blh_rate_limit_requests_total': ('요청 빈도 제한 판정 수', ('policy', 'result')),
+}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """워커별 히스토그램 + 디렉터리 기반 워커 간 합산"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 요청별 상태 (contextvars 기반이라 ASGI 모드에서 한 스레드의 여러 요청도 분리됨)
+        self._local = Local()
+        # (이름, 레이블 값 튜플) -> [버킷별 개수..., +Inf 개수, 합계] 또는 카운터는 [값]
+        self._data = {}
+        self._pid = None
+        self._last_flush = 0.0
+        self.enabled = True
+        self.server_timing = True
+        self.directory = None
+        self.interval = 5.0
+        self.token = None
+
+    def init_app(self, app, db):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_DIR', os.getenv('METRICS_DIR', os.path.join(app.instance_path, 'metrics')))
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 5.0)
+        app.config.setdefault('METRICS_SERVER_TIMING', True)
+        app.config.setdefault('METRICS_ENDPOINT_ENABLED', os.getenv('METRICS_ENDPOINT_ENABLED', '0') != '0')
+        app.config.setdefault('METRICS_TOKEN', os.getenv('METRICS_TOKEN'))
+        self.enabled = app.config['METRICS_ENABLED']
+        if not self.enabled:
+            return
+        self.directory = app.config['METRICS_DIR']
+        self.interval = float(app.config['METRICS_FLUSH_INTERVAL'])
+        self.server_timing = app.config['METRICS_SERVER_TIMING']
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        with app.app_context():
+            self.watch_engine(db.engine)
+        if app.config['METRICS_ENDPOINT_ENABLED']:
+            self.token = app.config['METRICS_TOKEN']
+            app.add_url_rule('/metrics', 'metrics', self.export_view)
+        atexit.register(self.flush)
+
+    def watch_engine(self, engine):
+        """엔진의 쿼리를 요청 지표에 포함 (ASGI 모드의 aiosqlite 엔진 등)"""
+        if not self.enabled:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # 수집 ---------------------------------------------------------------
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        with self._lock:
+            series = self._series(name, labels, len(buckets) + 2)
+            series[bisect.bisect_left(buckets, value)] += 1
+            series[-1] += value
+
+    def inc(self, name, labels, value=1):
+        """카운터 증가 (COUNTERS 에 정의된 이름)"""
+        if not self.enabled or name not in COUNTERS:
+            return
+        with self._lock:
+            self._series(name, labels, 1)[0] += value
+
+    def _series(self, name, labels, size):
+        # self._lock 안에서 호출
+        if self._pid != os.getpid():
+            # fork 된 워커는 부모 프로세스에서 모은 값을 물려받지 않음
+            self._data = {}
+            self._pid = os.getpid()
+        series = self._data.get((name, labels))
+        if series is None:
+            series = self._data[(name, labels)] = [0] * size
+        return series
+
+    def _before_request(self):
+        local = self._local
+        local.start = time.perf_counter()
+        local.sql_count = 0
+        local.sql_time = 0.0
+        local.template_time = 0.0
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        local = self._local
+        # 요청 밖(백그라운드 스레드 등) 쿼리는 요청 지표에 넣지 않음
+        if getattr(local, 'start', None) is None:
+            return
+        local.sql_count += 1
+        local.sql_time += time.perf_counter() - local.query_start
+
+    def _before_render(self, app, template, context, **extra):
+        self._local.render_start = time.perf_counter()
+
+    def _after_render(self, app, template, context, **extra):
+        start = getattr(self._local, 'render_start', None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        self._local.render_start = None
+        if getattr(self._local, 'start', None) is not None:
+            self._local.template_time += elapsed
+        self.observe('blh_template_render_seconds', (template.name or '<string>',), elapsed)
+
+    def _after_request(self, response):
+        local = self._local
+        if getattr(local, 'start', None) is None:
+            return response
+        elapsed = time.perf_counter() - local.start
+        # 매칭되지 않은 경로(404)는 레이블 폭증을 막기 위해 하나로 묶음
+        endpoint = request.endpoint or 'unmatched'
+        self.observe('blh_http_request_duration_seconds',
+                     (endpoint, request.method, str(response.status_code)), elapsed)
+        self.observe('blh_http_request_sql_queries', (endpoint,), local.sql_count)
+        self.observe('blh_http_request_sql_seconds', (endpoint,), local.sql_time)
+        if response.content_length is not None:
+            self.observe('blh_http_response_size_bytes', (endpoint,), response.content_length)
+
+        if self.server_timing:
+            response.headers.add('Server-Timing', ', '.join((
+                f'app;dur={elapsed * 1000:.1f}',
+                f'db;dur={local.sql_time * 1000:.1f};desc="{local.sql_count} queries"',
+                f'tpl;dur={local.template_time * 1000:.1f}',
+            )))
+        if self.directory and time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+        return response
+
+    def _teardown_request(self, exc):
+        self._local.start = None
+
+    # 워커 간 합산 ---------------------------------------------------------
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'metrics-{pid}.json')
+
+    def flush(self):
+        """현재 워커의 값을 워커별 파일로 기록"""
+        if not self.enabled or not self.directory:
+            return
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self._pid != os.getpid():
+                return
+            rows = [[name, list(labels), list(series)] for (name, labels), series in self._data.items()]
+        path = self._path(self._pid)
+        tmp = f'{path}.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception('metrics flush failed: %s', path)
+
+    def reset(self):
+        """워커 파일 삭제 (배포 시 워커를 띄우기 전에 한 번)"""
+        with self._lock:
+            self._data = {}
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith('metrics-'):
+                os.remove(os.path.join(self.directory, name))
+
+    def collect(self):
+        """모든 워커 파일(없으면 현재 워커 메모리)을 합산한 {(이름, 레이블): series}"""
+        if not self.directory:
+            with self._lock:
+                return {key: list(series) for key, series in self._data.items()}
+        self.flush()
+        merged = {}
+        for name in os.listdir(self.directory):
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric, labels, series in rows:
+                if metric not in HISTOGRAMS and metric not in COUNTERS:
+                    continue
+                key = (metric, tuple(labels))
+                total = merged.get(key)
+                if total is None or len(total) != len(series):
+                    merged[key] = list(series)
+                else:
+                    merged[key] = [a + b for a, b in zip(total, series)]
+        return merged
+
+    def render(self):
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        data = self.collect()
+        lines = []
+        for name, (description, buckets, label_names) in HISTOGRAMS.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} histogram')
+            for (metric, labels), series in sorted(data.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets + (float('inf'),), series[:-1]):
+                    cumulative += count
+                    le = _format_labels(label_names, labels, f'le="{_format_number(bound)}"')
+                    lines.append(f'{name}_bucket{le} {cumulative}')
+                label_text = _format_labels(label_names, labels)
+                lines.append(f'{name}_sum{label_text} {_format_number(series[-1])}')
+                lines.append(f'{name}_count{label_text} {cumulative}')
+        for name, (description, label_names) in COUNTERS.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            for (metric, labels), series in sorted(data.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(label_names, labels)} {_format_number(series[0])}')
+        return '\n'.join(lines) + '\n'
+
+    def export_view(self):
+        supplied = request.headers.get('Authorization', '').encode('utf-8', 'surrogateescape')
+        if self.token and not hmac.compare_digest(supplied, f'Bearer {self.token}'.encode('utf-8')):
+            return Response('unauthorized\n', 401, {'WWW-Authenticate': 'Bearer'}, mimetype='text/plain')
+        return Response(self.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+metrics = Metrics()
@@ -0,0 +1,222 @@
+"""버전 관리 스키마 마이그레이션
+
+schema_version 테이블에 적용한 마이그레이션 번호를 기록하고, MIGRATIONS 에
+순서대로 정의한 단계 중 아직 적용하지 않은 것만 실행한다. 배포 시
+`flask db-migrate` (또는 init-db)로 한 번 실행하며 워커 시작 시에는 실행하지 않는다.
+
+각 단계는 SQL 문 목록이거나, 현재 스키마를 보고 실행할 SQL 문 목록을 돌려주는
+함수다 (이전 버전 DB 에 이미 있는 컬럼은 건너뜀). 일반 단계는 SQL 과 버전 기록을
+한 트랜잭션(BEGIN IMMEDIATE)에서 실행하고, online 단계(인덱스 생성)는 문장마다
+짧은 트랜잭션으로 나눠 쓰기 잠금을 오래 잡지 않는다. WAL 에서는 그동안에도
+읽기 요청이 막히지 않는다.
+
+schema_version 이 없는 기존 DB 는 0 버전으로 보고 처음부터 실행하며, 모든
+단계가 IF NOT EXISTS / 컬럼 확인으로 작성되어 있어 다시 실행해도 안전하다.
+"""
+import time
+
+from db_profile import run_exclusive
+
+VERSION_TABLE = """CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
+def add_column(table, column, ddl):
+    """컬럼이 없을 때만 ALTER TABLE ADD COLUMN"""
+    def statements(conn):
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+        if column in columns:
+            return []
+        return [f'ALTER TABLE {table} ADD COLUMN {column} {ddl}']
+    return statements
+
+
+class Migration:
+    def __init__(self, version, name, steps, online=False):
+        self.version = version
+        self.name = name
+        self.steps = steps
+        self.online = online
+
+    def statements(self, conn):
+        if callable(self.steps):
+            return self.steps(conn)
+        return list(self.steps)
+
+
+MIGRATIONS = [
+    Migration(1, 'create base tables', [
+        """CREATE TABLE IF NOT EXISTS notice (
+            id INTEGER NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            content TEXT NOT NULL,
+            author VARCHAR(100),
+            created_at DATETIME,
+            updated_at DATETIME,
+            priority INTEGER,
+            is_published BOOLEAN,
+            view_count INTEGER,
+            PRIMARY KEY (id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS inquiry (
+            id INTEGER NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(100) NOT NULL,
+            phone VARCHAR(20),
+            company VARCHAR(100),
+            service_interest VARCHAR(100),
+            message TEXT NOT NULL,
+            created_at DATETIME,
+            is_processed BOOLEAN,
+            PRIMARY KEY (id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS inquiry_answer (
+            id INTEGER NOT NULL,
+            inquiry_id INTEGER NOT NULL,
+            admin_name VARCHAR(100),
+            content TEXT NOT NULL,
+            created_at DATETIME,
+            PRIMARY KEY (id),
+            FOREIGN KEY(inquiry_id) REFERENCES inquiry (id)
+        )""",
+    ]),
+    Migration(2, 'add inquiry.is_public', add_column('inquiry', 'is_public', 'BOOLEAN DEFAULT 1')),
+    Migration(3, 'add notice.image_url', add_column('notice', 'image_url', 'VARCHAR(500)')),
+    # 공지 목록/조건부 GET, 공개 문의 게시판, 답변 일괄 조회
+    Migration(4, 'feed indexes', [
+        'CREATE INDEX IF NOT EXISTS ix_notice_feed ON notice (priority, created_at, id)',
+        'CREATE INDEX IF NOT EXISTS ix_notice_published_feed ON notice (priority, created_at, id) '
+        'WHERE is_published = 1',
+        'CREATE INDEX IF NOT EXISTS ix_notice_published_updated ON notice (updated_at) '
+        'WHERE is_published = 1',
+        'CREATE INDEX IF NOT EXISTS ix_inquiry_public_feed ON inquiry (created_at, id) '
+        'WHERE is_public = 1',
+        'CREATE INDEX IF NOT EXISTS ix_inquiry_answer_inquiry ON inquiry_answer (inquiry_id, created_at)',
+    ], online=True),
+    # 관리자 문의 목록 정렬, 문의 게시판 검증자(건수/최대 id/처리 건수) 커버링 인덱스
+    Migration(5, 'admin inquiry indexes', [
+        'CREATE INDEX IF NOT EXISTS ix_inquiry_created ON inquiry (created_at)',
+        'CREATE INDEX IF NOT EXISTS ix_inquiry_public_processed ON inquiry (id, is_processed) '
+        'WHERE is_public = 1',
+    ], online=True),
+    # 업로드 내용 주소 저장소: 키별 참조 수와 notice.image_url 트리거 (upload_storage.py)
+    Migration(6, 'upload blob refcounts', [
+        """CREATE TABLE IF NOT EXISTS upload_blob (
+            key TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            content_type TEXT,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            released_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )""",
+        'CREATE INDEX IF NOT EXISTS ix_upload_blob_orphan ON upload_blob (released_at) WHERE refcount <= 0',
+        """CREATE TRIGGER IF NOT EXISTS upload_notice_ai AFTER INSERT ON notice
+            WHEN new.image_url IS NOT NULL BEGIN
+            UPDATE upload_blob SET refcount = refcount + 1 WHERE key = new.image_url;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS upload_notice_ad AFTER DELETE ON notice
+            WHEN old.image_url IS NOT NULL BEGIN
+            UPDATE upload_blob SET refcount = refcount - 1,
+                released_at = CASE WHEN refcount <= 1 THEN CURRENT_TIMESTAMP ELSE released_at END
+            WHERE key = old.image_url;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS upload_notice_au AFTER UPDATE OF image_url ON notice
+            WHEN old.image_url IS NOT new.image_url BEGIN
+            UPDATE upload_blob SET refcount = refcount + 1 WHERE key = new.image_url;
+            UPDATE upload_blob SET refcount = refcount - 1,
+                released_at = CASE WHEN refcount <= 1 THEN CURRENT_TIMESTAMP ELSE released_at END
+            WHERE key = old.image_url;
+        END""",
+    ]),
+    # 문의 큐 항목 토큰: 소비자가 저장 후 완료 표시 전에 죽어도 같은 항목을 다시 저장하지 않도록
+    Migration(7, 'add inquiry.queue_token', lambda conn: add_column(
+        'inquiry', 'queue_token', 'VARCHAR(32)')(conn) + [
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_inquiry_queue_token ON inquiry (queue_token) '
+        'WHERE queue_token IS NOT NULL',
+    ]),
+]
+
+LATEST = MIGRATIONS[-1].version
+
+
+def current_version(conn):
+    """적용된 최종 버전 (schema_version 이 없으면 0)"""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if not exists:
+        return 0
+    return conn.execute('SELECT coalesce(max(version), 0) FROM schema_version').fetchone()[0]
+
+
+def plan(engine):
+    """적용할 마이그레이션과 실행할 SQL 문 목록 [(Migration, [sql, ...]), ...]"""
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        version = current_version(conn)
+        return [(m, m.statements(conn)) for m in MIGRATIONS if m.version > version]
+    finally:
+        raw.close()
+
+
+def migrate(engine, dry_run=False, log=None):
+    """대기 중인 마이그레이션 적용 (dry_run 이면 계획만 반환)
+
+    여러 프로세스가 동시에 실행해도 버전 확인을 쓰기 잠금 안에서 다시 하므로
+    같은 단계가 두 번 적용되지 않는다. 적용한 [(버전, 이름, 문장 수, 초)] 를 반환하며
+    dry_run 이면 문장 수 대신 실행할 SQL 문 목록을 담는다.
+    """
+    if dry_run:
+        return [(m.version, m.name, statements, 0.0) for m, statements in plan(engine)]
+
+    run_exclusive(engine, lambda conn: conn.execute(VERSION_TABLE))
+    applied = []
+    for migration in MIGRATIONS:
+        start = time.perf_counter()
+        count = _apply(engine, migration)
+        if count is None:
+            continue
+        elapsed = time.perf_counter() - start
+        applied.append((migration.version, migration.name, count, elapsed))
+        if log:
+            log(f'applied {migration.version:04d} {migration.name} ({count} statements, {elapsed * 1000:.0f}ms)')
+
+    if applied:
+        run_exclusive(engine, lambda conn: conn.execute('PRAGMA optimize'))
+    return applied
+
+
+def _apply(engine, migration):
+    """migration 적용 후 실행한 문장 수 반환 (이미 적용됐으면 None)"""
+    def pending(conn):
+        return current_version(conn) < migration.version
+
+    def record(conn):
+        conn.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)',
+                     (migration.version, migration.name))
+
+    if migration.online:
+        if not run_exclusive(engine, pending):
+            return None
+        statements = run_exclusive(engine, migration.statements)
+        # 인덱스 하나씩 별도 트랜잭션 (쓰기 잠금은 인덱스 생성 동안만)
+        for stmt in statements:
+            run_exclusive(engine, lambda conn: conn.execute(stmt))
+
+        def finish(conn):
+            if pending(conn):
+                record(conn)
+        run_exclusive(engine, finish)
+        return len(statements)
+
+    def apply(conn):
+        if not pending(conn):
+            return None
+        statements = migration.statements(conn)
+        for stmt in statements:
+            conn.execute(stmt)
+        record(conn)
+        return len(statements)
+    return run_exclusive(engine, apply)
@@ -0,0 +1,99 @@
+"""데이터베이스 모델
+
+db 는 앱 없이 생성하고 create_app() 에서 init_app 으로 연결한다.
+"""
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+# Database Models
+class Notice(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), default='관리자')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    priority = db.Column(db.Integer, default=0)  # 0: 일반, 1: 중요
+    is_published = db.Column(db.Boolean, default=True)
+    view_count = db.Column(db.Integer, default=0)
+    image_url = db.Column(db.String(500))  # 이미지 URL 필드 추가
+
+# 목록 정렬 (priority DESC, created_at DESC, id DESC) 용 인덱스
+db.Index('ix_notice_feed', Notice.priority, Notice.created_at, Notice.id)
+db.Index('ix_notice_published_feed', Notice.priority, Notice.created_at, Notice.id,
+         sqlite_where=Notice.is_published == True)
+# 조건부 GET 검증자 계산용 (게시 공지 max(updated_at))
+db.Index('ix_notice_published_updated', Notice.updated_at,
+         sqlite_where=Notice.is_published == True)
+
+# 공지사항 키셋 정렬 키
+NOTICE_FEED_KEYS = [(Notice.priority, int), (Notice.created_at, datetime), (Notice.id, int)]
+
+def notice_to_dict(notice):
+    return {
+        'id': notice.id,
+        'title': notice.title,
+        'content': notice.content,
+        'author': notice.author,
+        'created_at': notice.created_at.isoformat() if notice.created_at else None,
+        'updated_at': notice.updated_at.isoformat() if notice.updated_at else None,
+        'priority': notice.priority,
+        'view_count': notice.view_count,
+        'image_url': notice.image_url
+    }
+
+class Inquiry(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(100), nullable=False)
+    phone = db.Column(db.String(20))
+    company = db.Column(db.String(100))
+    service_interest = db.Column(db.String(100))
+    message = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_processed = db.Column(db.Boolean, default=False)
+    is_public = db.Column(db.Boolean, default=True)
+    # 문의 큐 항목 토큰 (inquiry_queue.py, 동기 저장 경로는 NULL)
+    queue_token = db.Column(db.String(32))
+    answers = db.relationship('InquiryAnswer', backref='inquiry',
+                              order_by='InquiryAnswer.created_at')
+
+class InquiryAnswer(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    inquiry_id = db.Column(db.Integer, db.ForeignKey('inquiry.id'), nullable=False)
+    admin_name = db.Column(db.String(100), default='관리자')
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def build_inquiry(data):
+    """문의 API 입력으로 Inquiry 생성 (큐 소비자와 동기 경로 공용)"""
+    inquiry = Inquiry(
+        name=data['name'],
+        email=data['email'],
+        phone=data.get('phone', ''),
+        company=data.get('company', ''),
+        service_interest=data.get('service_interest', ''),
+        message=data['message'],
+        is_public=bool(data.get('is_public', True))
+    )
+    if data.get('created_at'):
+        inquiry.created_at = datetime.utcfromtimestamp(data['created_at'])
+    return inquiry
+
+# 공개 문의 게시판 정렬 (created_at DESC, id DESC) 및 답변 일괄 조회용 인덱스
+db.Index('ix_inquiry_public_feed', Inquiry.created_at, Inquiry.id,
+         sqlite_where=Inquiry.is_public == True)
+db.Index('ix_inquiry_answer_inquiry', InquiryAnswer.inquiry_id, InquiryAnswer.created_at)
+# 관리자 문의 목록 정렬, 문의 게시판 검증자용 커버링 인덱스
+db.Index('ix_inquiry_created', Inquiry.created_at)
+db.Index('ix_inquiry_public_processed', Inquiry.id, Inquiry.is_processed,
+         sqlite_where=Inquiry.is_public == True)
+# 큐 항목 중복 저장 방지
+db.Index('ix_inquiry_queue_token', Inquiry.queue_token, unique=True,
+         sqlite_where=Inquiry.queue_token != None)
+
+# 문의 게시판 키셋 정렬 키
+INQUIRY_FEED_KEYS = [(Inquiry.created_at, datetime), (Inquiry.id, int)]
@@ -0,0 +1,345 @@
+"""렌더링된 페이지 캐시
+
+공개 페이지의 렌더링 결과(상태코드, 헤더, 본문)를 경로 + 쿼리 +
+세션 상태를 키로 저장한다. 관리자 쓰기 라우트가 invalidate()를 호출하면
+공유 세대(generation) 파일이 갱신되어 모든 gunicorn 워커의 캐시가 무효화된다.
+
+백엔드
+- MemoryBackend: 워커별 LRU (TTL, 항목 수/바이트 상한)
+- FileSystemBackend: 워커 간 공유 디렉터리 (세대별 하위 디렉터리)
+"""
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+
+from flask import request, session, make_response
+
+# 요청 environ 에 이 키가 있으면 캐시를 거치지 않음 (사전 렌더링 등)
+BYPASS_ENVIRON = 'blh.page_cache.bypass'
+
+
+class MemoryBackend:
+    """TTL과 바이트 상한이 있는 LRU 메모리 캐시"""
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, size, timeout):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.time() + timeout, value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def set_generation(self, generation):
+        """워커별 캐시이므로 세대가 바뀌면 모두 비움"""
+        self.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data), 'bytes': self._bytes, 'evictions': self.evictions}
+
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+
+class FileSystemBackend:
+    """여러 워커가 공유하는 디렉터리 캐시 (항목당 파일 하나)
+
+    항목은 `<디렉터리>/<세대>/` 에 저장한다. 무효화는 새 세대 디렉터리로 옮기는
+    것으로 끝나므로, 아직 이전 세대를 보고 있는 워커가 쓴 항목은 새 세대에서 읽히지
+    않는다. 이전 세대 디렉터리는 세대가 바뀔 때 지운다.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._current = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self._current, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.cache')
+
+    def get(self, key):
+        if self._current is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires_at < time.time():
+            self._unlink(path)
+            return None
+        return value
+
+    def set(self, key, value, size, timeout):
+        if size > self.max_bytes or self._current is None:
+            return
+        # 임시 파일에 쓴 뒤 rename 하여 다른 워커가 반쯤 쓰인 파일을 읽지 않도록 한다
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self._current, suffix='.tmp')
+        except OSError:
+            # 다른 워커가 이미 새 세대로 옮기며 이 디렉터리를 지움
+            return
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((time.time() + timeout, value), f, pickle.HIGHEST_PROTOCOL)
+        try:
+            os.replace(tmp, self._path(key))
+        except OSError:
+            self._unlink(tmp)
+            return
+        self._enforce_limit()
+
+    def set_generation(self, generation):
+        """세대 디렉터리로 전환하고 이전 세대(및 세대 도입 전 항목) 삭제"""
+        name = str(generation or 0)
+        current = os.path.join(self.directory, name)
+        if current == self._current:
+            return
+        os.makedirs(current, exist_ok=True)
+        self._current = current
+        for entry in os.scandir(self.directory):
+            if entry.is_dir(follow_symlinks=False):
+                # 더 새로운 세대는 다른 워커가 먼저 옮겨 간 것이므로 남김
+                if entry.name.isdigit() and int(entry.name) < int(name):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.name.endswith(('.cache', '.tmp')):
+                self._unlink(entry.path)
+
+    def clear(self):
+        if self._current is None:
+            return
+        for name in os.listdir(self._current):
+            if name.endswith('.cache'):
+                self._unlink(os.path.join(self._current, name))
+
+    def stats(self):
+        entries, total = self._scan()
+        return {'entries': len(entries), 'bytes': total, 'evictions': self.evictions}
+
+    def _scan(self):
+        entries, total = [], 0
+        if self._current is None:
+            return entries, total
+        try:
+            scanned = list(os.scandir(self._current))
+        except OSError:
+            return entries, total
+        for entry in scanned:
+            if entry.name.endswith('.cache'):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        return entries, total
+
+    def _enforce_limit(self):
+        entries, total = self._scan()
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._unlink(path)
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class PageCache:
+    """라우트 데코레이터 + 무효화 + 히트/미스 카운터"""
+
+    def __init__(self):
+        self.backend = None
+        self.default_timeout = 300
+        self.enabled = True
+        self._generation_file = None
+        self._generation = None
+        self._generation_stat = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        app.config.setdefault('PAGE_CACHE_ENABLED', True)
+        app.config.setdefault('PAGE_CACHE_BACKEND', os.getenv('PAGE_CACHE_BACKEND', 'memory'))
+        app.config.setdefault('PAGE_CACHE_TIMEOUT', 300)
+        app.config.setdefault('PAGE_CACHE_MAX_ENTRIES', 512)
+        app.config.setdefault('PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+        app.config.setdefault('PAGE_CACHE_DIR', os.path.join(app.instance_path, 'page_cache'))
+
+        self.enabled = app.config['PAGE_CACHE_ENABLED']
+        self.default_timeout = app.config['PAGE_CACHE_TIMEOUT']
+        if app.config['PAGE_CACHE_BACKEND'] == 'filesystem':
+            self.backend = FileSystemBackend(app.config['PAGE_CACHE_DIR'],
+                                             max_bytes=app.config['PAGE_CACHE_MAX_BYTES'])
+        else:
+            self.backend = MemoryBackend(max_entries=app.config['PAGE_CACHE_MAX_ENTRIES'],
+                                         max_bytes=app.config['PAGE_CACHE_MAX_BYTES'])
+
+        os.makedirs(app.instance_path, exist_ok=True)
+        self._generation_file = os.path.join(app.instance_path, 'page_cache.generation')
+        if not os.path.exists(self._generation_file):
+            self._touch_generation()
+
+    def cached(self, timeout=None, on_hit=None):
+        """공개 GET 라우트 응답 캐싱 데코레이터
+
+        on_hit은 캐시 적중 시에도 실행해야 하는 부수효과(예: 조회수)를 위해
+        뷰 인자와 함께 호출된다.
+        """
+        def decorator(view_func):
+            @wraps(view_func)
+            def wrapper(*args, **kwargs):
+                key = self._key()
+                if key is None:
+                    self.bypasses += 1
+                    return view_func(*args, **kwargs)
+
+                self._check_generation()
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    if on_hit is not None:
+                        on_hit(*args, **kwargs)
+                    status, headers, body = entry
+                    return make_response(body, status, headers)
+
+                self.misses += 1
+                response = make_response(view_func(*args, **kwargs))
+                if self._cacheable(response):
+                    body = response.get_data()
+                    headers = [(k, v) for k, v in response.headers
+                               if k.lower() not in ('set-cookie', 'content-length')]
+                    self.backend.set(key, (response.status_code, headers, body),
+                                     len(body), timeout or self.default_timeout)
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self):
+        """모든 워커의 캐시 무효화 (세대 파일 갱신, 공유 디렉터리는 새 세대로 전환)"""
+        with self._lock:
+            self.invalidations += 1
+            self._touch_generation()
+        if self.backend is not None:
+            self._check_generation()
+
+    def last_changed(self):
+        """마지막 invalidate() 시각 (UTC naive) — 삭제/비공개 전환에도 증가하는 Last-Modified 용"""
+        generation = self._read_generation()
+        if generation is None:
+            return None
+        return datetime.utcfromtimestamp(generation / 1e9)
+
+    def stats(self):
+        data = {
+            'enabled': self.enabled,
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'invalidations': self.invalidations,
+        }
+        if self.backend is not None:
+            data.update(self.backend.stats())
+        return data
+
+    def _key(self):
+        # 관리자 세션이나 표시할 flash 메시지가 있으면 캐시하지 않는다
+        if not self.enabled or request.method != 'GET' or request.environ.get(BYPASS_ENVIRON):
+            return None
+        if session.get('_flashes') or session.get('admin_logged_in') or session.get('is_admin_authenticated'):
+            return None
+        query = '&'.join(sorted(request.query_string.decode('latin-1').split('&')))
+        return f'{request.path}?{query}'
+
+    @staticmethod
+    def _cacheable(response):
+        return (response.status_code == 200
+                and not response.direct_passthrough
+                and 'Set-Cookie' not in response.headers
+                and 'no-store' not in response.headers.get('Cache-Control', ''))
+
+    def _touch_generation(self):
+        # 세대 값은 파일 내용 (시계가 같은 값을 주거나 되돌아가도 이전 값보다 크게),
+        # 임시 파일 + rename 으로 다른 워커가 반쯤 쓰인 값을 읽지 않게 한다
+        generation = max(time.time_ns(), (self._read_generation() or 0) + 1)
+        directory = os.path.dirname(self._generation_file)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(generation))
+        os.replace(tmp, self._generation_file)
+
+    def _read_generation(self):
+        try:
+            with open(self._generation_file) as f:
+                return int(f.read().strip())
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def _check_generation(self):
+        # 다른 워커에서 invalidate()가 호출되었는지 확인. 파일은 매번 rename 으로
+        # 바뀌므로 (inode, mtime) 이 그대로면 다시 읽지 않고, 바뀌었을 때만 값을 읽는다
+        try:
+            st = os.stat(self._generation_file)
+            signature = (st.st_ino, st.st_mtime_ns)
+        except OSError:
+            signature = None
+        if signature is not None and signature == self._generation_stat:
+            return
+        self._generation_stat = signature
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self.backend.set_generation(generation)
+
+
+page_cache = PageCache()
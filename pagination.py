@@ -0,0 +1,73 @@
+"""키셋(커서) 페이지네이션 유틸리티
+
+OFFSET 대신 마지막 행의 정렬 키를 커서로 넘겨, 몇 페이지를 넘기든
+인덱스 탐색 한 번으로 다음 페이지를 가져온다.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values):
+    """정렬 키 값 목록을 URL에 넣을 수 있는 커서 문자열로 변환"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, types):
+    """커서 문자열을 정렬 키 값 목록으로 복원 (잘못된 커서는 None)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            return None
+        return [datetime.fromisoformat(v) if t is datetime else t(v)
+                for v, t in zip(payload, types)]
+    except (ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """한 페이지 분량의 결과와 다음 페이지 커서"""
+
+    def __init__(self, items, next_cursor, after=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.after = after
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return not self.after
+
+
+def keyset_paginate(query, columns, after=None, per_page=20):
+    """columns 내림차순 키셋 페이지네이션
+
+    columns는 (컬럼, 타입) 튜플 목록이며 마지막 컬럼은 유일해야 한다
+    (보통 기본키). 다음 페이지 존재 여부는 per_page + 1 행을 읽어 판단한다.
+    """
+    cols = [c for c, _ in columns]
+    types = [t for _, t in columns]
+
+    values = decode_cursor(after, types)
+    if values is not None:
+        query = query.filter(tuple_(*cols) < tuple_(*values))
+
+    rows = query.order_by(*[c.desc() for c in cols]).limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in cols])
+
+    return KeysetPage(items, next_cursor, after if values is not None else None)
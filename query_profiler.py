@@ -0,0 +1,172 @@
+"""쿼리 프로파일러 (느린 쿼리 로그 + N+1 감지)
+
+db 엔진의 커서 이벤트로 요청 안에서 실행된 SQL 을 관찰한다.
+
+- 느린 쿼리: QUERY_SLOW_MS 를 넘은 문장은 EXPLAIN QUERY PLAN 과 함께 기록
+- N+1: 한 요청에서 같은 문장(파라미터 바인딩 전 SQL)이 QUERY_N_PLUS_ONE_THRESHOLD
+  번 이상 실행되면 요청이 끝날 때 기록
+- 요청별 프로파일: 관리자 세션에서 X-Query-Profile: 1 헤더를 보내면(QUERY_PROFILE_ALL
+  이면 모든 요청) 그 요청의 모든 쿼리를 실행 계획과 함께 기록하고 X-Query-Count,
+  X-Request-ID 응답 헤더를 붙임
+
+기록은 한 줄에 JSON 하나(JSON Lines)이며 QUERY_LOG_PATH 가 있으면 그 파일에
+추가하고, 없으면 query_profiler 로거로 내보낸다 (stdout 수집 파이프라인용).
+평소 요청에서는 문장별 시간 측정과 횟수 집계만 하므로 부담이 작다. 바인딩
+파라미터에는 문의자 연락처 등이 들어가므로 QUERY_LOG_PARAMS 일 때만 기록한다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import request, session
+from sqlalchemy import event
+from werkzeug.local import Local
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Query-Profile'
+
+
+class QueryProfiler:
+    def __init__(self):
+        # 요청별 상태 (contextvars 기반, ASGI 모드에서도 요청마다 분리)
+        self._local = Local()
+        self._write_lock = threading.Lock()
+        self.enabled = True
+        self.slow_ms = 100.0
+        self.n_plus_one_threshold = 5
+        self.log_path = None
+        self.log_params = False
+        self.profile_all = False
+
+    def init_app(self, app, db):
+        app.config.setdefault('QUERY_PROFILER_ENABLED', True)
+        app.config.setdefault('QUERY_SLOW_MS', float(os.getenv('QUERY_SLOW_MS', 100)))
+        app.config.setdefault('QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        app.config.setdefault('QUERY_LOG_PATH', os.getenv('QUERY_LOG_PATH'))
+        app.config.setdefault('QUERY_LOG_PARAMS', False)
+        # 개발 환경에서 모든 요청 프로파일
+        app.config.setdefault('QUERY_PROFILE_ALL', False)
+        self.enabled = app.config['QUERY_PROFILER_ENABLED']
+        if not self.enabled:
+            return
+        self.slow_ms = float(app.config['QUERY_SLOW_MS'])
+        self.n_plus_one_threshold = int(app.config['QUERY_N_PLUS_ONE_THRESHOLD'])
+        self.log_path = app.config['QUERY_LOG_PATH']
+        self.log_params = app.config['QUERY_LOG_PARAMS']
+        self.profile_all = app.config['QUERY_PROFILE_ALL']
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        with app.app_context():
+            self.watch_engine(db.engine)
+
+    def watch_engine(self, engine):
+        """엔진의 쿼리를 프로파일 대상에 추가 (ASGI 모드의 aiosqlite 엔진 등)"""
+        if not self.enabled:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # 요청 상태 ------------------------------------------------------------
+
+    def _before_request(self):
+        local = self._local
+        local.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+        local.shapes = {}
+        local.profile = self.profile_all or (
+            request.headers.get(PROFILE_HEADER) == '1' and session.get('admin_logged_in', False))
+        local.queries = [] if local.profile else None
+
+    def _teardown_request(self, exc):
+        self._local.shapes = None
+        self._local.queries = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        local = self._local
+        elapsed_ms = (time.perf_counter() - local.query_start) * 1000
+        shapes = getattr(local, 'shapes', None)
+        if shapes is not None:
+            count, total_ms = shapes.get(statement, (0, 0.0))
+            shapes[statement] = (count + 1, total_ms + elapsed_ms)
+
+        slow = elapsed_ms >= self.slow_ms
+        queries = getattr(local, 'queries', None)
+        if not slow and queries is None:
+            return
+        plan = None if executemany else explain(conn.connection.dbapi_connection, statement, parameters)
+        if queries is not None:
+            queries.append({'sql': statement, 'ms': round(elapsed_ms, 3), 'plan': plan})
+        if slow:
+            fields = {'params': _preview(parameters, executemany)} if self.log_params else {}
+            self.emit('slow_query', sql=statement, ms=round(elapsed_ms, 3), plan=plan, **fields)
+
+    def _after_request(self, response):
+        local = self._local
+        shapes = getattr(local, 'shapes', None)
+        if shapes is None:
+            return response
+        for statement, (count, total_ms) in shapes.items():
+            if count >= self.n_plus_one_threshold:
+                self.emit('n_plus_one', sql=statement, count=count, total_ms=round(total_ms, 3))
+        if local.queries is not None:
+            self.emit('request_profile', status=response.status_code, query_count=len(local.queries),
+                      total_ms=round(sum(q['ms'] for q in local.queries), 3), queries=local.queries)
+            response.headers['X-Query-Count'] = str(len(local.queries))
+            response.headers.setdefault('X-Request-ID', local.request_id)
+        return response
+
+    # 출력 ---------------------------------------------------------------
+
+    def emit(self, event_name, **fields):
+        """JSON 한 줄 기록 (요청 안이면 요청 정보 포함)"""
+        record = {'ts': datetime.utcnow().isoformat(timespec='milliseconds') + 'Z', 'event': event_name}
+        if request:
+            record.update(request_id=getattr(self._local, 'request_id', None), method=request.method,
+                          path=request.path, endpoint=request.endpoint)
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        if not self.log_path:
+            logger.warning(line)
+            return
+        try:
+            with self._write_lock, open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError:
+            logger.exception('query log write failed: %s', self.log_path)
+
+
+def explain(dbapi_connection, statement, parameters):
+    """SELECT 문의 EXPLAIN QUERY PLAN (detail 목록), 그 외/실패 시 None"""
+    if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    try:
+        # DBAPI 연결로 직접 실행해 엔진 이벤트가 다시 발생하지 않게 함 (aiosqlite 어댑터도 커서 API 는 같음)
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters or ())
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+    return [row[3] for row in rows]
+
+
+def _preview(parameters, executemany, limit=10):
+    """로그에 남길 파라미터 앞부분 (긴 문자열은 자름)"""
+    if executemany or parameters is None:
+        return None
+    values = list(parameters.values()) if isinstance(parameters, dict) else list(parameters)
+    return [v[:50] if isinstance(v, str) else v for v in values[:limit]]
+
+
+query_profiler = QueryProfiler()
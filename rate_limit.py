@@ -0,0 +1,200 @@
+"""요청 빈도 제한 (문의 접수 / 관리자 로그인)
+
+RATE_LIMITS 의 엔드포인트에 대한 쓰기 요청(POST 등)을 클라이언트 IP 별로 제한한다.
+알고리즘은 GCRA(토큰 버킷과 같은 동작, 키마다 '다음 허용 시각' 하나만 저장)로,
+기간(초)당 limit 회, 연속으로 burst 회까지 허용한다. 초과하면 429 와 Retry-After
+(다시 허용되는 데까지 남은 초)를 돌려준다 (응답 형식은 views.enforce_rate_limits).
+
+상태는 RATE_LIMIT_PATH 의 고정 크기 파일을 mmap 한 슬롯 테이블에 두어 gunicorn
+워커들이 공유하고, 갱신은 flock 으로 직렬화한다. DB 나 소켓을 거치지 않으므로 판정
+한 번이 수 마이크로초이다. 키는 (정책, IP) 해시이며 테이블이 가득 차면 탐색 범위에서
+가장 먼저 풀릴 항목을 덮어쓴다 (그 키의 제한이 초기화될 뿐 요청을 막지는 않음).
+fcntl 이 없는 환경(Windows)에서는 프로세스 안에서만 공유된다.
+
+클라이언트 IP 는 REMOTE_ADDR 이 신뢰 프록시(RATE_LIMIT_TRUSTED_PROXIES, 기본은
+루프백/사설 대역 = 같은 호스트·도커 네트워크의 nginx)일 때만 X-Forwarded-For 를
+오른쪽부터 따라가 처음 만나는 신뢰하지 않는 주소로 정한다 (클라이언트가 보낸 값으로
+제한을 피할 수 없도록). 판정 결과는 /metrics 의 blh_rate_limit_requests_total
+{policy, result} 카운터로 모은다.
+"""
+import hashlib
+import ipaddress
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BLHRL001'
+# 키 해시(0 = 빈 슬롯), 다음 허용 시각(TAT, epoch 초)
+SLOT = struct.Struct('<Qd')
+PROBES = 8
+TRUST_CACHE_SIZE = 4096
+LIMITED_METHODS = frozenset(('POST', 'PUT', 'PATCH', 'DELETE'))
+
+# 엔드포인트 -> (기간당 요청 수, 기간(초), 연속 허용 수)
+DEFAULT_POLICIES = {
+    'api_inquiry': (10, 60, 5),
+    'admin_login': (10, 300, 5),
+}
+DEFAULT_TRUSTED_PROXIES = ('127.0.0.0/8', '::1/128', '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', 'fc00::/7')
+
+
+class SlotTable:
+    """워커 간 공유 mmap 슬롯 테이블"""
+
+    _open_lock = threading.Lock()
+
+    def __init__(self, path, slots):
+        self.path = path
+        self.slots = slots
+        self.size = len(MAGIC) + slots * SLOT.size
+        self._map = None
+        self._fd = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # fork 이후에는 워커마다 새로 연다 (flock 은 열린 파일 단위라 공유하면 서로 배제되지 않음)
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._open_lock:
+            if self._pid != pid:
+                self._reopen(pid)
+
+    def _reopen(self, pid):
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            # 크기나 형식이 다르면(슬롯 수 변경) 비우고 새로 만든다
+            if os.fstat(fd).st_size != self.size or os.pread(fd, len(MAGIC), 0) != MAGIC:
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, MAGIC, 0)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(fd, self.size)
+        self._fd = fd
+        self._pid = pid
+
+    def hit(self, key, now, interval, burst):
+        """요청 하나를 기록, (허용 여부, 재시도까지 남은 초)"""
+        self._open()
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                offset, tat = self._find(key)
+                tat = max(tat, now)
+                allow_at = tat + interval - burst * interval
+                if now < allow_at:
+                    return False, allow_at - now
+                SLOT.pack_into(self._map, offset, key, tat + interval)
+                return True, 0.0
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _find(self, key):
+        """키의 슬롯 (오프셋, TAT), 없으면 비었거나 가장 먼저 풀리는 슬롯 (TAT 0)"""
+        start = key % self.slots
+        victim, victim_tat = None, None
+        for i in range(PROBES):
+            offset = len(MAGIC) + (start + i) % self.slots * SLOT.size
+            stored, tat = SLOT.unpack_from(self._map, offset)
+            if stored == key:
+                return offset, tat
+            if victim is None or tat < victim_tat:
+                victim, victim_tat = offset, tat
+        return victim, 0.0
+
+
+class RateLimiter:
+    """엔드포인트별 정책 + 클라이언트 IP 판정"""
+
+    def __init__(self):
+        self.enabled = True
+        self.policies = {}
+        self.trusted = ()
+        self.table = None
+        # 주소 -> 신뢰 프록시 여부 (ipaddress 파싱이 판정보다 비싸므로)
+        self._trust_cache = {}
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', os.getenv('RATE_LIMIT_ENABLED', '1') != '0')
+        app.config.setdefault('RATE_LIMIT_PATH', os.getenv(
+            'RATE_LIMIT_PATH', os.path.join(app.instance_path, 'rate_limit.bin')))
+        app.config.setdefault('RATE_LIMIT_SLOTS', 4096)
+        app.config.setdefault('RATE_LIMITS', DEFAULT_POLICIES)
+        app.config.setdefault('RATE_LIMIT_TRUSTED_PROXIES', DEFAULT_TRUSTED_PROXIES)
+        self.enabled = app.config['RATE_LIMIT_ENABLED']
+        self.policies = dict(app.config['RATE_LIMITS'])
+        self.trusted = tuple(ipaddress.ip_network(n) for n in app.config['RATE_LIMIT_TRUSTED_PROXIES'])
+        self._trust_cache = {}
+        self.table = SlotTable(app.config['RATE_LIMIT_PATH'], int(app.config['RATE_LIMIT_SLOTS']))
+
+    def _trusted(self, address):
+        trusted = self._trust_cache.get(address)
+        if trusted is None:
+            try:
+                ip = ipaddress.ip_address(address)
+            except ValueError:
+                trusted = False
+            else:
+                trusted = any(ip in network for network in self.trusted)
+            if len(self._trust_cache) >= TRUST_CACHE_SIZE:
+                self._trust_cache.clear()
+            self._trust_cache[address] = trusted
+        return trusted
+
+    def client_ip(self, environ):
+        """신뢰 프록시를 거친 요청은 X-Forwarded-For 에서 실제 클라이언트 주소"""
+        address = environ.get('REMOTE_ADDR') or ''
+        forwarded = environ.get('HTTP_X_FORWARDED_FOR')
+        if forwarded and self._trusted(address):
+            for hop in reversed(forwarded.split(',')):
+                address = hop.strip()
+                if not self._trusted(address):
+                    break
+        return address
+
+    def check(self, request):
+        """요청이 정책 한도 안인지, (허용 여부, Retry-After 초) - 정책 없는 요청은 (True, 0)"""
+        endpoint = request.endpoint
+        policy = self.policies.get(endpoint)
+        if not self.enabled or policy is None or request.method not in LIMITED_METHODS:
+            return True, 0
+        limit, period, burst = policy
+        client = self.client_ip(request.environ)
+        digest = hashlib.blake2b(f'{endpoint}\0{client}'.encode(), digest_size=8).digest()
+        key = int.from_bytes(digest, 'little') or 1
+        try:
+            allowed, wait = self.table.hit(key, time.time(), period / limit, burst)
+        except OSError:
+            # 상태 파일을 쓸 수 없으면 제한 없이 통과 (사이트 자체는 동작하도록)
+            logger.exception('rate limit table unavailable: %s', self.table.path)
+            return True, 0
+        metrics.inc('blh_rate_limit_requests_total', (endpoint, 'allowed' if allowed else 'limited'))
+        if allowed:
+            return True, 0
+        logger.info('rate limited %s %s (retry in %.1fs)', endpoint, client, wait)
+        return False, max(1, math.ceil(wait))
+
+
+rate_limiter = RateLimiter()
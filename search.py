@@ -0,0 +1,215 @@
+"""FTS5 전문 검색
+
+게시된 공지사항, 공개 문의, 공개 문의의 답변을 하나의 FTS5 테이블
+(search_index)에 색인한다. 한국어는 띄어쓰기 단위 어절이 조사/어미와
+붙어 있어 단어 토크나이저로는 부분 일치가 되지 않으므로, 각 어절을
+2-gram 으로 나눈 텍스트를 색인한다 ("플랫폼" -> "플랫 랫폼").
+
+색인은 notice / inquiry / inquiry_answer 테이블의 트리거로 동기화되며,
+트리거는 연결마다 등록되는 search_ngrams() SQL 함수를 사용한다.
+rowid 는 (원본 id * 4 + 종류) 로 인코딩해 갱신/삭제 시 rowid 로 바로 찾는다.
+"""
+import re
+
+from markupsafe import Markup, escape
+from sqlalchemy import event
+
+from db_profile import run_exclusive
+
+KIND_NOTICE = 1
+KIND_INQUIRY = 2
+KIND_ANSWER = 3
+KIND_NAMES = {KIND_NOTICE: 'notice', KIND_INQUIRY: 'inquiry', KIND_ANSWER: 'answer'}
+# 검색 필터 (?type=) -> 색인 종류
+SEARCH_TYPES = {'notice': (KIND_NOTICE,), 'inquiry': (KIND_INQUIRY, KIND_ANSWER)}
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, parent_id UNINDEXED,
+        title UNINDEXED, body UNINDEXED,
+        title_ngrams, body_ngrams,
+        tokenize = 'unicode61', prefix = '1'
+    )""",
+]
+
+INSERT_NOTICE = """
+    INSERT INTO search_index (rowid, kind, ref_id, parent_id, title, body, title_ngrams, body_ngrams)
+    SELECT {src}.id * 4 + 1, 1, {src}.id, NULL, {src}.title, {src}.content,
+           search_ngrams({src}.title), search_ngrams({src}.content)
+"""
+INSERT_INQUIRY = """
+    INSERT INTO search_index (rowid, kind, ref_id, parent_id, title, body, title_ngrams, body_ngrams)
+    SELECT {src}.id * 4 + 2, 2, {src}.id, {src}.id, {src}.name, {src}.message,
+           search_ngrams({src}.name), search_ngrams({src}.message)
+"""
+INSERT_ANSWER = """
+    INSERT INTO search_index (rowid, kind, ref_id, parent_id, title, body, title_ngrams, body_ngrams)
+    SELECT {src}.id * 4 + 3, 3, {src}.id, {src}.inquiry_id, NULL, {src}.content,
+           '', search_ngrams({src}.content)
+"""
+
+TRIGGERS = [
+    # 공지사항 (게시된 것만)
+    f"""CREATE TRIGGER IF NOT EXISTS search_notice_ai AFTER INSERT ON notice BEGIN
+        {INSERT_NOTICE.format(src='new')} WHERE new.is_published;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS search_notice_au AFTER UPDATE OF title, content, is_published ON notice BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        {INSERT_NOTICE.format(src='new')} WHERE new.is_published;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_notice_ad AFTER DELETE ON notice BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END""",
+    # 문의 (공개된 것만) - 공개 여부가 바뀌면 답변도 함께 추가/제거
+    f"""CREATE TRIGGER IF NOT EXISTS search_inquiry_ai AFTER INSERT ON inquiry BEGIN
+        {INSERT_INQUIRY.format(src='new')} WHERE new.is_public;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS search_inquiry_au AFTER UPDATE OF name, message, is_public ON inquiry BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        DELETE FROM search_index WHERE rowid IN (SELECT id * 4 + 3 FROM inquiry_answer WHERE inquiry_id = old.id);
+        {INSERT_INQUIRY.format(src='new')} WHERE new.is_public;
+        {INSERT_ANSWER.format(src='inquiry_answer')} FROM inquiry_answer
+            WHERE inquiry_answer.inquiry_id = new.id AND new.is_public;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_inquiry_ad AFTER DELETE ON inquiry BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        DELETE FROM search_index WHERE rowid IN (SELECT id * 4 + 3 FROM inquiry_answer WHERE inquiry_id = old.id);
+    END""",
+    # 답변 (공개 문의의 답변만)
+    f"""CREATE TRIGGER IF NOT EXISTS search_answer_ai AFTER INSERT ON inquiry_answer BEGIN
+        {INSERT_ANSWER.format(src='new')}
+            WHERE EXISTS (SELECT 1 FROM inquiry WHERE inquiry.id = new.inquiry_id AND inquiry.is_public);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS search_answer_au AFTER UPDATE OF content ON inquiry_answer BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        {INSERT_ANSWER.format(src='new')}
+            WHERE EXISTS (SELECT 1 FROM inquiry WHERE inquiry.id = new.inquiry_id AND inquiry.is_public);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_answer_ad AFTER DELETE ON inquiry_answer BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END""",
+]
+
+REBUILD = [
+    'DELETE FROM search_index',
+    INSERT_NOTICE.format(src='notice') + ' FROM notice WHERE notice.is_published',
+    INSERT_INQUIRY.format(src='inquiry') + ' FROM inquiry WHERE inquiry.is_public',
+    INSERT_ANSWER.format(src='inquiry_answer') + ' FROM inquiry_answer JOIN inquiry '
+    'ON inquiry.id = inquiry_answer.inquiry_id WHERE inquiry.is_public',
+]
+
+
+def ngrams(text):
+    """어절을 겹치는 2-gram 으로 분해 (2글자 이하 어절은 그대로)"""
+    tokens = []
+    for word in WORD_RE.findall((text or '').lower()):
+        if len(word) <= 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return ' '.join(tokens)
+
+
+def build_match(query):
+    """사용자 입력 -> FTS5 MATCH 식 (어절마다 2-gram 구문, 모두 AND)"""
+    parts = []
+    for word in WORD_RE.findall((query or '').lower()):
+        if len(word) == 1:
+            parts.append(f'"{word}"*')
+        else:
+            parts.append('"' + ngrams(word) + '"')
+    return ' '.join(parts)
+
+
+def highlight(text, query, width=160):
+    """원문에서 검색어 주변을 잘라 <mark> 로 강조"""
+    text = text or ''
+    words = sorted({w for w in WORD_RE.findall((query or '').lower())}, key=len, reverse=True)
+    if not words:
+        return escape(text[:width])
+    pattern = re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
+    first = pattern.search(text)
+    start = max(0, first.start() - width // 3) if first else 0
+    window = text[start:start + width]
+
+    out, pos = [], 0
+    for m in pattern.finditer(window):
+        out.append(escape(window[pos:m.start()]))
+        out.append(Markup('<mark>') + escape(m.group(0)) + Markup('</mark>'))
+        pos = m.end()
+    out.append(escape(window[pos:]))
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + width < len(text) else ''
+    return Markup(prefix) + Markup('').join(out) + Markup(suffix)
+
+
+class SearchIndex:
+    """search_index 스키마 관리 + 검색"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+        # 스키마/트리거 생성은 `flask init-db` 에서 (워커 시작 시 쓰기 잠금을 잡지 않도록)
+        with app.app_context():
+            self.watch_engine(db.engine)
+
+    def watch_engine(self, engine):
+        """엔진의 새 연결에 검색 트리거용 SQL 함수 등록 (ASGI 모드의 aiosqlite 엔진 등)"""
+        event.listen(engine, 'connect', self._register_functions)
+
+    @staticmethod
+    def _register_functions(dbapi_connection, _):
+        dbapi_connection.create_function('search_ngrams', 1, ngrams, deterministic=True)
+
+    def ensure_schema(self):
+        """FTS 테이블/트리거 생성 (처음 만들 때는 기존 데이터 색인)"""
+        def create(conn):
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'").fetchone()
+            for stmt in SCHEMA + TRIGGERS:
+                conn.execute(stmt)
+            if not exists:
+                for stmt in REBUILD:
+                    conn.execute(stmt)
+        run_exclusive(self.db.engine, create)
+
+    def rebuild(self):
+        """색인 전체 재생성 (트리거 밖에서 데이터가 바뀐 경우)"""
+        self.ensure_schema()
+        with self.db.engine.begin() as conn:
+            for stmt in REBUILD:
+                conn.exec_driver_sql(stmt)
+            conn.exec_driver_sql("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+    def search(self, query, type_=None, page=1, per_page=10):
+        """bm25 순위 검색 -> (결과 목록, 다음 페이지 존재 여부)"""
+        match = build_match(query)
+        if not match:
+            return [], False
+        sql = ('SELECT kind, ref_id, parent_id, title, body, '
+               'bm25(search_index, 0, 0, 0, 0, 0, 5.0, 1.0) AS rank '
+               'FROM search_index WHERE search_index MATCH :match')
+        params = {'match': match, 'limit': per_page + 1, 'offset': (page - 1) * per_page}
+        if type_ in SEARCH_TYPES:
+            sql += ' AND kind IN (%s)' % ', '.join(str(k) for k in SEARCH_TYPES[type_])
+        sql += ' ORDER BY rank LIMIT :limit OFFSET :offset'
+
+        rows = self.db.session.execute(self.db.text(sql), params).fetchall()
+        results = [{
+            'type': KIND_NAMES[row.kind],
+            'id': row.ref_id,
+            'inquiry_id': row.parent_id,
+            'title': row.title,
+            'title_html': highlight(row.title, query) if row.title else None,
+            'snippet_html': highlight(row.body, query),
+            'score': -row.rank,
+        } for row in rows[:per_page]]
+        return results, len(rows) > per_page
+
+
+search_index = SearchIndex()
@@ -0,0 +1,60 @@
+"""읽기 전용 DB 스냅샷 (서버리스 배포용)
+
+운영 DB 를 VACUUM INTO 로 복사한 뒤 게시된 공지사항과 공개 문의/답변만
+남기고 문의자 연락처를 지운 단일 SQLite 파일을 만든다. 검색 색인과 대시보드
+집계도 함께 복사되며 삭제 시 트리거가 그대로 정리한다.
+
+서버리스 함수는 이 파일을 immutable 모드로 열어 잠금/저널 없이 읽는다.
+엔진(연결 풀)은 인스턴스가 살아 있는 동안 재사용되고 첫 쿼리 때 연결된다.
+"""
+import os
+import sqlite3
+from urllib.parse import quote
+
+from search import ngrams
+
+PRUNE = [
+    'DELETE FROM notice WHERE is_published IS NOT 1',
+    'DELETE FROM inquiry_answer WHERE inquiry_id IN (SELECT id FROM inquiry WHERE is_public IS NOT 1)',
+    'DELETE FROM inquiry WHERE is_public IS NOT 1',
+    "UPDATE inquiry SET email = '', phone = ''",
+]
+
+
+def uri(path):
+    """스냅샷 파일 -> 읽기 전용(immutable) SQLAlchemy URI"""
+    return f'sqlite:///file:{quote(os.path.abspath(path))}?mode=ro&immutable=1&uri=true'
+
+
+def build(source_path, target_path):
+    """source_path DB 에서 공개 데이터만 담은 스냅샷을 만들고 크기(bytes)를 반환"""
+    os.makedirs(os.path.dirname(os.path.abspath(target_path)), exist_ok=True)
+    tmp_path = target_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    source = sqlite3.connect(source_path)
+    try:
+        # WAL 에 남은 변경까지 포함한 일관된 복사본
+        source.execute('VACUUM INTO ?', (tmp_path,))
+    finally:
+        source.close()
+
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        conn.create_function('search_ngrams', 1, ngrams, deterministic=True)
+        conn.execute('BEGIN')
+        for stmt in PRUNE:
+            conn.execute(stmt)
+        conn.execute('COMMIT')
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if 'search_index' in tables:
+            conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.execute('ANALYZE')
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, target_path)
+    return os.path.getsize(target_path)
@@ -0,0 +1,184 @@
+"""공개 페이지 사전 렌더링 (nginx 가 직접 서빙하는 정적 HTML)
+
+랜딩/서비스/회사 소개/홈, 공지 목록 첫 페이지와 게시된 공지 상세를 앱의 뷰로
+렌더링해 STATIC_EXPORT_DIR 에 `<경로>/index.html` 로 저장한다. nginx 는 세션 쿠키와
+쿼리 문자열이 없는 GET 요청에 대해 try_files 로 이 파일을 먼저 찾고, 없으면 앱으로
+넘긴다 (nginx.conf). 관리자/flash 메시지가 있는 요청은 항상 앱이 렌더링한다.
+
+- 전체: `flask static-export` (배포 시 init-db 다음에 한 번, 템플릿 변경 반영)
+- 증분: 관리자 쓰기 라우트가 notices_changed(ids) 를 호출하면 해당 공지 상세와
+  목록/홈만 워커의 백그라운드 스레드에서 다시 만든다 (비공개/삭제된 공지는 파일 삭제).
+  새 이미지를 올린 경우 이미지 파생본/manifest 생성이 끝난 뒤에 다시 만든다.
+  내보내기 디렉터리가 없으면(내보내기를 쓰지 않는 배포) 아무것도 하지 않는다.
+
+페이지마다 gzip 사본(index.html.gz)도 만들어 nginx 가 gzip_static 으로 매 요청 압축 없이
+보낸다. 파일은 임시 파일에 쓴 뒤 rename 하므로 nginx 가 반쯤 쓰인 파일을 읽지 않으며,
+여러 워커의 재생성은 파일 락으로 순서대로 실행되어 마지막 작업이 최신 DB 상태를 쓴다.
+정적 파일로 나간 공지 상세는 앱을 거치지 않으므로 조회수는 페이지의 sendBeacon
+(POST /api/notices/<id>/view)으로 기록하며, 표시되는 조회수는 마지막 렌더링 시점 값이다.
+"""
+import gzip
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import request
+
+from images import _FileLock
+from page_cache import BYPASS_ENVIRON
+
+logger = logging.getLogger(__name__)
+
+PRERENDER_ENVIRON = 'blh.prerender'
+# 공지와 무관한 페이지 + 게시된 공지 목록에 따라 바뀌는 페이지
+STATIC_PAGES = ('/', '/services', '/about')
+NOTICE_LIST_PAGES = ('/home', '/notices')
+INDEX_FILE = 'index.html'
+
+
+def prerendering():
+    """현재 요청이 사전 렌더링인지 (조회수 기록/비콘 출력 판단용)"""
+    return bool(request) and bool(request.environ.get(PRERENDER_ENVIRON))
+
+
+class StaticExport:
+    """정적 HTML 내보내기 + 공지 변경 시 증분 재생성"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.directory = None
+        self.enabled = True
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def init_app(self, app, db):
+        app.config.setdefault('STATIC_EXPORT_DIR', os.getenv(
+            'STATIC_EXPORT_DIR', os.path.join(app.instance_path, 'static_export')))
+        # 읽기 전용 배포는 공지가 바뀌지 않으므로 재생성하지 않음
+        app.config.setdefault('STATIC_EXPORT_ENABLED', not app.config.get('DATABASE_READ_ONLY', False))
+        self.app = app
+        self.db = db
+        self.directory = app.config['STATIC_EXPORT_DIR']
+        self.enabled = app.config['STATIC_EXPORT_ENABLED']
+        app.context_processor(lambda: {'prerendered': prerendering()})
+
+    @property
+    def active(self):
+        """내보내기를 한 번이라도 만든 배포인지"""
+        return self.enabled and os.path.isdir(self.directory)
+
+    # 렌더링 ---------------------------------------------------------------
+
+    def _path(self, url_path):
+        rel = url_path.strip('/')
+        return os.path.join(self.directory, rel, INDEX_FILE) if rel else os.path.join(self.directory, INDEX_FILE)
+
+    def export_page(self, client, url_path):
+        """한 페이지를 렌더링해 저장 (200 이 아니면 기존 파일 삭제), 저장 여부 반환"""
+        response = client.get(url_path, environ_overrides={PRERENDER_ENVIRON: True, BYPASS_ENVIRON: True})
+        path = self._path(url_path)
+        if response.status_code != 200 or response.mimetype != 'text/html':
+            _unlink(path)
+            _unlink(path + '.gz')
+            if os.path.dirname(path) != self.directory:
+                _prune_empty_dirs(os.path.dirname(path), keep_root=False)
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        body = response.get_data()
+        _write_atomic(path + '.gz', gzip.compress(body, 9, mtime=0))
+        _write_atomic(path, body)
+        return True
+
+    def _published_ids(self):
+        from models import Notice
+        return [row[0] for row in self.db.session.query(Notice.id).filter(Notice.is_published == True)]
+
+    def build(self):
+        """전체 내보내기 후 더 이상 없는 페이지 파일 삭제, 저장한 페이지 수 반환"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._file_lock(), self.app.app_context():
+            paths = list(STATIC_PAGES + NOTICE_LIST_PAGES)
+            paths += [f'/notices/{notice_id}' for notice_id in self._published_ids()]
+            client = self.app.test_client()
+            written = {self._path(p) for p in paths if self.export_page(client, p)}
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if path not in written and path.removesuffix('.gz') not in written:
+                        _unlink(path)
+            _prune_empty_dirs(self.directory)
+        return len(written)
+
+    def regenerate(self, notice_ids=()):
+        """공지 목록 페이지와 지정한 공지 상세만 다시 렌더링"""
+        with self._file_lock(), self.app.app_context():
+            client = self.app.test_client()
+            for url_path in NOTICE_LIST_PAGES + tuple(f'/notices/{i}' for i in notice_ids):
+                self.export_page(client, url_path)
+
+    # 증분 재생성 -----------------------------------------------------------
+
+    def notices_changed(self, notice_ids=(), after=None):
+        """관리자 쓰기(커밋 후)에서 호출, 재생성은 백그라운드에서 실행
+
+        after 는 새 업로드 이미지의 파생본 Future — 파생본과 manifest 가 기록된 뒤에
+        렌더링해야 정적 HTML 에 srcset 이 들어가므로 그 Future 가 끝난 다음 재생성한다.
+        """
+        if not self.active:
+            return None
+        ids = sorted(set(notice_ids))
+        if after is not None:
+            after.add_done_callback(lambda _: self.notices_changed(ids))
+            return None
+        return self._get_executor().submit(self._regenerate_safely, ids)
+
+    def _regenerate_safely(self, notice_ids):
+        try:
+            self.regenerate(notice_ids)
+        except Exception:
+            logger.exception('static export regeneration failed: %s', notice_ids)
+
+    def _get_executor(self):
+        # fork 이후에는 워커마다 새로 만든다
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            with self._lock:
+                if self._executor is None or self._pid != pid:
+                    self._pid = pid
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='static-export')
+        return self._executor
+
+    def _file_lock(self):
+        return _FileLock(self.directory.rstrip(os.sep) + '.lock')
+
+
+def _write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    # nginx 워커가 읽을 수 있도록
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def _unlink(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _prune_empty_dirs(root, keep_root=True):
+    for path, _, _ in os.walk(root, topdown=False):
+        if (path != root or not keep_root) and not os.listdir(path):
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+
+static_export = StaticExport()
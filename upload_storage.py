@@ -0,0 +1,338 @@
+"""업로드 파일 저장소 (내용 주소 기반 + 참조 계수 + 백그라운드 GC)
+
+업로드 스트림을 64KB 씩 임시 파일로 쓰면서 sha256 을 계산하고, 파일을
+`uploads/blobs/<해시 앞 2자리>/<sha256>.<확장자>` 키로 저장한다. 같은 이미지를
+다시 올리면 기존 파일을 그대로 쓰므로 한 번만 저장되며, 키가 내용으로 정해지므로
+URL 은 1년 immutable 로 캐시된다 (assets.py, nginx.conf).
+
+upload_blob 테이블(마이그레이션 6)이 키별 참조 수를 갖고, notice.image_url 의
+INSERT·DELETE·UPDATE 트리거가 같은 트랜잭션 안에서 참조 수를 갱신한다 (일괄 삭제 포함,
+쓰기 경로에서 파일을 지우지 않음). 참조가 0 이 된 뒤 UPLOAD_GC_GRACE 초가 지난 파일은
+워커의 백그라운드 스레드가 UPLOAD_GC_INTERVAL 마다 지우며, on_delete 로 이미지
+파생본과 manifest 항목도 함께 지운다. 업로드 직후 공지 저장 전의 파일도 같은 유예
+시간 동안 보호된다.
+
+백엔드
+- FileSystemBackend: static/ 아래 디렉터리 (기본값, 이미지 파생본 생성 가능)
+- S3Backend: S3 호환 객체 저장소 (로컬 개발은 MinIO 등, boto3 필요)
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from flask import url_for
+
+from db_profile import run_exclusive
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = 'uploads/blobs'
+CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# 같은 형식이 확장자만 달라 두 번 저장되지 않도록
+EXTENSION_ALIASES = {'jpeg': 'jpg'}
+
+RECOUNT = """UPDATE upload_blob SET refcount = (
+        SELECT count(*) FROM notice WHERE notice.image_url = upload_blob.key)"""
+
+
+def is_blob_key(key):
+    return bool(key) and key.startswith(BLOB_PREFIX + '/')
+
+
+class FileSystemBackend:
+    """static 폴더 아래 파일 (Flask/nginx 가 직접 서빙)"""
+
+    local = True
+
+    def __init__(self, root):
+        self.root = root
+        self.spool_dir = os.path.join(root, BLOB_PREFIX)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def put(self, key, source, content_type):
+        """임시 파일 source 를 key 위치로 이동 (같은 파일시스템이라 원자적)"""
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # mkstemp 는 0600 으로 만들므로 정적 파일 권한으로 바꿈
+        os.chmod(source, 0o644)
+        os.replace(source, target)
+
+    def delete(self, key):
+        path = self.path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        # 비어 있는 해시 접두사 디렉터리 정리
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+    def url(self, key):
+        return url_for('static', filename=key)
+
+
+class S3Backend:
+    """S3 호환 객체 저장소 (boto3 는 처음 사용할 때 import)"""
+
+    local = False
+    spool_dir = None
+
+    def __init__(self, bucket, endpoint_url=None, public_url=None, region=None):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        # MinIO 등 path-style 엔드포인트는 <endpoint>/<bucket>/<key> 로 공개
+        self.public_url = (public_url or f'{endpoint_url or "https://s3.amazonaws.com"}/{bucket}').rstrip('/')
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+                    self._client = boto3.client('s3', endpoint_url=self.endpoint_url, region_name=self.region)
+        return self._client
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def put(self, key, source, content_type):
+        extra = {'CacheControl': CACHE_CONTROL}
+        if content_type:
+            extra['ContentType'] = content_type
+        try:
+            self.client.upload_file(source, self.bucket, key, ExtraArgs=extra)
+        finally:
+            os.remove(source)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key):
+        return f'{self.public_url}/{key}'
+
+
+class UploadStorage:
+    """업로드 저장 + 참조 계수 + 고아 파일 GC"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.backend = None
+        self.gc_enabled = True
+        self.gc_interval = 3600.0
+        self.gc_grace = 3600
+        self.gc_batch = 500
+        self.on_delete = None
+        self.on_change = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db, on_delete=None, on_change=None):
+        """on_delete(keys) 는 GC 가 파일을 지울 때, on_change(keys, notice_ids) 는
+        import_legacy 가 공지의 이미지 키를 바꾼 뒤 호출된다"""
+        app.config.setdefault('UPLOAD_BACKEND', os.getenv('UPLOAD_BACKEND', 'filesystem'))
+        app.config.setdefault('UPLOAD_S3_BUCKET', os.getenv('UPLOAD_S3_BUCKET'))
+        app.config.setdefault('UPLOAD_S3_ENDPOINT_URL', os.getenv('UPLOAD_S3_ENDPOINT_URL'))
+        app.config.setdefault('UPLOAD_S3_PUBLIC_URL', os.getenv('UPLOAD_S3_PUBLIC_URL'))
+        app.config.setdefault('UPLOAD_S3_REGION', os.getenv('UPLOAD_S3_REGION'))
+        # 읽기 전용 배포에서는 GC 하지 않음
+        app.config.setdefault('UPLOAD_GC_ENABLED', not app.config.get('DATABASE_READ_ONLY', False))
+        app.config.setdefault('UPLOAD_GC_INTERVAL', 3600.0)
+        app.config.setdefault('UPLOAD_GC_GRACE', 3600)
+        app.config.setdefault('UPLOAD_GC_BATCH', 500)
+        self.app = app
+        self.db = db
+        self.gc_enabled = app.config['UPLOAD_GC_ENABLED']
+        self.gc_interval = float(app.config['UPLOAD_GC_INTERVAL'])
+        self.gc_grace = int(app.config['UPLOAD_GC_GRACE'])
+        self.gc_batch = int(app.config['UPLOAD_GC_BATCH'])
+        self.on_delete = on_delete
+        self.on_change = on_change
+
+        if app.config['UPLOAD_BACKEND'] == 's3':
+            self.backend = S3Backend(app.config['UPLOAD_S3_BUCKET'],
+                                     endpoint_url=app.config['UPLOAD_S3_ENDPOINT_URL'],
+                                     public_url=app.config['UPLOAD_S3_PUBLIC_URL'],
+                                     region=app.config['UPLOAD_S3_REGION'])
+        else:
+            self.backend = FileSystemBackend(app.static_folder)
+
+        app.jinja_env.globals['upload_url'] = self.url
+        if self.gc_enabled:
+            # 워커마다 첫 요청 때 GC 스레드 시작 (fork 전 시작하지 않도록)
+            app.before_request(self._ensure_thread)
+
+    @property
+    def local(self):
+        """파일이 static 폴더에 있는지 (이미지 파생본 생성 가능 여부)"""
+        return self.backend.local
+
+    def url(self, key):
+        """업로드 키(또는 static 상대 경로)의 공개 URL"""
+        if is_blob_key(key):
+            return self.backend.url(key)
+        return url_for('static', filename=key)
+
+    # 저장 -----------------------------------------------------------------
+
+    def save(self, stream, filename):
+        """스트림을 해시하며 저장하고 키 반환 (같은 내용이 있으면 기존 파일 사용)
+
+        반환한 키는 UPLOAD_GC_GRACE 안에 notice.image_url 로 참조해야 한다.
+        """
+        ext = os.path.splitext(filename)[1].lstrip('.').lower()
+        ext = EXTENSION_ALIASES.get(ext, ext)
+        if self.backend.spool_dir:
+            os.makedirs(self.backend.spool_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.backend.spool_dir, suffix='.part')
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            hexdigest = digest.hexdigest()
+            name = f'{hexdigest}.{ext}' if ext else hexdigest
+            key = f'{BLOB_PREFIX}/{hexdigest[:2]}/{name}'
+            content_type = mimetypes.guess_type(key)[0]
+
+            # 행을 먼저 기록(또는 유예 시간 갱신)해 GC 가 사이에 파일을 지우지 못하게 함
+            self._register(key, size, content_type)
+            if self.backend.exists(key):
+                os.remove(tmp)
+            else:
+                self.backend.put(key, tmp, content_type)
+            return key
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _register(self, key, size, content_type):
+        def upsert(conn):
+            conn.execute(
+                'INSERT INTO upload_blob (key, size, content_type) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET released_at = CURRENT_TIMESTAMP',
+                (key, size, content_type))
+        with self.app.app_context():
+            run_exclusive(self.db.engine, upsert)
+
+    # GC -------------------------------------------------------------------
+
+    def collect_garbage(self, grace=None):
+        """참조가 없고 유예 시간이 지난 파일 삭제, 삭제 수 반환
+
+        행 삭제와 파일(파생본 포함) 삭제를 같은 쓰기 잠금 안에서 해, 동시에 같은
+        내용을 업로드하는 요청은 GC 가 끝난 뒤 파일과 파생본을 다시 만든다.
+        """
+        grace = self.gc_grace if grace is None else grace
+
+        def sweep(conn):
+            keys = [row[0] for row in conn.execute(
+                "SELECT key FROM upload_blob WHERE refcount <= 0 AND released_at <= datetime('now', ?) "
+                'LIMIT ?', (f'-{int(grace)} seconds', self.gc_batch))]
+            for key in keys:
+                self.backend.delete(key)
+                conn.execute('DELETE FROM upload_blob WHERE key = ?', (key,))
+            if keys and self.on_delete is not None:
+                self.on_delete(keys)
+            return len(keys)
+
+        total = 0
+        with self.app.app_context():
+            while True:
+                deleted = run_exclusive(self.db.engine, sweep)
+                total += deleted
+                if deleted < self.gc_batch:
+                    return total
+
+    def recount(self):
+        """참조 수 재계산 (트리거 밖에서 notice 가 바뀐 경우)"""
+        run_exclusive(self.db.engine, lambda conn: conn.execute(RECOUNT))
+
+    def import_legacy(self, delete_originals=False):
+        """내용 주소 저장 이전의 업로드(uploads/<시각>_<이름>)를 저장소로 옮김
+
+        옮긴 공지는 updated_at 을 갱신하고 on_change 로 파생본/캐시/사전 렌더링을
+        다시 만들게 한다. -> (새 키 목록, 찾지 못한 경로 목록)
+        """
+        root = self.app.static_folder
+        rows = self.db.session.execute(self.db.text(
+            'SELECT DISTINCT image_url FROM notice WHERE image_url IS NOT NULL')).fetchall()
+        keys, missing, notice_ids = [], [], []
+        for (image_url,) in rows:
+            if is_blob_key(image_url):
+                continue
+            path = os.path.join(root, image_url)
+            if not os.path.isfile(path):
+                missing.append(image_url)
+                continue
+            with open(path, 'rb') as f:
+                key = self.save(f, image_url)
+
+            def move(conn):
+                ids = [row[0] for row in conn.execute('SELECT id FROM notice WHERE image_url = ?', (image_url,))]
+                # 조건부 GET 검증자/사전 렌더링이 바뀐 이미지 URL 을 반영하도록
+                conn.execute('UPDATE notice SET image_url = ?, updated_at = ? WHERE image_url = ?',
+                             (key, datetime.utcnow().isoformat(' '), image_url))
+                return ids
+            notice_ids += run_exclusive(self.db.engine, move)
+            if delete_originals:
+                os.remove(path)
+            keys.append(key)
+        if keys and self.on_change is not None:
+            self.on_change(keys, notice_ids)
+        return keys, missing
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='upload-gc', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.gc_interval)
+            try:
+                deleted = self.collect_garbage()
+                if deleted:
+                    logger.info('upload gc removed %d blobs', deleted)
+            except Exception:
+                logger.exception('upload gc failed')
+
+
+upload_storage = UploadStorage()
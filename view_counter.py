@@ -0,0 +1,108 @@
+"""조회수 지연 기록 (write-behind)
+
+공지사항 조회 시마다 커밋하는 대신 워커 메모리에 증가분을 모아 두고,
+주기적으로(또는 누적량이 임계치를 넘으면) 백그라운드 스레드가
+`UPDATE ... SET view_count = view_count + ?` 를 한 트랜잭션으로 일괄 실행한다.
+"""
+import atexit
+import logging
+import os
+import threading
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """notice.view_count 증가분 버퍼"""
+
+    def __init__(self, table='notice', column='view_count'):
+        self._sql = text(f'UPDATE {table} SET {column} = {column} + :n WHERE id = :id')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._total = 0
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.app = None
+        self.db = None
+        self.enabled = True
+        self.interval = 10.0
+        self.threshold = 100
+
+    def init_app(self, app, db):
+        app.config.setdefault('VIEW_COUNT_FLUSH_INTERVAL', 10.0)
+        app.config.setdefault('VIEW_COUNT_FLUSH_THRESHOLD', 100)
+        # 읽기 전용 DB(스냅샷)에서는 조회수를 기록하지 않는다
+        app.config.setdefault('VIEW_COUNT_ENABLED', True)
+        self.app = app
+        self.db = db
+        self.enabled = app.config['VIEW_COUNT_ENABLED']
+        self.interval = float(app.config['VIEW_COUNT_FLUSH_INTERVAL'])
+        self.threshold = int(app.config['VIEW_COUNT_FLUSH_THRESHOLD'])
+        # 워커 종료 시 남은 증가분 기록
+        atexit.register(self.flush)
+
+    def increment(self, notice_id, n=1):
+        """조회수 증가 (DB 쓰기 없음)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending[notice_id] = self._pending.get(notice_id, 0) + n
+            self._total += n
+            over_threshold = self._total >= self.threshold
+        self._ensure_thread()
+        if over_threshold:
+            self._wakeup.set()
+
+    def pending(self, notice_id):
+        """아직 DB에 기록되지 않은 증가분"""
+        with self._lock:
+            return self._pending.get(notice_id, 0)
+
+    def live_count(self, notice):
+        """DB 값 + 미기록 증가분 (근사치, 다른 워커의 버퍼는 포함되지 않음)"""
+        return (notice.view_count or 0) + self.pending(notice.id)
+
+    def flush(self):
+        """버퍼의 증가분을 한 트랜잭션으로 기록하고 기록된 행 수를 반환"""
+        with self._lock:
+            batch, self._pending, self._total = self._pending, {}, 0
+        if not batch or self.app is None:
+            return 0
+        params = [{'id': notice_id, 'n': n} for notice_id, n in batch.items()]
+        try:
+            with self.app.app_context():
+                with self.db.engine.begin() as conn:
+                    conn.execute(self._sql, params)
+        except Exception:
+            # 실패한 증가분은 버퍼로 되돌려 다음 주기에 재시도
+            logger.exception('view count flush failed (%d notices)', len(batch))
+            with self._lock:
+                for notice_id, n in batch.items():
+                    self._pending[notice_id] = self._pending.get(notice_id, 0) + n
+                    self._total += n
+            return 0
+        return len(params)
+
+    def _ensure_thread(self):
+        # fork 이후(gunicorn --preload 등)에는 워커마다 스레드를 새로 띄운다
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+view_counter = ViewCounter()
@@ -0,0 +1,708 @@
+"""라우트
+
+뷰 함수는 모듈 수준에서 정의하고 create_app() 이 init_app(app) 으로 등록한다.
+블루프린트 대신 간단한 등록 목록을 쓰는 것은 템플릿의 url_for('notices') 등
+엔드포인트 이름을 그대로 유지하기 위해서이다.
+"""
+from flask import (current_app, render_template, request, jsonify, redirect, url_for, session, flash, Response,
+                   make_response, stream_with_context, g)
+from datetime import datetime
+import os
+import json
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import selectinload
+from pagination import keyset_paginate, encode_cursor
+from view_counter import view_counter
+from page_cache import page_cache
+from conditional import conditional, make_etag, template_version
+from images import image_pipeline
+from assets import assets
+from inquiry_queue import inquiry_queue, QueueFull
+from db_profile import commit_with_retry
+from search import search_index
+from dashboard_stats import dashboard_stats
+from upload_storage import upload_storage
+from rate_limit import rate_limiter
+from compression import compressor
+from static_export import static_export, prerendering
+from models import db, Notice, Inquiry, InquiryAnswer, NOTICE_FEED_KEYS, INQUIRY_FEED_KEYS, notice_to_dict, build_inquiry
+import bulk_actions
+import inquiry_export
+import inquiry_forward
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+MAX_API_PAGE_SIZE = 100
+MAX_SEARCH_PAGE = 50
+
+# 읽기 전용(스냅샷) 배포에서 막는 관리자 쓰기 엔드포인트
+ADMIN_WRITE_ENDPOINTS = {'admin_notice_new', 'admin_notice_edit', 'admin_notice_delete', 'admin_inquiry_detail',
+                         'admin_inquiries_bulk', 'admin_notices_bulk', 'api_admin_bulk'}
+
+# 일괄 처리 API 경로 -> bulk_actions 대상
+BULK_API_TARGETS = {'inquiries': 'inquiry', 'notices': 'notice'}
+
+_routes = []
+_error_handlers = []
+
+# 조건부 GET 검증자용 템플릿/자산 해시 (첫 요청 때 계산)
+_template_version = None
+
+def route(rule, **options):
+    """app.route 와 같은 데코레이터 (등록은 init_app 에서)"""
+    def decorator(view_func):
+        _routes.append((rule, view_func, options))
+        return view_func
+    return decorator
+
+def errorhandler(code):
+    def decorator(handler):
+        _error_handlers.append((code, handler))
+        return handler
+    return decorator
+
+def init_app(app):
+    for rule, view_func, options in _routes:
+        app.add_url_rule(rule, view_func.__name__, view_func, **options)
+    for code, handler in _error_handlers:
+        app.register_error_handler(code, handler)
+    app.before_request(enforce_rate_limits)
+    app.before_request(reject_read_only_writes)
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def save_image_upload():
+    """폼의 image 파일을 업로드 저장소에 저장하고 키 반환 (없으면 None)"""
+    file = request.files.get('image')
+    if not file or file.filename == '' or not allowed_file(file.filename):
+        return None
+    image_url = upload_storage.save(file.stream, file.filename)
+    # 리사이즈/WebP 파생본은 백그라운드에서 생성 (같은 내용이면 기존 파생본 사용)
+    # 사전 렌더링은 파생본과 manifest 가 생긴 뒤에 해야 하므로 Future 를 남겨 둔다
+    if upload_storage.local:
+        g.image_future = image_pipeline.submit(image_url)
+    return image_url
+
+def notices_changed(*notice_ids):
+    """공지 변경(커밋 후): 페이지 캐시 무효화 + 사전 렌더링 파일 재생성"""
+    page_cache.invalidate()
+    static_export.notices_changed(notice_ids, after=g.pop('image_future', None))
+
+def reject_read_only_writes():
+    """스냅샷으로 동작하는 배포에서는 관리자 수정 요청을 거절"""
+    if (current_app.config['DATABASE_READ_ONLY'] and request.method == 'POST'
+            and request.endpoint in ADMIN_WRITE_ENDPOINTS):
+        if request.path.startswith('/api/'):
+            return jsonify({'success': False, 'message': '읽기 전용 배포입니다.'}), 403
+        flash('읽기 전용 배포입니다. 수정은 원본 서버의 관리자 페이지에서 해주세요.', 'error')
+        return redirect(request.referrer or url_for('admin_dashboard'))
+
+def enforce_rate_limits():
+    """문의 접수 / 관리자 로그인 시도 횟수 제한 (rate_limit.RATE_LIMITS)"""
+    allowed, retry_after = rate_limiter.check(request)
+    if allowed:
+        return None
+    if request.is_json or request.path.startswith('/api/'):
+        response = jsonify({'error': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.', 'retry_after': retry_after})
+    else:
+        flash(f'요청이 너무 많습니다. {retry_after}초 후 다시 시도해주세요.', 'error')
+        response = make_response(render_template('admin/login.html') if request.endpoint == 'admin_login'
+                                 else redirect(request.referrer or url_for('landing')))
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def template_versions():
+    """(템플릿 + 정적 자산 해시, 템플릿 최종 수정 시각)"""
+    global _template_version
+    if _template_version is None:
+        version, mtime = template_version(os.path.join(current_app.root_path, current_app.template_folder))
+        # 정적 자산 지문이 바뀌면 HTML도 바뀌므로 함께 반영
+        _template_version = make_etag(version, assets.version()), mtime
+    return _template_version
+
+def latest(*values):
+    return max(v for v in values if v is not None)
+
+def static_page_validator():
+    """템플릿만으로 구성된 페이지"""
+    version, mtime = template_versions()
+    return make_etag(version), mtime
+
+def notices_validator():
+    """게시된 공지사항 수 + 최종 수정 시각
+
+    max(updated_at) 은 삭제/비공개 전환 때 줄어들 수 있으므로 Last-Modified 에는
+    공지 변경마다 갱신되는 페이지 캐시 세대 시각도 함께 반영한다.
+    """
+    count, last_updated = db.session.query(
+        func.count(Notice.id), func.max(Notice.updated_at)
+    ).filter(Notice.is_published == True).one()
+    version, mtime = template_versions()
+    return make_etag(version, count, last_updated), latest(last_updated, page_cache.last_changed(), mtime)
+
+def notice_validator(notice_id):
+    """개별 공지사항 수정 시각 (비공개/없는 공지는 검증 생략)"""
+    row = db.session.query(Notice.updated_at, Notice.is_published).filter(Notice.id == notice_id).first()
+    if row is None or not row.is_published:
+        return None
+    version, mtime = template_versions()
+    return make_etag(version, notice_id, row.updated_at), latest(row.updated_at, mtime)
+
+def contact_validator():
+    """공개 문의 수/처리 상태 + 답변 수"""
+    count, last_id, processed = db.session.query(
+        func.count(Inquiry.id), func.max(Inquiry.id), func.sum(Inquiry.is_processed)
+    ).filter(Inquiry.is_public == True).one()
+    answer_count, last_answer_id = db.session.query(
+        func.count(InquiryAnswer.id), func.max(InquiryAnswer.id)
+    ).one()
+    return make_etag(template_versions()[0], count, last_id, processed, answer_count, last_answer_id), None
+
+# Routes
+@route('/')
+@conditional(static_page_validator)
+@page_cache.cached()
+def landing():
+    """랜딩 페이지"""
+    return render_template('landing.html')
+
+@route('/home')
+@conditional(notices_validator)
+@page_cache.cached()
+def home():
+    """홈페이지"""
+    latest_notices = Notice.query.filter_by(is_published=True).order_by(Notice.priority.desc(), Notice.created_at.desc()).limit(3).all()
+    return render_template('home.html', latest_notices=latest_notices)
+
+@route('/landing')
+def landing_alias():
+    """랜딩 페이지 별칭"""
+    return redirect(url_for('landing'))
+
+@route('/services')
+@conditional(static_page_validator)
+@page_cache.cached()
+def services():
+    """서비스 소개"""
+    return render_template('services.html')
+
+@route('/about')
+@conditional(static_page_validator)
+@page_cache.cached()
+def about():
+    """회사 소개"""
+    return render_template('about.html')
+
+@route('/contact')
+@conditional(contact_validator)
+@page_cache.cached()
+def contact():
+    """문의하기"""
+    # 현재 페이지 문의의 답변만 IN 쿼리 한 번으로 함께 로드
+    page = keyset_paginate(
+        Inquiry.query.filter_by(is_public=True).options(selectinload(Inquiry.answers)),
+        INQUIRY_FEED_KEYS,
+        after=request.args.get('after'),
+        per_page=current_app.config['INQUIRIES_PER_PAGE']
+    )
+    return render_template('contact.html', inquiries=page.items, page=page)
+
+@route('/contact/inquiries/<int:inquiry_id>')
+def contact_inquiry(inquiry_id):
+    """공개 문의 고유 링크: 그 문의가 맨 위에 오는 문의 게시판 페이지로 이동 (검색 결과 등)"""
+    inquiry = Inquiry.query.filter_by(id=inquiry_id, is_public=True).first_or_404()
+    # 게시판 정렬(created_at DESC, id DESC)에서 바로 앞 문의의 키가 이 문의 페이지의 커서
+    previous = db.session.query(Inquiry.created_at, Inquiry.id).filter(
+        Inquiry.is_public == True,
+        tuple_(Inquiry.created_at, Inquiry.id) > tuple_(inquiry.created_at, inquiry.id)
+    ).order_by(Inquiry.created_at, Inquiry.id).first()
+    after = encode_cursor([previous.created_at, previous.id]) if previous else None
+    return redirect(url_for('contact', after=after, _anchor=f'inquiry-{inquiry_id}'))
+
+@route('/notices')
+@conditional(notices_validator)
+@page_cache.cached()
+def notices():
+    """공지사항 목록"""
+    page = keyset_paginate(
+        Notice.query.filter_by(is_published=True),
+        NOTICE_FEED_KEYS,
+        after=request.args.get('after'),
+        per_page=current_app.config['NOTICES_PER_PAGE']
+    )
+    return render_template('notices.html', notices=page.items, page=page)
+
+def count_notice_view(notice_id):
+    # 사전 렌더링은 방문이 아님 (정적 페이지의 조회는 비콘으로 기록)
+    if not prerendering():
+        view_counter.increment(notice_id)
+
+@route('/api/notices/<int:notice_id>/view', methods=['POST'])
+def api_notice_view(notice_id):
+    """사전 렌더링된 공지 상세의 조회수 비콘"""
+    count_notice_view(notice_id)
+    return '', 204
+
+@route('/notices/<int:notice_id>')
+@conditional(notice_validator, on_not_modified=count_notice_view)
+@page_cache.cached(on_hit=count_notice_view)
+def notice_detail(notice_id):
+    """공지사항 상세"""
+    notice = Notice.query.get_or_404(notice_id)
+    if notice.is_published:
+        # 조회수는 버퍼에 모았다가 백그라운드에서 일괄 기록
+        count_notice_view(notice.id)
+        return render_template('notice_detail.html', notice=notice,
+                               view_count=view_counter.live_count(notice))
+    else:
+        flash('해당 공지사항을 찾을 수 없습니다.', 'error')
+        return redirect(url_for('notices'))
+
+@route('/search')
+def search():
+    """공지사항/문의 검색"""
+    query = request.args.get('q', '').strip()
+    type_ = request.args.get('type') or None
+    page = max(1, min(request.args.get('page', 1, type=int), MAX_SEARCH_PAGE))
+    results, has_next = search_index.search(query, type_=type_, page=page,
+                                            per_page=current_app.config['SEARCH_PER_PAGE'])
+    return render_template('search.html', query=query, type_=type_, page=page,
+                           results=results, has_next=has_next)
+
+# API Endpoints
+@route('/health')
+def health():
+    """헬스체크"""
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.utcnow().isoformat(),
+        'version': '1.0.0'
+    })
+
+@route('/api/cache-stats')
+def api_cache_stats():
+    """페이지 캐시 히트/미스/제거 카운터, 응답 압축 통계 (워커 단위)"""
+    return jsonify(dict(page_cache.stats(), compression=compressor.stats()))
+
+@route('/api/test')
+def api_test():
+    """Vercel 테스트 엔드포인트"""
+    return jsonify({
+        'message': 'BLH Company API is working!',
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@route('/test')
+def test():
+    """배포 확인용 테스트 라우트"""
+    return jsonify({
+        'test': 'success',
+        'message': 'Test route is working!',
+        'read_only': current_app.config['DATABASE_READ_ONLY']
+    })
+
+@route('/api/inquiry', methods=['POST'])
+def api_inquiry():
+    """문의하기 API"""
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'JSON object is required'}), 400
+        
+        # 필수 필드 검증
+        required_fields = ['name', 'email', 'message']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'error': f'{field} is required'}), 400
+        
+        fields = required_fields + ['phone', 'company', 'service_interest', 'is_public']
+        # 형식이 틀린 값이 큐에 들어가 소비자에서 실패하지 않도록 여기서 거절
+        for field in fields[:-1]:
+            if data.get(field) is not None and not isinstance(data[field], str):
+                return jsonify({'error': f'{field} must be a string'}), 400
+        if data.get('is_public') is not None and not isinstance(data['is_public'], bool):
+            return jsonify({'error': 'is_public must be a boolean'}), 400
+        
+        # 읽기 전용 배포: 설정된 저장소(원본 서버 등)로 전달
+        if current_app.config['DATABASE_READ_ONLY']:
+            forward_url = current_app.config['INQUIRY_FORWARD_URL']
+            if not forward_url:
+                return jsonify({'error': '현재 문의 접수를 받을 수 없습니다.'}), 503
+            try:
+                status, body, retry_after = inquiry_forward.forward(
+                    forward_url, {f: data.get(f) for f in fields if f in data})
+            except inquiry_forward.ForwardError:
+                current_app.logger.exception('inquiry forward failed')
+                return jsonify({'error': '문의 접수 서버에 연결할 수 없습니다.'}), 502
+            response = jsonify(body)
+            if retry_after:
+                response.headers['Retry-After'] = retry_after
+            return response, status
+        
+        # 접수 큐에 추가 후 즉시 응답 (DB 저장은 백그라운드에서 일괄 처리)
+        if inquiry_queue.enabled:
+            try:
+                queue_id = inquiry_queue.enqueue({f: data.get(f) for f in fields if f in data})
+            except QueueFull:
+                response = jsonify({'error': '문의 접수가 많아 잠시 후 다시 시도해주세요.'})
+                response.headers['Retry-After'] = '5'
+                return response, 429
+            return jsonify({
+                'message': '문의가 성공적으로 전송되었습니다.',
+                'queue_id': queue_id,
+                'status_url': url_for('api_inquiry_status', queue_id=queue_id)
+            }), 202
+        
+        # 문의 저장
+        inquiry = build_inquiry(data)
+        commit_with_retry(db.session, lambda: db.session.add(inquiry))
+        page_cache.invalidate()
+        
+        return jsonify({
+            'message': '문의가 성공적으로 전송되었습니다.',
+            'inquiry_id': inquiry.id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@route('/api/notices')
+@conditional(notices_validator)
+def api_notices():
+    """공지사항 목록 API (?after= 커서 페이지네이션)"""
+    per_page = request.args.get('limit', current_app.config['NOTICES_PER_PAGE'], type=int)
+    per_page = max(1, min(per_page, MAX_API_PAGE_SIZE))
+    page = keyset_paginate(
+        Notice.query.filter_by(is_published=True),
+        NOTICE_FEED_KEYS,
+        after=request.args.get('after'),
+        per_page=per_page
+    )
+    return jsonify({
+        'notices': [notice_to_dict(n) for n in page.items],
+        'next_cursor': page.next_cursor
+    })
+
+COMPANY_INFO = {
+    'company_name': '비엘에이치컴퍼니 주식회사',
+    'english_name': 'BLH COMPANY',
+    'ceo': '홍독경',
+    'capital': '1억원',
+    'established': '2025년',
+    'address': '부산시 해운대 우동 1436 카이저빌 613호',
+    'phone': '051-711-4929',
+    'fax': '031-715-4929',
+    'email': 'info@blhcompany.com',
+    'business_hours': '평일 09:00-18:00, 토요일 09:00-13:00, 일요일 휴무'
+}
+COMPANY_INFO_ETAG = make_etag(json.dumps(COMPANY_INFO, sort_keys=True))
+
+@route('/api/inquiry/<queue_id>')
+def api_inquiry_status(queue_id):
+    """접수 큐 상태 조회 API"""
+    status = inquiry_queue.status(queue_id) if inquiry_queue.enabled else None
+    if status is None:
+        return jsonify({'error': 'not found'}), 404
+    return jsonify(status)
+
+@route('/api/search')
+def api_search():
+    """검색 API (?q=&type=notice|inquiry&page=)"""
+    query = request.args.get('q', '').strip()
+    page = max(1, min(request.args.get('page', 1, type=int), MAX_SEARCH_PAGE))
+    per_page = max(1, min(request.args.get('limit', current_app.config['SEARCH_PER_PAGE'], type=int), MAX_API_PAGE_SIZE))
+    results, has_next = search_index.search(query, type_=request.args.get('type') or None,
+                                            page=page, per_page=per_page)
+    for r in results:
+        r['title_html'] = str(r['title_html']) if r['title_html'] else None
+        r['snippet_html'] = str(r['snippet_html'])
+    return jsonify({'query': query, 'page': page, 'has_next': has_next, 'results': results})
+
+@route('/api/company-info')
+@conditional(lambda: (COMPANY_INFO_ETAG, None))
+def api_company_info():
+    """회사 정보 조회 API"""
+    return jsonify(COMPANY_INFO)
+
+# Admin Routes
+@route('/admin/login', methods=['GET', 'POST'])
+def admin_login():
+    """관리자 로그인"""
+    if request.method == 'POST':
+        # JSON 또는 Form 모두 지원
+        if request.is_json:
+            payload = request.get_json(silent=True) or {}
+            username = payload.get('username')
+            password = payload.get('password')
+        else:
+            username = request.form.get('username')
+            password = request.form.get('password')
+        
+        if username == current_app.config['ADMIN_USERNAME'] and password == current_app.config['ADMIN_PASSWORD']:
+            session['admin_logged_in'] = True
+            if request.is_json:
+                return jsonify({'success': True, 'message': 'Login success'}), 200
+            flash('관리자로 로그인되었습니다.', 'success')
+            return redirect(url_for('admin_dashboard'))
+        else:
+            if request.is_json:
+                return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
+            flash('잘못된 사용자명 또는 비밀번호입니다.', 'error')
+    
+    return render_template('admin/login.html')
+
+@route('/admin/logout', methods=['GET', 'POST'])
+def admin_logout():
+    """관리자 로그아웃"""
+    session.pop('admin_logged_in', None)
+    flash('로그아웃되었습니다.', 'info')
+    return redirect(url_for('admin_login'))
+
+@route('/admin')
+def admin_root():
+    """관리자 첫 화면"""
+    return redirect(url_for('admin_dashboard'))
+
+@route('/admin/dashboard')
+def admin_dashboard():
+    """관리자 대시보드"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    # 통계 정보 (트리거로 유지되는 집계 테이블에서 한 번에 조회)
+    counters = dashboard_stats.counters()
+    stats = {
+        'total_notices': counters['notices_total'],
+        'published_notices': counters['notices_published'],
+        'total_inquiries': counters['inquiries_total'],
+        'unprocessed_inquiries': counters['inquiries_unprocessed']
+    }
+    rollups = {
+        'daily_inquiries': dashboard_stats.inquiries_per_day(14),
+        'weekly_inquiries': dashboard_stats.inquiries_per_week(8),
+        'top_notices': dashboard_stats.top_notice_views(7),
+    }
+    
+    return render_template('admin/dashboard.html', stats=stats, rollups=rollups)
+
+@route('/admin/notices')
+def admin_notices():
+    """공지사항 관리"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    page = keyset_paginate(
+        Notice.query,
+        NOTICE_FEED_KEYS,
+        after=request.args.get('after'),
+        per_page=current_app.config['ADMIN_NOTICES_PER_PAGE']
+    )
+    return render_template('admin/notices.html', notices=page.items, page=page)
+
+@route('/admin/inquiries')
+def admin_inquiries():
+    """문의사항 관리 목록"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    page = keyset_paginate(
+        Inquiry.query,
+        INQUIRY_FEED_KEYS,
+        after=request.args.get('after'),
+        per_page=current_app.config['ADMIN_INQUIRIES_PER_PAGE']
+    )
+    return render_template('admin/inquiries.html', inquiries=page.items, page=page)
+
+@route('/admin/inquiries/bulk', methods=['POST'])
+def admin_inquiries_bulk():
+    """선택한 문의 일괄 처리 (처리 완료/대기, 공개/비공개, 삭제)"""
+    return admin_bulk_form('inquiry', 'admin_inquiries')
+
+@route('/admin/notices/bulk', methods=['POST'])
+def admin_notices_bulk():
+    """선택한 공지사항 일괄 처리 (게시/비공개, 중요도, 삭제)"""
+    return admin_bulk_form('notice', 'admin_notices')
+
+def admin_bulk_form(target, list_endpoint):
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    try:
+        ids = bulk_actions.parse_form_ids(request.form.getlist('ids'))
+        affected = bulk_actions.run(db.session, target, request.form.get('action'), ids,
+                                    priority=request.form.get('priority'))
+    except bulk_actions.BulkActionError as e:
+        flash(str(e), 'error')
+    else:
+        if target == 'notice':
+            notices_changed(*ids)
+        else:
+            page_cache.invalidate()
+        flash(f'{affected}건을 처리했습니다.', 'success')
+    return redirect(request.referrer or url_for(list_endpoint))
+
+@route('/api/admin/<any(inquiries, notices):target>/bulk', methods=['POST'])
+def api_admin_bulk(target):
+    """일괄 처리 API: {"action": ..., "ids": [...], "priority": n}"""
+    if not session.get('admin_logged_in'):
+        return jsonify({'success': False, 'message': '관리자 로그인이 필요합니다.'}), 401
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'success': False, 'message': 'JSON 객체가 필요합니다.'}), 400
+    try:
+        ids = bulk_actions.parse_ids(payload.get('ids'))
+        affected = bulk_actions.run(db.session, BULK_API_TARGETS[target], payload.get('action'), ids,
+                                    priority=payload.get('priority'))
+    except bulk_actions.BulkActionError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if target == 'notices':
+        notices_changed(*ids)
+    else:
+        page_cache.invalidate()
+    return jsonify({'success': True, 'action': payload.get('action'), 'requested': len(ids), 'affected': affected})
+
+@route('/admin/inquiries/export')
+def admin_inquiries_export():
+    """문의/답변 내보내기 (?format=csv|jsonl&from=&to=&status=&visibility=)"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    fmt = request.args.get('format', 'csv')
+    if fmt not in inquiry_export.FORMATS:
+        return jsonify({'error': 'format 은 csv 또는 jsonl 입니다.'}), 400
+    try:
+        filters = inquiry_export.parse_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    records = inquiry_export.iter_records(db.session, filters,
+                                          batch_size=current_app.config.get('EXPORT_BATCH_SIZE', 1000))
+    filename = f"inquiries-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    return Response(stream_with_context(inquiry_export.chunks(fmt, records)),
+                    content_type=inquiry_export.FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"',
+                             # nginx 가 전체 응답을 버퍼링하지 않고 바로 전달
+                             'X-Accel-Buffering': 'no',
+                             'Cache-Control': 'no-store'})
+
+@route('/admin/inquiries/<int:inq_id>', methods=['GET', 'POST'])
+def admin_inquiry_detail(inq_id):
+    """문의 상세 + 답변 작성"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    inquiry = Inquiry.query.get_or_404(inq_id)
+    if request.method == 'POST':
+        action = request.form.get('action')
+        if action == 'answer':
+            content = request.form.get('content', '').strip()
+            if content:
+                def apply():
+                    inquiry.is_processed = True
+                    db.session.add(InquiryAnswer(inquiry_id=inq_id, content=content, admin_name='관리자'))
+                commit_with_retry(db.session, apply)
+                flash('답변이 등록되었습니다.', 'success')
+        elif action == 'toggle_public':
+            def apply():
+                inquiry.is_public = not inquiry.is_public
+            commit_with_retry(db.session, apply)
+            flash('공개 여부가 변경되었습니다.', 'success')
+        elif action == 'toggle_processed':
+            def apply():
+                inquiry.is_processed = not inquiry.is_processed
+            commit_with_retry(db.session, apply)
+            flash('처리 상태가 변경되었습니다.', 'success')
+        page_cache.invalidate()
+        return redirect(url_for('admin_inquiry_detail', inq_id=inq_id))
+    answers = InquiryAnswer.query.filter_by(inquiry_id=inq_id).order_by(InquiryAnswer.created_at.asc()).all()
+    return render_template('admin/inquiry_detail.html', inquiry=inquiry, answers=answers)
+
+@route('/admin/notices/new', methods=['GET', 'POST'])
+def admin_notice_new():
+    """공지사항 작성"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    if request.method == 'POST':
+        title = request.form.get('title')
+        content = request.form.get('content')
+        priority = int(request.form.get('priority', 0))
+        is_published = 'is_published' in request.form
+        
+        # 이미지 업로드 처리 (참조 수는 notice 트리거가 관리)
+        image_url = save_image_upload()
+        
+        notice = Notice(
+            title=title,
+            content=content,
+            priority=priority,
+            is_published=is_published,
+            image_url=image_url
+        )
+        
+        commit_with_retry(db.session, lambda: db.session.add(notice))
+        notices_changed(notice.id)
+        
+        flash('공지사항이 성공적으로 작성되었습니다.', 'success')
+        return redirect(url_for('admin_notices'))
+    
+    return render_template('admin/notice_form.html')
+
+@route('/admin/notices/<int:notice_id>/edit', methods=['GET', 'POST'])
+def admin_notice_edit(notice_id):
+    """공지사항 수정"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    notice = Notice.query.get_or_404(notice_id)
+    
+    if request.method == 'POST':
+        # 이미지 업로드 처리 (기존 이미지는 참조가 끊기면 GC 가 삭제)
+        image_url = save_image_upload()
+        
+        def apply():
+            notice.title = request.form.get('title')
+            notice.content = request.form.get('content')
+            notice.priority = int(request.form.get('priority', 0))
+            notice.is_published = 'is_published' in request.form
+            notice.updated_at = datetime.utcnow()
+            if image_url:
+                notice.image_url = image_url
+        commit_with_retry(db.session, apply)
+        notices_changed(notice_id)
+        
+        flash('공지사항이 성공적으로 수정되었습니다.', 'success')
+        return redirect(url_for('admin_notices'))
+    
+    return render_template('admin/notice_form.html', notice=notice)
+
+@route('/admin/notices/<int:notice_id>/delete', methods=['POST'])
+def admin_notice_delete(notice_id):
+    """공지사항 삭제"""
+    if not session.get('admin_logged_in'):
+        return redirect(url_for('admin_login'))
+    
+    notice = Notice.query.get_or_404(notice_id)
+    commit_with_retry(db.session, lambda: db.session.delete(notice))
+    notices_changed(notice_id)
+    
+    flash('공지사항이 성공적으로 삭제되었습니다.', 'success')
+    return redirect(url_for('admin_notices'))
+
+# Static Files
+# /static/<path:filename> 은 assets.serve (지문 URL, 사전 압축 파일 지원)가 처리
+@route('/sitemap.xml')
+def sitemap():
+    """사이트맵"""
+    return current_app.send_static_file('sitemap.xml')
+
+@route('/robots.txt')
+def robots():
+    """로봇 배제 표준"""
+    return current_app.send_static_file('robots.txt')
+
+# Error Handlers
+@errorhandler(404)
+def not_found(error):
+    return render_template('404.html'), 404
+
+@errorhandler(500)
+def internal_error(error):
+    return render_template('500.html'), 500